@@ -0,0 +1,96 @@
+"""Compare per-message command decode cost: legacy three-pass path vs ``decode_command``.
+
+The legacy path is what the consumer did before single-pass decoding:
+``json.loads`` → ``RobotCommand.model_validate`` (params as ``dict``) → task-specific
+params model. The new path validates the bytes straight into a typed command through
+the precompiled discriminated ``TypeAdapter``.
+
+Usage:
+    uv run python -m benchmarks.command_decode [iterations]
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import timeit
+
+from src.mq.consumer import PARAM_MODELS
+from src.schemas.commands import RobotCommand, TaskType, decode_command
+
+SAMPLE_COMMANDS: dict[str, dict] = {
+    "setup_tube_rack": {
+        "task_id": "bench-001",
+        "task_type": TaskType.SETUP_TUBE_RACK,
+        "params": {"work_station": "ws_bic_09_fh_001"},
+    },
+    "take_photo": {
+        "task_id": "bench-002",
+        "task_type": TaskType.TAKE_PHOTO,
+        "params": {
+            "work_station": "ws_bic_09_fh_001",
+            "device_id": "cc-isco-300p_001",
+            "device_type": "cc-isco-300p",
+            "components": ["screen", "column"],
+        },
+    },
+    "start_cc": {
+        "task_id": "bench-003",
+        "task_type": TaskType.START_CC,
+        "params": {
+            "work_station": "ws_bic_09_fh_001",
+            "device_id": "cc-isco-300p_001",
+            "device_type": "cc-isco-300p",
+            "experiment_params": {
+                "silicone_cartridge": "silica_40g",
+                "peak_gathering_mode": "peak",
+                "run_minutes": 30,
+                "gradients": [{"duration_minutes": 5.0, "solvent_b_ratio": r / 10} for r in range(10)],
+            },
+        },
+    },
+    "start_evaporation": {
+        "task_id": "bench-004",
+        "task_type": TaskType.START_EVAPORATION,
+        "params": {
+            "profiles": {
+                "start": {"lower_height": 60.0, "rpm": 120, "target_temperature": 45.0, "target_pressure": 200.0},
+                "updates": [
+                    {
+                        "lower_height": 60.0,
+                        "rpm": 120,
+                        "target_temperature": 45.0,
+                        "target_pressure": 150.0,
+                        "trigger": {"type": "time_from_start", "time_in_sec": 600},
+                    }
+                ],
+            },
+        },
+    },
+}
+
+
+def legacy_decode(body: bytes) -> object:
+    raw = json.loads(body)
+    command = RobotCommand.model_validate(raw)
+    return PARAM_MODELS[command.task_type].model_validate(command.params)
+
+
+def measure(body: bytes, iterations: int) -> tuple[float, float]:
+    """Return (legacy µs/msg, single-pass µs/msg), best of three runs."""
+    legacy = min(timeit.repeat(lambda: legacy_decode(body), number=iterations, repeat=3))
+    single = min(timeit.repeat(lambda: decode_command(body), number=iterations, repeat=3))
+    return legacy / iterations * 1e6, single / iterations * 1e6
+
+
+def main(argv: list[str]) -> None:
+    iterations = int(argv[0]) if argv else 20_000
+    print(f"{'command':>18} {'bytes':>6} {'legacy µs':>10} {'single µs':>10} {'speedup':>8}")
+    for name, command in SAMPLE_COMMANDS.items():
+        body = json.dumps(command).encode()
+        legacy_us, single_us = measure(body, iterations)
+        print(f"{name:>18} {len(body):>6} {legacy_us:>10.2f} {single_us:>10.2f} {legacy_us / single_us:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
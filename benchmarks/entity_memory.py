@@ -0,0 +1,119 @@
+"""Measure bytes per tracked entity in ``WorldState``: compact records vs ``model_dump`` dicts.
+
+Builds a world of ``entities`` entities (mostly cartridges and tube racks, plus CC
+machines with ``experiment_params`` and PCC chutes with ``ContainerState`` bins), then
+reports the traced allocation per entity for the compact ``PropertyRecord`` storage
+and for the previous storage of one ``model_dump()`` dict per entity.
+
+Usage:
+    uv run python -m benchmarks.entity_memory [entities ...]
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+
+from loguru import logger
+
+from src.schemas.results import (
+    CCSystemUpdate,
+    PCCLeftChuteUpdate,
+    SilicaCartridgeUpdate,
+    TubeRackUpdate,
+)
+from src.state.world_state import WorldState
+
+BATCH_SIZE = 1_000
+
+
+def make_updates(entities: int) -> list:
+    updates = []
+    for i in range(entities):
+        ws = f"ws_bic_09_fh_{i % 200:03d}"
+        match i % 10:
+            case 8:
+                updates.append(
+                    CCSystemUpdate(
+                        type="column_chromatography_machine",
+                        id=f"cc-{i}",
+                        properties={
+                            "state": "using",
+                            "experiment_params": {
+                                "silicone_cartridge": "silica_40g",
+                                "peak_gathering_mode": "peak",
+                                "air_purge_minutes": 1.2,
+                                "run_minutes": 30,
+                                "need_equilibration": True,
+                            },
+                            "start_timestamp": "2025-01-15_10-30-00.000",
+                        },
+                    )
+                )
+            case 9:
+                updates.append(
+                    PCCLeftChuteUpdate(
+                        type="pcc_left_chute",
+                        id=f"pcc-{i}",
+                        properties={"state": "idle", "front_waste_bin": {"content_state": "empty", "has_lid": False}},
+                    )
+                )
+            case n if n % 2:
+                updates.append(
+                    TubeRackUpdate(type="tube_rack", id=f"rack-{i}", properties={"location": ws, "state": "inuse"})
+                )
+            case _:
+                updates.append(
+                    SilicaCartridgeUpdate(
+                        type="silica_cartridge", id=f"sc-{i}", properties={"location": ws, "state": "unused"}
+                    )
+                )
+    return updates
+
+
+def _traced(build) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = build()
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, after - before
+
+
+def measure_compact(updates: list) -> int:
+    def build() -> WorldState:
+        world = WorldState()
+        for start in range(0, len(updates), BATCH_SIZE):
+            world.apply_updates(updates[start : start + BATCH_SIZE])
+        return world
+
+    world, size = _traced(build)
+    if len(world.snapshot()) != len(updates):
+        raise RuntimeError("entity count mismatch")
+    return size
+
+
+def measure_dicts(updates: list) -> int:
+    def build() -> dict:
+        return {(u.type, u.id): u.properties.model_dump() for u in updates}
+
+    _, size = _traced(build)
+    return size
+
+
+def main(argv: list[str]) -> None:
+    sizes = [int(arg) for arg in argv] or [100_000]
+    logger.remove()  # per-update debug logging would dominate the run
+    print(f"{'entities':>10} {'dict B/entity':>14} {'compact B/entity':>17} {'saving':>7}")
+    for entities in sizes:
+        updates = make_updates(entities)
+        dicts = measure_dicts(updates) / entities
+        compact = measure_compact(updates) / entities
+        print(f"{entities:>10} {dicts:>14.0f} {compact:>17.0f} {1 - compact / dicts:>6.0%}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,164 @@
+"""Measure the per-robot memory footprint of fleet mode under load.
+
+Starts ``Fleet`` instances of increasing size against an in-process stub broker, runs a
+few commands through every robot's consumer (setup, photo, a short CC run) on the
+virtual clock, and reports the traced allocation per hosted robot once they have
+finished — world state, registries, sequencers and pipelines included, not just the
+freshly constructed runtimes.
+
+Usage:
+    uv run python -m benchmarks.fleet_memory [fleet_size ...]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import gc
+import itertools
+import json
+import sys
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from loguru import logger
+
+from src.config import MockSettings
+from src.fleet import Fleet
+
+COMMANDS: list[tuple[str, dict[str, Any]]] = [
+    ("setup_tube_rack", {"work_station": "ws_bic_09_fh_001"}),
+    (
+        "take_photo",
+        {
+            "work_station": "ws_bic_09_fh_001",
+            "device_id": "cc-isco-300p_001",
+            "device_type": "cc-isco-300p",
+            "components": ["screen"],
+        },
+    ),
+    (
+        "start_column_chromatography",
+        {
+            "work_station": "ws_bic_09_fh_001",
+            "device_id": "cc-isco-300p_001",
+            "device_type": "cc-isco-300p",
+            "experiment_params": {"silicone_cartridge": "silica_40g", "peak_gathering_mode": "peak", "run_minutes": 5},
+        },
+    ),
+]
+
+
+class _StubExchange:
+    async def publish(self, message: Any, routing_key: str) -> None:
+        pass
+
+
+class _StubPipeline:
+    """Confirms every publish at once."""
+
+    async def publish(self, exchange: Any, message: Any, routing_key: str) -> asyncio.Future[None]:
+        confirm = asyncio.get_running_loop().create_future()
+        confirm.set_result(None)
+        return confirm
+
+
+class _StubQueue:
+    """Command queue that hands delivered messages straight to the consumer callback."""
+
+    def __init__(self) -> None:
+        self.callback: Callable[[Any], Awaitable[None]] | None = None
+
+    async def bind(self, exchange: Any, routing_key: str) -> None:
+        pass
+
+    async def consume(self, callback: Callable[[Any], Awaitable[None]]) -> str:
+        self.callback = callback
+        return "ctag"
+
+    async def cancel(self, consumer_tag: str) -> None:
+        self.callback = None
+
+
+class _StubChannel:
+    def __init__(self, queues: dict[str, _StubQueue]) -> None:
+        self.close_callbacks: set[Any] = set()
+        self._queues = queues
+
+    async def declare_queue(self, name: str, durable: bool = False) -> _StubQueue:
+        return self._queues.setdefault(name, _StubQueue())
+
+
+class _StubMQ:
+    """In-process stand-in for ``MQConnection``: publishes are dropped and confirmed."""
+
+    def __init__(self) -> None:
+        self.queues: dict[str, _StubQueue] = {}
+        self._exchange = _StubExchange()
+        self._pipeline = _StubPipeline()
+
+    async def get_channel(self, name: str = "consumer", *, prefetch_count: int | None = None) -> _StubChannel:
+        return _StubChannel(self.queues)
+
+    async def get_exchange(self, name: str) -> _StubExchange:
+        return self._exchange
+
+    def get_pipeline(self, name: str) -> _StubPipeline:
+        return self._pipeline
+
+
+class _StubMessage:
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    def process(self, requeue: bool = False, ignore_processed: bool = False) -> contextlib.AbstractAsyncContextManager:
+        return contextlib.nullcontext()
+
+    async def nack(self, requeue: bool = False) -> None:
+        pass
+
+
+async def _run(fleet_size: int) -> tuple[int, float]:
+    settings = MockSettings(robot_id="talos.001", fleet_size=fleet_size, clock_mode="virtual")
+    connection = _StubMQ()
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+
+    fleet = Fleet(connection, settings)  # type: ignore[arg-type]
+    await fleet.start()
+    counter = itertools.count()
+    for robot_id in fleet.runtimes:
+        queue = connection.queues[f"{robot_id}.cmd"]
+        for task_type, params in COMMANDS:
+            body = json.dumps({"task_id": f"bench-{next(counter)}", "task_type": task_type, "params": params})
+            await queue.callback(_StubMessage(body.encode()))
+    await asyncio.gather(*(runtime.consumer.join() for runtime in fleet.runtimes.values()))
+
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await fleet.stop()
+    if len(fleet) != fleet_size:
+        raise RuntimeError(f"expected {fleet_size} runtimes, built {len(fleet)}")
+    total = after - before
+    return total, total / fleet_size
+
+
+def measure(fleet_size: int) -> tuple[int, float]:
+    """Return (total bytes, bytes per robot) held by a fleet after running ``COMMANDS`` on every robot."""
+    return asyncio.run(_run(fleet_size))
+
+
+def main(argv: list[str]) -> None:
+    logger.remove()  # per-command logging would dominate the run
+    sizes = [int(arg) for arg in argv] or [1, 100, 500, 1000]
+    print(f"{'robots':>8} {'total KiB':>12} {'KiB/robot':>10}")
+    for size in sizes:
+        total, per_robot = measure(size)
+        print(f"{size:>8} {total / 1024:>12.1f} {per_robot / 1024:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
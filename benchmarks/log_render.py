@@ -0,0 +1,119 @@
+"""Compare log-message render throughput: fresh models vs the update template cache.
+
+The fresh path is what producers did before the cache: build every entity update with
+its ``create_*_update`` factory, validate them into a ``LogMessage`` and serialize the
+whole message. The cached path builds updates through ``UpdateTemplateCache`` and
+serializes only the message shell, splicing in the updates' pre-rendered fragments
+(``OutboundMessage.from_model_with_updates``). Both produce identical bytes.
+
+Each scenario is one log entry as the simulators emit it; "ramp" changes its sensor
+values on every message, so it mostly misses the cache. Numbers are single-threaded,
+i.e. messages per second per core.
+
+Usage:
+    uv run python -m benchmarks.log_render [iterations]
+"""
+
+from __future__ import annotations
+
+import itertools
+import sys
+import timeit
+from collections.abc import Callable
+
+from src.generators.entity_updates import (
+    UpdateTemplateCache,
+    create_cc_system_update,
+    create_evaporator_update,
+    create_robot_update,
+    create_sample_cartridge_update,
+    create_silica_cartridge_update,
+    create_tube_rack_update,
+)
+from src.mq.envelope import OutboundMessage
+from src.schemas.commands import RobotPosture
+from src.schemas.results import LogMessage
+
+WS = "ws_bic_09_fh_001"
+TIMESTAMP = "2025-01-15_10-30-45.123"
+
+# name -> list of (factory, kwargs) per update; callables are re-evaluated per message
+Scenario = list[tuple[Callable, Callable[[int], dict]]]
+
+SCENARIOS: dict[str, Scenario] = {
+    "robot_moving": [
+        (create_robot_update, lambda n: {"robot_id": "talos.001", "location": WS, "state": "working"}),
+    ],
+    "cc_in_progress": [
+        (create_cc_system_update, lambda n: {"system_id": "cc-isco-300p_001", "state": "using"}),
+    ],
+    "cc_started": [
+        (
+            create_robot_update,
+            lambda n: {
+                "robot_id": "talos.001",
+                "location": WS,
+                "state": "working",
+                "description": RobotPosture.WATCH_CC_SCREEN,
+            },
+        ),
+        (
+            create_silica_cartridge_update,
+            lambda n: {"cartridge_id": "silica_40g_001", "location": WS, "state": "inuse"},
+        ),
+        (create_sample_cartridge_update, lambda n: {"cartridge_id": "samp-001", "location": WS, "state": "inuse"}),
+        (create_tube_rack_update, lambda n: {"rack_id": "rack-001", "location": WS, "state": "inuse"}),
+    ],
+    "ramp": [
+        (
+            create_evaporator_update,
+            lambda n: {
+                "evaporator_id": "re-buchi-r180_001",
+                "state": "using",
+                "lower_height": 50.0,
+                "rpm": 120,
+                "target_temperature": 60.0,
+                "current_temperature": round(25.0 + (n % 350) / 10, 1),
+                "target_pressure": 100.0,
+                "current_pressure": 1013.0 - n % 900,
+            },
+        ),
+    ],
+}
+
+
+def render_fresh(scenario: Scenario, n: int) -> bytes:
+    updates = [factory(**kwargs(n)) for factory, kwargs in scenario]
+    message = LogMessage(task_id="bench-001", updates=updates, msg="state_update", timestamp=TIMESTAMP)
+    return OutboundMessage.from_model(message, "talos.001.log").body
+
+
+def render_cached(scenario: Scenario, n: int, cache: UpdateTemplateCache) -> bytes:
+    updates = [cache.build(factory, **kwargs(n)) for factory, kwargs in scenario]
+    message = LogMessage(task_id="bench-001", msg="state_update", timestamp=TIMESTAMP)
+    return OutboundMessage.from_model_with_updates(message, updates, "talos.001.log", templates=cache).body
+
+
+def measure(scenario: Scenario, iterations: int) -> tuple[float, float, float]:
+    """Return (fresh msg/s, cached msg/s, cache hit rate), best of three runs."""
+    cache = UpdateTemplateCache()
+    counter = itertools.count()
+    assert render_fresh(scenario, 0) == render_cached(scenario, 0, cache)  # noqa: S101
+    fresh = min(timeit.repeat(lambda: render_fresh(scenario, next(counter)), number=iterations, repeat=3))
+    counter = itertools.count()
+    cached = min(timeit.repeat(lambda: render_cached(scenario, next(counter), cache), number=iterations, repeat=3))
+    return iterations / fresh, iterations / cached, cache.stats.as_dict()["hit_rate"]
+
+
+def main(argv: list[str]) -> None:
+    iterations = int(argv[0]) if argv else 20_000
+    print(f"{'scenario':>16} {'updates':>7} {'fresh msg/s':>12} {'cached msg/s':>13} {'speedup':>8} {'hit rate':>9}")
+    for name, scenario in SCENARIOS.items():
+        fresh, cached, hit_rate = measure(scenario, iterations)
+        print(
+            f"{name:>16} {len(scenario):>7} {fresh:>12,.0f} {cached:>13,.0f} {cached / fresh:>7.2f}x {hit_rate:>8.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,61 @@
+"""Measure WorldState recovery time from the on-disk snapshot and journal.
+
+Writes ``entities`` silica cartridges in batches of 100, then times a fresh
+``WorldState(WorldJournal(...))`` recovering them twice: once replaying the journal
+only, once from a compacted snapshot.
+
+Usage:
+    uv run python -m benchmarks.state_restore [entities ...]
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+
+from loguru import logger
+
+from src.schemas.results import SilicaCartridgeUpdate
+from src.state.journal import WorldJournal
+from src.state.world_state import WorldState
+
+BATCH_SIZE = 100
+
+
+def populate(directory: str, entities: int, *, compact: bool) -> None:
+    ws = WorldState(WorldJournal(directory, snapshot_every=0))
+    updates = [
+        SilicaCartridgeUpdate(
+            type="silica_cartridge", id=f"sc-{i}", properties={"location": f"ws-{i}", "state": "unused"}
+        )
+        for i in range(entities)
+    ]
+    for start in range(0, entities, BATCH_SIZE):
+        ws.apply_updates(updates[start : start + BATCH_SIZE])
+    if compact:
+        ws.close()
+
+
+def measure(entities: int, *, compact: bool) -> float:
+    """Return recovery time in milliseconds."""
+    with tempfile.TemporaryDirectory() as directory:
+        populate(directory, entities, compact=compact)
+        started = time.perf_counter()
+        restored = WorldState(WorldJournal(directory))
+        elapsed = time.perf_counter() - started
+        if len(restored.snapshot()) != entities:
+            raise RuntimeError(f"expected {entities} entities, restored {len(restored.snapshot())}")
+        return elapsed * 1000
+
+
+def main(argv: list[str]) -> None:
+    sizes = [int(arg) for arg in argv] or [1_000, 10_000, 100_000]
+    logger.remove()  # per-update debug logging would dominate the run
+    print(f"{'entities':>10} {'journal ms':>11} {'snapshot ms':>12}")
+    for entities in sizes:
+        print(f"{entities:>10} {measure(entities, compact=False):>11.1f} {measure(entities, compact=True):>12.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
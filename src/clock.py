@@ -0,0 +1,207 @@
+"""Pluggable clocks for simulator pacing, timestamps and heartbeats.
+
+Three modes, selected with ``MOCK_CLOCK_MODE``:
+
+- ``real``: wall-clock time and ``asyncio.sleep`` (the default).
+- ``scaled``: virtual time runs ``MOCK_CLOCK_SCALE`` times faster than wall time;
+  sleeps are shortened and timestamps advance at the virtual rate.
+- ``virtual``: discrete-event time. Whenever every simulator is blocked on the clock,
+  virtual time jumps straight to the earliest wake-up, so a 30-minute CC run completes
+  instantly while producing the same message order and timestamps as in real time.
+  Awaits on anything other than the clock (broker publishes and confirms) must be
+  wrapped in ``Clock.busy()`` so time holds still until they complete.
+
+Background sleepers (the heartbeat) never drive virtual time forward on their own:
+while only background sleepers are waiting, the virtual clock advances in real time,
+so an idle server does not spin out heartbeats.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.config import MockSettings
+
+
+class Clock(ABC):
+    """Source of simulated time."""
+
+    @abstractmethod
+    def now(self) -> datetime:
+        """Current (possibly virtual) UTC time."""
+
+    @abstractmethod
+    def monotonic(self) -> float:
+        """Seconds of (possibly virtual) time elapsed since an arbitrary origin."""
+
+    @abstractmethod
+    async def sleep(self, seconds: float, *, background: bool = False) -> None:
+        """Suspend for ``seconds`` of clock time.
+
+        Args:
+            seconds: Duration in clock seconds.
+            background: Periodic housekeeping (heartbeats) that should not, by itself,
+                make a discrete-event clock advance.
+        """
+
+    @contextlib.contextmanager
+    def busy(self) -> Iterator[None]:
+        """Mark a non-clock await (broker I/O) in flight; a discrete-event clock holds time meanwhile.
+
+        Do not sleep on the clock inside the section: virtual time cannot advance until it ends.
+        """
+        yield
+
+
+class RealClock(Clock):
+    """Wall-clock time."""
+
+    def now(self) -> datetime:
+        return datetime.now(tz=UTC)
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float, *, background: bool = False) -> None:
+        await asyncio.sleep(seconds)
+
+
+class ScaledClock(Clock):
+    """Virtual time running ``scale`` times faster than wall time."""
+
+    def __init__(self, scale: float, start: datetime | None = None) -> None:
+        if scale <= 0:
+            raise ValueError("Clock scale must be > 0")
+        self.scale = scale
+        self._start = start or datetime.now(tz=UTC)
+        self._origin = time.monotonic()
+
+    def now(self) -> datetime:
+        return self._start + timedelta(seconds=self.monotonic())
+
+    def monotonic(self) -> float:
+        return (time.monotonic() - self._origin) * self.scale
+
+    async def sleep(self, seconds: float, *, background: bool = False) -> None:
+        await asyncio.sleep(seconds / self.scale)
+
+
+@dataclass(order=True)
+class _Sleeper:
+    deadline: float
+    seq: int
+    future: asyncio.Future = field(compare=False)
+    background: bool = field(compare=False)
+
+
+class VirtualClock(Clock):
+    """Discrete-event clock: time jumps to the next wake-up once all sleepers are blocked.
+
+    "Blocked" means no ``busy()`` section is open and the event loop has run
+    ``settle_rounds`` iterations without any new sleeper being registered. The
+    ``busy()`` count covers awaits that take real time (broker confirms); the settle
+    rounds cover the purely CPU-bound steps between two sleeps.
+    """
+
+    def __init__(self, start: datetime | None = None, settle_rounds: int = 5) -> None:
+        self._start = start or datetime.now(tz=UTC)
+        self._now = 0.0
+        self._settle_rounds = settle_rounds
+        self._heap: list[_Sleeper] = []
+        self._seq = itertools.count()
+        self._busy = 0
+        self._changed = asyncio.Event()
+        self._driver: asyncio.Task | None = None
+
+    def now(self) -> datetime:
+        return self._start + timedelta(seconds=self._now)
+
+    def monotonic(self) -> float:
+        return self._now
+
+    @property
+    def pending(self) -> int:
+        """Number of sleepers waiting for virtual time to advance."""
+        return sum(1 for sleeper in self._heap if not sleeper.future.done())
+
+    async def sleep(self, seconds: float, *, background: bool = False) -> None:
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, _Sleeper(self._now + seconds, next(self._seq), future, background))
+        self._changed.set()
+        if self._driver is None or self._driver.done():
+            self._driver = asyncio.create_task(self._drive())
+        await future
+
+    @contextlib.contextmanager
+    def busy(self) -> Iterator[None]:
+        self._busy += 1
+        self._changed.set()
+        try:
+            yield
+        finally:
+            self._busy -= 1
+            self._changed.set()
+
+    async def _settle(self) -> None:
+        """Yield until nothing is busy and no new sleeper shows up for ``settle_rounds`` loop iterations."""
+        quiet = 0
+        while quiet < self._settle_rounds or self._busy:
+            self._changed.clear()
+            if self._busy and quiet >= self._settle_rounds:
+                await self._changed.wait()  # I/O in flight: wait for it rather than spinning
+            else:
+                await asyncio.sleep(0)
+            quiet = 0 if self._changed.is_set() else quiet + 1
+
+    async def _drive(self) -> None:
+        while True:
+            await self._settle()
+            while self._heap and self._heap[0].future.done():
+                heapq.heappop(self._heap)  # cancelled sleeper
+            if not self._heap:
+                return
+
+            if any(not s.background and not s.future.done() for s in self._heap):
+                self._now = max(self._now, self._heap[0].deadline)
+            else:
+                # Only background sleepers: let time pass in real time until one is due
+                # or a foreground sleeper arrives.
+                started = time.monotonic()
+                self._changed.clear()
+                timeout = self._heap[0].deadline - self._now
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+                self._now = min(self._now + (time.monotonic() - started), self._heap[0].deadline)
+                if self._heap[0].deadline > self._now:
+                    continue
+
+            while self._heap and self._heap[0].deadline <= self._now:
+                sleeper = heapq.heappop(self._heap)
+                if not sleeper.future.done():
+                    sleeper.future.set_result(None)
+
+
+def make_clock(settings: MockSettings) -> Clock:
+    """Build the clock selected by ``settings.clock_mode``."""
+    match settings.clock_mode:
+        case "real":
+            return RealClock()
+        case "scaled":
+            return ScaledClock(settings.clock_scale)
+        case "virtual":
+            return VirtualClock()
+        case _:
+            raise ValueError(f"Unknown clock mode: {settings.clock_mode}")
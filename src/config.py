@@ -1,5 +1,8 @@
 """Mock Robot Server configuration."""
 
+import re
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -21,6 +24,13 @@ class MockSettings(BaseSettings):
     mq_connection_timeout: int = 30
     mq_heartbeat: int = 60
     mq_prefetch_count: int = 5
+    mq_channel_shards: int = 1  # channels per role; robots are spread over them by hash
+    mq_publish_max_in_flight: int = 256  # unconfirmed publishes allowed per pipeline
+    mq_confirm_batch_size: int = 64  # confirms awaited together by the pipeline
+    mq_max_in_flight_tasks: int = 0  # admitted commands per robot; 0 = mq_prefetch_count
+
+    # Per-task-type concurrency limits, e.g. {"start_column_chromatography": 1}
+    task_concurrency_limits: dict[str, int] = {}
 
     # MQ topology — single exchange, per-robot routing keys
     mq_exchange: str = "robot.exchange"
@@ -46,5 +56,66 @@ class MockSettings(BaseSettings):
     cc_intermediate_interval: float = 300.0
     re_intermediate_interval: float = 300.0
 
+    # start_column_chromatography UV trace streamed with the progress logs
+    cc_chromatogram_sample_rate: float = 1.0  # samples per second of run time (0 disables)
+    # Fixed compounds as JSON, e.g. [{"elution_ratio": 20, "height": 0.8, "width": 15}]; random 2-5 per run when empty
+    cc_chromatogram_peaks: list[dict[str, float]] = []
+
+    # start_evaporation process model — telemetry logs per second of run time (unscaled process time, so a
+    # 30-minute run at 0.1 yields 180 logs whatever the delay multiplier or clock; 0 = progress ticks only)
+    re_telemetry_rate: float = 0.0
+    re_solvent_volume_ml: float = 200.0  # solvent in the flask when evaporation starts
+
+    # Clock — "real", "scaled" (clock_scale x faster) or "virtual" (discrete-event, instant)
+    clock_mode: Literal["real", "scaled", "virtual"] = "real"
+    clock_scale: float = 1.0
+
+    # World state persistence — per-robot snapshot + journal under state_dir (disabled when unset)
+    state_dir: str | None = None
+    state_snapshot_every: int = 1000  # journal records between snapshots
+    state_fsync: bool = False
+    # Fixture loaded into an empty world state at startup ({robot_id} is substituted)
+    state_seed_file: str | None = None
+
+    # Extra / overriding precondition rules (JSON list of PreconditionRule objects); built-ins only when unset
+    precondition_rules_file: str | None = None
+    precondition_cache_size: int = 4096  # memoized precondition results (0 disables)
+
+    # Simulator timelines replacing the built-in ones per task type (JSON list of Timeline objects)
+    simulator_timelines_file: str | None = None
+
+    # Per-entity property history — entries kept per entity (0 disables), per-type overrides, hard total cap
+    history_size: int = 0
+    history_type_sizes: dict[str, int] = {}
+    history_max_entries: int = 100_000
+
     # Heartbeat
     heartbeat_interval: float = 2.0  # seconds between heartbeats
+
+    # Shutdown — seconds to let in-flight tasks finish before they are abandoned (code 1003)
+    shutdown_drain_timeout: float = 30.0
+
+    # Fleet mode — number of robot identities hosted by this process
+    fleet_size: int = 1
+
+    def fleet_robot_ids(self) -> list[str]:
+        """Return the robot identities hosted by this process.
+
+        The first identity is ``robot_id``; further identities increment its numeric
+        suffix while keeping the zero padding (``talos.001`` → ``talos.001`` … ``talos.200``).
+        A ``robot_id`` without a numeric suffix gets ``.001``, ``.002``, ... appended.
+        """
+        if self.fleet_size <= 1:
+            return [self.robot_id]
+
+        match = re.fullmatch(r"(.*?)(\d+)", self.robot_id)
+        if match is None:
+            return [f"{self.robot_id}.{n:03d}" for n in range(1, self.fleet_size + 1)]
+
+        prefix, digits = match.groups()
+        start = int(digits)
+        return [f"{prefix}{n:0{len(digits)}d}" for n in range(start, start + self.fleet_size)]
+
+    def for_robot(self, robot_id: str) -> "MockSettings":
+        """Return a copy of these settings bound to a single robot identity."""
+        return self.model_copy(update={"robot_id": robot_id})
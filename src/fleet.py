@@ -0,0 +1,164 @@
+"""Fleet runtime — hosts one or many simulated robot identities on a shared MQ connection.
+
+Each robot identity gets its own ``{robot_id}.cmd`` queue, ``WorldState``, simulators,
+producers and heartbeat. Only the ``MQConnection`` (and the stateless ``ScenarioManager``)
+are shared, so a single process can stand in for a whole robot fleet.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from src.clock import make_clock
+from src.mq.consumer import CommandConsumer
+from src.mq.heartbeat import HeartbeatPublisher
+from src.mq.log_producer import LogProducer
+from src.mq.producer import ResultProducer
+from src.mq.sequencing import TaskSequencer
+from src.scenarios.manager import ScenarioManager
+from src.schemas.commands import TaskType
+from src.simulators.cc_simulator import CCSimulator
+from src.simulators.consolidation_simulator import ConsolidationSimulator
+from src.simulators.evaporation_simulator import EvaporationSimulator
+from src.simulators.photo_simulator import PhotoSimulator
+from src.simulators.setup_simulator import SetupSimulator
+from src.state.history import EntityHistory
+from src.state.journal import WorldJournal
+from src.state.seeding import seed_from_file
+from src.state.world_state import WorldState
+
+if TYPE_CHECKING:
+    from src.clock import Clock
+    from src.config import MockSettings
+    from src.mq.connection import MQConnection
+
+
+class RobotRuntime:
+    """All components that make up one simulated robot.
+
+    ``settings`` must already be bound to the robot identity (see ``MockSettings.for_robot``).
+    """
+
+    def __init__(
+        self,
+        connection: MQConnection,
+        settings: MockSettings,
+        scenario_manager: ScenarioManager | None = None,
+        clock: Clock | None = None,
+    ) -> None:
+        self.settings = settings
+        self.clock = clock or make_clock(settings)
+        self.sequencer = TaskSequencer()
+        self.producer = ResultProducer(connection, settings, self.sequencer, clock=self.clock)
+        self.log_producer = LogProducer(connection, settings, self.sequencer, clock=self.clock)
+        journal = (
+            WorldJournal(
+                Path(settings.state_dir) / settings.robot_id,
+                snapshot_every=settings.state_snapshot_every,
+                fsync=settings.state_fsync,
+            )
+            if settings.state_dir
+            else None
+        )
+        history = (
+            EntityHistory(
+                settings.history_size,
+                capacities=settings.history_type_sizes,
+                max_entries=settings.history_max_entries,
+                clock=self.clock,
+            )
+            if settings.history_size > 0 or settings.history_type_sizes
+            else None
+        )
+        self.world_state = WorldState(journal, history)
+        if settings.state_seed_file and len(self.world_state.snapshot()) == 0:
+            # A restored (non-empty) world wins over the fixture
+            seed_from_file(self.world_state, settings.state_seed_file, robot_id=settings.robot_id)
+        self.heartbeat = HeartbeatPublisher(connection, settings, world_state=self.world_state, clock=self.clock)
+        self.scenario_manager = scenario_manager or ScenarioManager(settings)
+
+        sim_kwargs = {"log_producer": self.log_producer, "world_state": self.world_state, "clock": self.clock}
+        setup_sim = SetupSimulator(self.producer, settings, **sim_kwargs)
+        photo_sim = PhotoSimulator(self.producer, settings, **sim_kwargs)
+        cc_sim = CCSimulator(self.producer, settings, **sim_kwargs)
+        consolidation_sim = ConsolidationSimulator(self.producer, settings, **sim_kwargs)
+        evaporation_sim = EvaporationSimulator(self.producer, settings, **sim_kwargs)
+
+        self.consumer = CommandConsumer(
+            connection,
+            self.producer,
+            self.scenario_manager,
+            settings,
+            world_state=self.world_state,
+            log_producer=self.log_producer,
+        )
+        self.consumer.register_simulator(TaskType.SETUP_CARTRIDGES, setup_sim)
+        self.consumer.register_simulator(TaskType.SETUP_TUBE_RACK, setup_sim)
+        self.consumer.register_simulator(TaskType.TAKE_PHOTO, photo_sim)
+        self.consumer.register_simulator(TaskType.START_CC, cc_sim)
+        self.consumer.register_simulator(TaskType.TERMINATE_CC, cc_sim)
+        self.consumer.register_simulator(TaskType.COLLECT_CC_FRACTIONS, consolidation_sim)
+        self.consumer.register_simulator(TaskType.START_EVAPORATION, evaporation_sim)
+
+    @property
+    def robot_id(self) -> str:
+        """The robot identity served by this runtime."""
+        return self.settings.robot_id
+
+    async def start(self) -> None:
+        """Initialize producers, start the heartbeat and begin consuming commands."""
+        await self.producer.initialize()
+        await self.log_producer.initialize()
+        await self.heartbeat.initialize()
+        await self.heartbeat.start()
+        await self.consumer.initialize()
+        await self.consumer.start_consuming()
+
+    async def stop(self) -> None:
+        """Stop consuming, drain in-flight commands, stop the heartbeat and persist state.
+
+        The heartbeat keeps running while draining so the robot does not look offline
+        while it finishes (or abandons) its last tasks.
+        """
+        await self.consumer.stop()
+        await self.consumer.drain(self.settings.shutdown_drain_timeout)
+        await self.heartbeat.stop()
+        await asyncio.to_thread(self.world_state.close)
+
+
+class Fleet:
+    """A set of ``RobotRuntime`` instances sharing one ``MQConnection``."""
+
+    def __init__(self, connection: MQConnection, settings: MockSettings) -> None:
+        scenario_manager = ScenarioManager(settings)
+        self.clock = make_clock(settings)
+        self.runtimes: dict[str, RobotRuntime] = {
+            robot_id: RobotRuntime(connection, settings.for_robot(robot_id), scenario_manager, self.clock)
+            for robot_id in settings.fleet_robot_ids()
+        }
+
+    def __len__(self) -> int:
+        return len(self.runtimes)
+
+    def get(self, robot_id: str) -> RobotRuntime | None:
+        """Return the runtime serving ``robot_id``, if hosted by this fleet."""
+        return self.runtimes.get(robot_id)
+
+    async def start(self) -> None:
+        """Start every robot runtime concurrently."""
+        await asyncio.gather(*(runtime.start() for runtime in self.runtimes.values()))
+        logger.info("Fleet started with {} robot(s)", len(self.runtimes))
+
+    async def stop(self) -> None:
+        """Stop every robot runtime, logging (not raising) individual failures."""
+        results = await asyncio.gather(
+            *(runtime.stop() for runtime in self.runtimes.values()),
+            return_exceptions=True,
+        )
+        for runtime, result in zip(self.runtimes.values(), results, strict=True):
+            if isinstance(result, BaseException):
+                logger.opt(exception=result).error("Failed to stop robot runtime {}", runtime.robot_id)
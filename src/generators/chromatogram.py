@@ -0,0 +1,213 @@
+"""Synthetic UV chromatograms for column chromatography runs.
+
+``generate_chromatogram`` turns a run's ``CCExperimentParams`` into the trace the CC
+machine's UV detector would record: the solvent B gradient reaching the detector, a
+baseline that follows the solvent mix, one tailing peak per compound eluting once the
+gradient reaches its elution strength, detector noise, and the fraction collector's
+collect/waste decision for the run's ``peak_gathering_mode``.
+
+The whole run is computed in one vectorized NumPy pass (peaks x samples); the returned
+``Chromatogram`` then hands it out in consecutive ``ChromatogramChunk`` pieces as the
+simulated run progresses, so consumers see the trace grow like a live instrument feed.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.schemas.protocol import PeakGatheringMode
+from src.schemas.results import ChromatogramChunk
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from src.schemas.protocol import CCExperimentParams
+
+WAVELENGTH_NM = 254
+
+# Absorbance (AU) of the pure solvent at 254 nm; unknown solvents use DEFAULT_SOLVENT_ABSORBANCE
+SOLVENT_ABSORBANCE: dict[str, float] = {
+    "pet_ether": 0.0,
+    "hexane": 0.0,
+    "heptane": 0.0,
+    "dichloromethane": 0.02,
+    "methanol": 0.01,
+    "ethanol": 0.01,
+    "ethyl_acetate": 0.12,
+    "acetone": 0.6,
+    "toluene": 0.9,
+}
+DEFAULT_SOLVENT_ABSORBANCE = 0.02
+
+NOISE_AU = 0.002  # detector noise, standard deviation
+PEAK_THRESHOLD_AU = 0.05  # signal above baseline at which "peak" mode collects
+DEAD_TIME_PER_GRAM = 1.5  # column void time in seconds per gram of silica
+DEFAULT_CARTRIDGE_GRAMS = 40.0
+
+
+@dataclass(frozen=True, slots=True)
+class ChromatogramPeak:
+    """One compound in the loaded sample.
+
+    Attributes:
+        elution_ratio: % solvent B at which the compound starts moving (0-100).
+        height: Absorbance at the apex in AU.
+        width: Standard deviation of the leading edge in seconds of run time.
+        tailing: Width of the trailing edge relative to the leading edge (1.0 is symmetric).
+    """
+
+    elution_ratio: float
+    height: float
+    width: float = 15.0
+    tailing: float = 1.5
+
+
+def random_peaks(rng: np.random.Generator, count: int | None = None) -> list[ChromatogramPeak]:
+    """``count`` (default 2-5) compounds with random polarity, amount and band shape."""
+    if count is None:
+        count = int(rng.integers(2, 6))
+    columns = (
+        rng.uniform(0.0, 60.0, count),
+        rng.uniform(0.2, 1.5, count),
+        rng.uniform(8.0, 25.0, count),
+        rng.uniform(1.0, 2.0, count),
+    )
+    return [ChromatogramPeak(*map(float, values)) for values in zip(*columns, strict=True)]
+
+
+def cartridge_dead_time(silicone_cartridge: str) -> float:
+    """Seconds the solvent front takes through the column, from the cartridge size ("silica_40g")."""
+    match = re.search(r"(\d+(?:\.\d+)?)\s*g", silicone_cartridge)
+    grams = float(match.group(1)) if match else DEFAULT_CARTRIDGE_GRAMS
+    return grams * DEAD_TIME_PER_GRAM
+
+
+def gradient_profile(experiment_params: CCExperimentParams, times: np.ndarray) -> np.ndarray:
+    """% solvent B pumped at each run time in ``times`` (seconds).
+
+    Each gradient entry ramps linearly from the previous ratio (0% at the start of the
+    run) to its ``solvent_b_ratio`` over ``duration_minutes``; the last ratio is held
+    for the rest of the run. Without gradients, B ramps from 0 to 100% over the run.
+    """
+    if experiment_params.gradients:
+        durations = np.maximum([gradient.duration_minutes * 60.0 for gradient in experiment_params.gradients], 0.0)
+        knot_times = np.concatenate(([0.0], np.cumsum(durations)))
+        knot_ratios = np.concatenate(([0.0], [gradient.solvent_b_ratio for gradient in experiment_params.gradients]))
+    else:
+        knot_times = np.array([0.0, max(experiment_params.run_minutes * 60.0, 1.0)])
+        knot_ratios = np.array([0.0, 100.0])
+    return np.clip(np.interp(times, knot_times, knot_ratios), 0.0, 100.0)
+
+
+class Chromatogram:
+    """A run's complete trace, handed out in consecutive chunks as the run progresses."""
+
+    __slots__ = ("_cursor", "_done", "_sequence", "absorbance", "collecting", "sample_interval", "solvent_b_ratio")
+
+    def __init__(
+        self, sample_interval: float, absorbance: np.ndarray, solvent_b_ratio: np.ndarray, collecting: np.ndarray
+    ) -> None:
+        self.sample_interval = sample_interval
+        self.absorbance = absorbance
+        self.solvent_b_ratio = solvent_b_ratio
+        self.collecting = collecting
+        self._cursor = 0
+        self._sequence = 0
+        self._done = False
+
+    def __len__(self) -> int:
+        return len(self.absorbance)
+
+    @property
+    def duration(self) -> float:
+        """Run time covered by the trace, in seconds."""
+        return len(self) * self.sample_interval
+
+    def chunk(self, progress: float) -> ChromatogramChunk | None:
+        """The samples recorded since the previous chunk, up to ``progress`` (0..1) of the run.
+
+        The chunk reaching the end of the run is marked ``final``; None is returned when
+        no new samples are due or the final chunk was already handed out.
+        """
+        if self._done:
+            return None
+        size = len(self)
+        end = size if progress >= 1.0 else min(max(int(progress * size), self._cursor), size)
+        if end == self._cursor and end < size:
+            return None
+        start, self._cursor = self._cursor, end
+        self._done = end == size
+        chunk = ChromatogramChunk(
+            sequence=self._sequence,
+            start_time=round(start * self.sample_interval, 3),
+            sample_interval=self.sample_interval,
+            wavelength_nm=WAVELENGTH_NM,
+            absorbance=self.absorbance[start:end].tolist(),
+            solvent_b_ratio=self.solvent_b_ratio[start:end].tolist(),
+            collecting=self.collecting[start:end].tolist(),
+            final=self._done,
+        )
+        self._sequence += 1
+        return chunk
+
+
+def generate_chromatogram(
+    experiment_params: CCExperimentParams,
+    *,
+    sample_rate: float = 1.0,
+    peaks: Sequence[ChromatogramPeak] | None = None,
+    seed: int | None = None,
+) -> Chromatogram:
+    """Compute the UV trace of a whole CC run in one vectorized pass.
+
+    Args:
+        experiment_params: The run's gradient, duration, solvents, cartridge and gathering mode.
+        sample_rate: Detector samples per second of (unscaled) run time.
+        peaks: Compounds in the sample; 2-5 random ones when omitted.
+        seed: Seed for the random peaks and detector noise (same seed, same trace).
+    """
+    if sample_rate <= 0:
+        raise ValueError("sample_rate must be > 0")
+    rng = np.random.default_rng(seed)
+    if peaks is None:
+        peaks = random_peaks(rng)
+
+    interval = 1.0 / sample_rate
+    times = np.arange(int(experiment_params.run_minutes * 60.0 * sample_rate)) * interval
+    dead_time = cartridge_dead_time(experiment_params.silicone_cartridge)
+
+    # Solvent mix at the column inlet, and at the detector one dead time later
+    pumped = gradient_profile(experiment_params, times)
+    at_detector = gradient_profile(experiment_params, np.maximum(times - dead_time, 0.0))
+
+    # A compound starts moving once the inlet mix first reaches its elution ratio and
+    # arrives at the detector one dead time later
+    elution = np.array([peak.elution_ratio for peak in peaks], dtype=float)
+    heights = np.array([peak.height for peak in peaks], dtype=float)
+    leading = np.array([peak.width for peak in peaks], dtype=float)
+    trailing = leading * np.array([peak.tailing for peak in peaks], dtype=float)
+    start_index = np.searchsorted(np.maximum.accumulate(pumped), elution)
+    retention = np.append(times, np.inf)[start_index] + dead_time  # inf: never elutes, contributes 0
+
+    offset = times[np.newaxis, :] - retention[:, np.newaxis]
+    width = np.where(offset < 0.0, leading[:, np.newaxis], trailing[:, np.newaxis])
+    signal = (heights[:, np.newaxis] * np.exp(-0.5 * (offset / width) ** 2)).sum(axis=0)
+
+    solvent_a = SOLVENT_ABSORBANCE.get(experiment_params.solvent_a, DEFAULT_SOLVENT_ABSORBANCE)
+    solvent_b = SOLVENT_ABSORBANCE.get(experiment_params.solvent_b, DEFAULT_SOLVENT_ABSORBANCE)
+    baseline = solvent_a + (solvent_b - solvent_a) * at_detector / 100.0
+    absorbance = baseline + signal + rng.normal(0.0, NOISE_AU, len(times))
+
+    match experiment_params.peak_gathering_mode:
+        case PeakGatheringMode.ALL:
+            collecting = times >= dead_time
+        case PeakGatheringMode.PEAK:
+            collecting = absorbance - baseline > PEAK_THRESHOLD_AU
+        case _:
+            collecting = np.zeros(len(times), dtype=bool)
+
+    return Chromatogram(interval, np.round(absorbance, 4), np.round(at_detector, 1), collecting)
@@ -2,11 +2,21 @@
 
 Each function constructs the corresponding Pydantic model from schemas/results.py.
 All functions are pure — no I/O, no side effects.
+
+``UpdateTemplateCache`` memoizes them: a factory call with hashable arguments is built
+once, and the (frozen) model is returned again for the same arguments together with
+its pre-serialized JSON fragment, which producers splice into message bodies instead
+of re-serializing the update (see ``OutboundMessage.from_model_with_updates``).
 """
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import UTC, datetime
+from threading import Lock
+from typing import Any
 
 from src.schemas.protocol import ContainerState
 from src.schemas.results import (
@@ -15,6 +25,7 @@ from src.schemas.results import (
     CCSExtModuleProperties,
     CCSExtModuleUpdate,
     CCSystemUpdate,
+    EntityUpdate,
     EvaporatorProperties,
     EvaporatorUpdate,
     PCCChuteProperties,
@@ -31,15 +42,19 @@ from src.schemas.results import (
 )
 
 
-def generate_robot_timestamp() -> str:
+def generate_robot_timestamp(now: datetime | None = None) -> str:
     """Generate timestamp in spec format: YYYY-MM-DD_HH-MM-SS.mmm
 
     Example: 2025-01-15_10-30-45.123
 
     This is the standardized timestamp format used across all robot messages
     (logs, heartbeats, entity updates) to match the BIC system specification.
+
+    Args:
+        now: Time to format, e.g. ``Clock.now()``; defaults to the current UTC time.
     """
-    now = datetime.now(tz=UTC)
+    if now is None:
+        now = datetime.now(tz=UTC)
     return now.strftime("%Y-%m-%d_%H-%M-%S") + f".{now.microsecond // 1000:03d}"
 
 
@@ -235,3 +250,111 @@ def create_pcc_right_chute_update(
             description=description,
         ),
     )
+
+
+@dataclass
+class TemplateCacheStats:
+    """Counters for an ``UpdateTemplateCache``."""
+
+    hits: int = 0
+    misses: int = 0
+    admitted: int = 0  # misses seen before, now cached
+    uncacheable: int = 0  # unhashable arguments (dicts, container models), built every time
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "admitted": self.admitted,
+            "uncacheable": self.uncacheable,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class UpdateTemplateCache:
+    """LRU cache of built entity updates and their JSON fragments.
+
+    Only combinations that repeat are worth caching: an argument combination is
+    admitted on its second miss (a bounded set of key hashes remembers the first), so
+    one-off updates such as sensor readings cost a hash and a set insert instead of
+    churning the cache.
+
+    Cached models are shared by every message that uses them, which is safe because
+    entity models are frozen. Arguments are keyed with their types, so ``1`` and
+    ``1.0`` never share an entry.
+
+    Args:
+        maxsize: Entries kept; the least recently used one is evicted when full (0 disables).
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize < 0:
+            raise ValueError("UpdateTemplateCache maxsize must be >= 0")
+        self._maxsize = maxsize
+        self._entries: OrderedDict[int, tuple[tuple, EntityUpdate]] = OrderedDict()  # key hash -> (key, update)
+        self._fragments: dict[int, tuple[EntityUpdate, bytes]] = {}  # id(update) -> (update, JSON)
+        self._seen: set[int] = set()  # hashes of keys that missed once
+        self._lock = Lock()
+        self.stats = TemplateCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def build(self, factory: Callable[..., EntityUpdate], /, *args: Any, **kwargs: Any) -> EntityUpdate:
+        """``factory(*args, **kwargs)``, reusing the model built earlier for the same arguments."""
+        if self._maxsize == 0:
+            return factory(*args, **kwargs)
+        key = (factory, *args, *kwargs.items(), *map(type, (*args, *kwargs.values())))
+        try:
+            key_hash = hash(key)
+        except TypeError:
+            self.stats.uncacheable += 1
+            return factory(*args, **kwargs)
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is not None and entry[0] == key:
+                self._entries.move_to_end(key_hash)
+                self.stats.hits += 1
+                return entry[1]
+            self.stats.misses += 1
+            if key_hash not in self._seen:
+                if len(self._seen) >= self._maxsize:
+                    self._seen.clear()
+                self._seen.add(key_hash)
+                return factory(*args, **kwargs)
+        update = factory(*args, **kwargs)
+        fragment = update.model_dump_json().encode()
+        with self._lock:
+            previous = self._entries.pop(key_hash, None)
+            if previous is None and len(self._entries) >= self._maxsize:
+                _, previous = self._entries.popitem(last=False)
+                self.stats.evictions += 1
+            if previous is not None:
+                del self._fragments[id(previous[1])]
+            self._entries[key_hash] = (key, update)
+            self._fragments[id(update)] = (update, fragment)
+            self._seen.discard(key_hash)
+            self.stats.admitted += 1
+        return update
+
+    def cached_fragment(self, update: EntityUpdate) -> bytes | None:
+        """The pre-rendered JSON of ``update`` if it came from this cache, else None."""
+        cached = self._fragments.get(id(update))
+        return cached[1] if cached is not None and cached[0] is update else None
+
+    def fragment(self, update: EntityUpdate) -> bytes:
+        """Compact JSON of ``update``: the pre-rendered fragment if cached, else serialized now."""
+        cached = self.cached_fragment(update)
+        return cached if cached is not None else update.model_dump_json().encode()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._fragments.clear()
+            self._seen.clear()
+
+
+UPDATE_TEMPLATES = UpdateTemplateCache()
@@ -0,0 +1,312 @@
+"""First-order process model of a rotary evaporator run.
+
+``simulate_evaporation`` precomputes, over the whole run, what the evaporator's sensors
+would read once a profile is applied:
+
+- bath temperature approaching ``target_temperature`` with a first-order lag,
+- pressure pulled down to ``target_pressure`` by the vacuum pump (first-order, faster),
+- the solvent volume left in the flask, depleting at a rate proportional to how far the
+  bath is above the solvent's boiling point at the current pressure (Clausius-Clapeyron)
+  and to the evaporating surface, which grows with ``rpm`` and ``lower_height``.
+
+Everything is computed with NumPy on a fixed run-time grid in one pass; telemetry is
+then read from the arrays with ``EvaporationRun.at``. All times here are unscaled run
+time: callers convert clock time back with the delay multiplier before sampling.
+
+``schedule_evaporation`` chains such runs into the stages of a multi-profile run: the
+start profile, then each of ``profiles.updates`` at its trigger, either a
+``time_from_start`` (kept in a heap, so each stage costs O(log n)) or a named event
+detected in the running stage's model (``EVAPORATION_EVENTS``). Each stage starts from
+the state the previous one left the bath, vacuum and flask in.
+"""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_right
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from src.schemas.protocol import EvaporationProfile, EvaporationProfiles
+
+AMBIENT_TEMPERATURE = 25.0  # C
+AMBIENT_PRESSURE = 1013.0  # mbar
+
+BATH_TIME_CONSTANT = 600.0  # s, water bath heating / cooling
+VACUUM_TIME_CONSTANT = 60.0  # s, pump-down
+
+# Solvent: ethyl acetate, the usual CC eluent
+SOLVENT_BOILING_POINT = 77.1  # C at AMBIENT_PRESSURE
+SOLVENT_VAPORIZATION_ENTHALPY = 31_940.0  # J/mol
+GAS_CONSTANT = 8.314  # J/(mol K)
+
+EVAPORATION_COEFFICIENT = 0.0055  # ml/s per K of superheat at the reference surface
+REFERENCE_RPM = 120.0
+MODEL_STEP = 1.0  # s of run time between model points
+
+DRY_VOLUME = 0.5  # ml left at which the flask counts as dry
+PRESSURE_TOLERANCE = 0.02  # fraction of the target pressure (at least 1 mbar) counting as reached
+TEMPERATURE_TOLERANCE = 0.5  # C from the target counting as reached
+DEFAULT_RUN_DURATION = 1800.0  # s, a run without any triggered stage (as ``calculate_evaporation_duration``)
+EVENT_TIMEOUT = 1800.0  # s an event stage is waited for once no timed stage is left
+
+
+@dataclass(frozen=True, slots=True)
+class EvaporatorReading:
+    """Sensor values at one point of the run."""
+
+    temperature: float  # bath, C
+    pressure: float  # mbar
+    volume: float  # solvent left in the flask, ml
+    boiling_point: float  # solvent boiling point at ``pressure``, C
+
+
+def boiling_point(pressure: np.ndarray | float) -> np.ndarray:
+    """Solvent boiling point (C) at ``pressure`` (mbar), from the Clausius-Clapeyron relation."""
+    inverse = 1.0 / (SOLVENT_BOILING_POINT + 273.15) - GAS_CONSTANT / SOLVENT_VAPORIZATION_ENTHALPY * np.log(
+        np.maximum(pressure, 1.0) / AMBIENT_PRESSURE
+    )
+    return 1.0 / inverse - 273.15
+
+
+class EvaporationRun:
+    """Precomputed sensor traces of one run on a ``MODEL_STEP`` run-time grid."""
+
+    __slots__ = ("boiling_point", "pressure", "temperature", "times", "volume")
+
+    def __init__(
+        self,
+        times: np.ndarray,
+        temperature: np.ndarray,
+        pressure: np.ndarray,
+        volume: np.ndarray,
+        boiling_point: np.ndarray,
+    ) -> None:
+        self.times = times
+        self.temperature = temperature
+        self.pressure = pressure
+        self.volume = volume
+        self.boiling_point = boiling_point
+
+    @property
+    def duration(self) -> float:
+        """Run time covered by the model, in seconds."""
+        return float(self.times[-1])
+
+    def at(self, run_time: float) -> EvaporatorReading:
+        """Sensor readings ``run_time`` seconds into the run (clamped to the run), interpolated linearly."""
+        position = min(max(run_time / MODEL_STEP, 0.0), len(self.times) - 1.0)
+        index = min(int(position), len(self.times) - 2)
+        weight = position - index
+        window = slice(index, index + 2)
+
+        def read(trace: np.ndarray) -> float:
+            low, high = trace[window].tolist()
+            return round(low + (high - low) * weight, 1)
+
+        return EvaporatorReading(
+            temperature=read(self.temperature),
+            pressure=read(self.pressure),
+            volume=read(self.volume),
+            boiling_point=read(self.boiling_point),
+        )
+
+
+def simulate_evaporation(
+    profile: EvaporationProfile,
+    duration: float,
+    *,
+    volume: float = 200.0,
+    initial_temperature: float = AMBIENT_TEMPERATURE,
+    initial_pressure: float = AMBIENT_PRESSURE,
+) -> EvaporationRun:
+    """Model a run of ``duration`` seconds (unscaled run time) at ``profile``'s set points.
+
+    Args:
+        profile: Set points: bath temperature, vacuum, rotation and flask lowering.
+        duration: Run time in seconds.
+        volume: Solvent in the flask at the start, in ml.
+        initial_temperature: Bath temperature when the profile is applied.
+        initial_pressure: Pressure when the profile is applied.
+    """
+    steps = max(int(np.ceil(duration / MODEL_STEP)), 1)
+    times = np.linspace(0.0, steps * MODEL_STEP, steps + 1)
+
+    temperature = profile.target_temperature + (initial_temperature - profile.target_temperature) * np.exp(
+        -times / BATH_TIME_CONSTANT
+    )
+    pressure = profile.target_pressure + (initial_pressure - profile.target_pressure) * np.exp(
+        -times / VACUUM_TIME_CONSTANT
+    )
+    boiling = boiling_point(pressure)
+
+    # Thin film on the rotating flask plus the immersed wall area
+    surface = np.sqrt(max(profile.rpm, 0) / REFERENCE_RPM) * (0.5 + min(max(profile.lower_height, 0.0), 100.0) / 100.0)
+    rate = EVAPORATION_COEFFICIENT * surface * np.maximum(temperature - boiling, 0.0)  # ml/s
+    evaporated = np.concatenate(([0.0], np.cumsum((rate[1:] + rate[:-1]) / 2.0 * np.diff(times))))
+    remaining = np.maximum(volume - evaporated, 0.0)
+
+    return EvaporationRun(times, temperature, pressure, remaining, boiling)
+
+
+def _solvent_dry(run: EvaporationRun, profile: EvaporationProfile) -> np.ndarray:
+    return run.volume <= DRY_VOLUME
+
+
+def _pressure_reached(run: EvaporationRun, profile: EvaporationProfile) -> np.ndarray:
+    tolerance = max(PRESSURE_TOLERANCE * profile.target_pressure, 1.0)
+    return np.abs(run.pressure - profile.target_pressure) <= tolerance
+
+
+def _temperature_reached(run: EvaporationRun, profile: EvaporationProfile) -> np.ndarray:
+    return np.abs(run.temperature - profile.target_temperature) <= TEMPERATURE_TOLERANCE
+
+
+def _boiling(run: EvaporationRun, profile: EvaporationProfile) -> np.ndarray:
+    return run.temperature > run.boiling_point
+
+
+# Trigger ``event_name`` -> where in a stage's model (under its profile) the event holds;
+# other names (e.g. "bumping") need sensing the mock lacks and never fire
+EVAPORATION_EVENTS: dict[str, Callable[[EvaporationRun, EvaporationProfile], np.ndarray]] = {
+    "solvent_dry": _solvent_dry,
+    "pressure_reached": _pressure_reached,
+    "temperature_reached": _temperature_reached,
+    "boiling": _boiling,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class EvaporationStage:
+    """One profile of a run, from the trigger that applied it to the next stage's."""
+
+    index: int  # 0 for ``profiles.start``, n for ``profiles.updates[n - 1]``
+    profile: EvaporationProfile
+    start: float  # run time the stage was applied, s
+    duration: float  # run time until the next stage, s (0 for a final stage applied as the run ends)
+    model: EvaporationRun  # process model from ``start`` on
+    reason: str = ""  # trigger that applied the stage, e.g. "event: solvent_dry"
+
+
+class EvaporationSchedule:
+    """The stages a multi-profile run goes through, in the order they are applied."""
+
+    __slots__ = ("_starts", "skipped", "stages")
+
+    def __init__(self, stages: list[EvaporationStage], skipped: list[int]) -> None:
+        self.stages = stages
+        self.skipped = skipped  # update indexes (as ``EvaporationStage.index``) that never fired
+        self._starts = [stage.start for stage in stages]
+
+    @property
+    def duration(self) -> float:
+        """Run time until the last stage ends, in seconds."""
+        last = self.stages[-1]
+        return last.start + last.duration
+
+    @property
+    def final(self) -> EvaporationProfile:
+        """The profile in effect when the run ends."""
+        return self.stages[-1].profile
+
+    def stage_at(self, run_time: float) -> EvaporationStage:
+        """The stage in effect ``run_time`` seconds into the run."""
+        return self.stages[max(bisect_right(self._starts, run_time) - 1, 0)]
+
+    def at(self, run_time: float) -> EvaporatorReading:
+        """Sensor readings ``run_time`` seconds into the run, from the stage in effect then."""
+        stage = self.stage_at(run_time)
+        return stage.model.at(run_time - stage.start)
+
+
+def _first_event(run: EvaporationRun, event_name: str, profile: EvaporationProfile, horizon: float) -> float | None:
+    """Run time within ``horizon`` at which ``event_name`` first holds in ``run``, if it does."""
+    holds = EVAPORATION_EVENTS[event_name](run, profile) & (run.times <= horizon)
+    first = int(np.argmax(holds))
+    return float(run.times[first]) if holds[first] else None
+
+
+def schedule_evaporation(
+    profiles: EvaporationProfiles, *, volume: float = 200.0, event_timeout: float = EVENT_TIMEOUT
+) -> EvaporationSchedule:
+    """Apply every profile of ``profiles`` at its trigger, modelling the process in between.
+
+    Timed stages fire at ``time_in_sec`` run seconds; event stages when their
+    ``event_name`` first holds under the profile in effect (stages waiting on the same
+    event fire on successive occurrences, in list order). Ties go to the earlier listed
+    stage. The run ends when the last stage is applied, or ``event_timeout`` seconds
+    after the last stage if only event stages are left and none fires; those are
+    reported in ``skipped`` along with stages whose trigger is missing or unknown.
+
+    Args:
+        profiles: Start profile and triggered updates.
+        volume: Solvent in the flask at the start, in ml.
+        event_timeout: Run seconds to wait for event stages once no timed stage is left.
+    """
+    timed: list[tuple[float, int]] = []  # heap of (trigger time, stage index)
+    waiting: dict[str, deque[int]] = {}  # event name -> indexes of the stages waiting for it, in order
+    skipped: list[int] = []
+    for index, profile in enumerate(profiles.updates, start=1):
+        trigger = profile.trigger
+        if trigger is None:
+            skipped.append(index)
+        elif trigger.type == "time_from_start" and trigger.time_in_sec is not None:
+            timed.append((float(max(trigger.time_in_sec, 0)), index))
+        elif trigger.type == "event" and trigger.event_name in EVAPORATION_EVENTS:
+            waiting.setdefault(trigger.event_name, deque()).append(index)
+        else:
+            skipped.append(index)
+    heapq.heapify(timed)
+
+    stages: list[EvaporationStage] = []
+    index, profile, start, reason = 0, profiles.start, 0.0, ""
+    temperature, pressure = AMBIENT_TEMPERATURE, AMBIENT_PRESSURE
+    while True:
+        if timed:
+            horizon = timed[0][0] - start
+        elif waiting:
+            horizon = event_timeout
+        else:
+            horizon = DEFAULT_RUN_DURATION if index == 0 else 0.0
+        model = simulate_evaporation(
+            profile, horizon, volume=volume, initial_temperature=temperature, initial_pressure=pressure
+        )
+
+        # (run time, stage index, event name or None for the timed stage)
+        upcoming = (timed[0][0], timed[0][1], None) if timed else None
+        for event_name, queue in waiting.items():
+            fired = _first_event(model, event_name, profile, horizon)
+            if fired is not None and (upcoming is None or (start + fired, queue[0]) < upcoming[:2]):
+                upcoming = (start + fired, queue[0], event_name)
+        if upcoming is None:
+            stages.append(EvaporationStage(index, profile, start, horizon, model, reason))
+            skipped.extend(stage for queue in waiting.values() for stage in queue)
+            break
+
+        fired_at, next_index, event_name = upcoming
+        if event_name is None:
+            heapq.heappop(timed)
+            next_reason = f"time_from_start: {fired_at:g}s"
+        else:
+            waiting[event_name].popleft()
+            if not waiting[event_name]:
+                del waiting[event_name]
+            next_reason = f"event: {event_name}"
+        stages.append(EvaporationStage(index, profile, start, fired_at - start, model, reason))
+
+        # The next stage starts from this one's state at the trigger (a model grid point)
+        point = min(round((fired_at - start) / MODEL_STEP), len(model.times) - 1)
+        temperature, pressure, volume = (
+            float(model.temperature[point]),
+            float(model.pressure[point]),
+            float(model.volume[point]),
+        )
+        index, profile, start, reason = next_index, profiles.updates[next_index - 1], fired_at, next_reason
+
+    skipped.sort()
+    return EvaporationSchedule(stages, skipped)
@@ -5,13 +5,20 @@ Generates deterministic mock image URLs with timestamps for device screen captur
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from src.generators.entity_updates import generate_robot_timestamp
 from src.schemas.results import CapturedImage
 
+if TYPE_CHECKING:
+    from datetime import datetime
+
 
-def generate_image_url(base_url: str, work_station: str, device_id: str, component: str) -> str:
+def generate_image_url(
+    base_url: str, work_station: str, device_id: str, component: str, now: datetime | None = None
+) -> str:
     """Generate a mock image URL with timestamp in spec format."""
-    timestamp = generate_robot_timestamp()
+    timestamp = generate_robot_timestamp(now)
     return f"{base_url}/{work_station}/{device_id}/{component}/{timestamp}.jpg"
 
 
@@ -21,6 +28,7 @@ def generate_captured_images(
     device_id: str,
     device_type: str,
     components: list[str] | str,
+    now: datetime | None = None,
 ) -> list[CapturedImage]:
     """Generate CapturedImage list for one or multiple components."""
     if isinstance(components, str):
@@ -31,8 +39,8 @@ def generate_captured_images(
             device_id=device_id,
             device_type=device_type,
             component=component,
-            url=generate_image_url(base_url, work_station, device_id, component),
-            create_time=generate_robot_timestamp(),
+            url=generate_image_url(base_url, work_station, device_id, component, now),
+            create_time=generate_robot_timestamp(now),
         )
         for component in components
     ]
@@ -2,23 +2,59 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+import contextlib
+import zlib
+from typing import TYPE_CHECKING, Any
 
+import aio_pika
 from aio_pika import connect_robust
-from aio_pika.abc import AbstractChannel, AbstractRobustConnection
+from aio_pika.abc import AbstractChannel, AbstractExchange, AbstractRobustConnection
 from loguru import logger
 
+from src.mq.publisher import ConfirmPipeline
+
 if TYPE_CHECKING:
     from src.config import MockSettings
 
+# Channel roles — every role gets its own channel (or shards of channels)
+CONSUMER_CHANNEL = "consumer"
+RESULT_CHANNEL = "result"
+LOG_CHANNEL = "log"
+HEARTBEAT_CHANNEL = "heartbeat"
+
+
+def channel_name(role: str, robot_id: str, shards: int = 1) -> str:
+    """Return the pooled channel name serving ``role`` for ``robot_id``.
+
+    With ``shards`` > 1 robots are spread over ``role.0`` … ``role.{shards-1}`` by a
+    stable hash, so one busy robot cannot stall every other robot's publishes.
+    """
+    if shards <= 1:
+        return role
+    return f"{role}.{zlib.crc32(robot_id.encode()) % shards}"
+
 
 class MQConnection:
-    """Manages a single RabbitMQ connection and channel for the mock server."""
+    """Manages a single RabbitMQ connection and a pool of named channels.
+
+    Consumer channels carry their own prefetch (QoS); publisher channels are dedicated
+    per producer role and optionally sharded per robot (see ``channel_name``). Each
+    publisher channel has its own ``ConfirmPipeline``. Channels found closed are
+    reopened on next access, and exchanges declared on them are re-declared. Queues and
+    consumers are not: the consumer re-subscribes itself when its channel closes
+    (``CommandConsumer`` watches the channel's ``close_callbacks``).
+    """
 
     def __init__(self, settings: MockSettings) -> None:
         self._settings = settings
         self._connection: AbstractRobustConnection | None = None
-        self._channel: AbstractChannel | None = None
+        self._channels: dict[str, AbstractChannel] = {}
+        self._channel_prefetch: dict[str, int | None] = {}
+        self._channel_reopens: dict[str, int] = {}
+        self._channel_locks: dict[str, asyncio.Lock] = {}
+        self._exchanges: dict[str, tuple[AbstractChannel, AbstractExchange]] = {}
+        self._pipelines: dict[str, ConfirmPipeline] = {}
 
     @property
     def is_connected(self) -> bool:
@@ -41,10 +77,17 @@ class MQConnection:
         logger.info("Connected to RabbitMQ at {}:{}", self._settings.mq_host, self._settings.mq_port)
 
     async def disconnect(self) -> None:
-        """Close channel and connection gracefully."""
-        if self._channel and not self._channel.is_closed:
-            await self._channel.close()
-            self._channel = None
+        """Flush outstanding publishes, then close all channels and the connection gracefully."""
+        for name, pipeline in self._pipelines.items():
+            await pipeline.close()
+            logger.info("Publisher stats [{}]: {}", name, pipeline.stats.as_dict())
+        self._pipelines.clear()
+
+        for channel in self._channels.values():
+            if not channel.is_closed:
+                await channel.close()
+        self._channels.clear()
+        self._exchanges.clear()
 
         if self._connection and not self._connection.is_closed:
             await self._connection.close()
@@ -52,13 +95,87 @@ class MQConnection:
 
         logger.info("Disconnected from RabbitMQ")
 
-    async def get_channel(self) -> AbstractChannel:
-        """Return existing channel or create a new one from the connection."""
+    async def get_channel(self, name: str = CONSUMER_CHANNEL, *, prefetch_count: int | None = None) -> AbstractChannel:
+        """Return the pooled channel ``name``, opening (or reopening) it if needed.
+
+        Args:
+            name: Pool key, e.g. ``consumer`` or a name from ``channel_name()``.
+            prefetch_count: QoS applied when the channel is opened. Defaults to
+                ``mq_prefetch_count`` for consumer channels and no QoS otherwise.
+        """
         if self._connection is None or self._connection.is_closed:
             raise RuntimeError("RabbitMQ connection not established. Call connect() first.")
 
-        if self._channel is None or self._channel.is_closed:
-            self._channel = await self._connection.channel()
-            await self._channel.set_qos(prefetch_count=self._settings.mq_prefetch_count)
-
-        return self._channel
+        channel = self._channels.get(name)
+        if channel is not None and not channel.is_closed:
+            return channel
+
+        lock = self._channel_locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            channel = self._channels.get(name)
+            if channel is not None and not channel.is_closed:
+                return channel
+
+            if channel is not None:
+                self._channel_reopens[name] = self._channel_reopens.get(name, 0) + 1
+                logger.warning("Channel '{}' was closed, reopening (reopen #{})", name, self._channel_reopens[name])
+                # Close it for good so a robust channel does not restore itself (and its
+                # consumers) next to the replacement
+                with contextlib.suppress(Exception):
+                    await channel.close()
+
+            if prefetch_count is None and name.startswith(CONSUMER_CHANNEL):
+                prefetch_count = self._settings.mq_prefetch_count
+
+            channel = await self._connection.channel()
+            if prefetch_count is not None:
+                await channel.set_qos(prefetch_count=prefetch_count)
+
+            self._channels[name] = channel
+            self._channel_prefetch[name] = prefetch_count
+            return channel
+
+    async def get_exchange(self, name: str) -> AbstractExchange:
+        """Return the topic exchange declared on pooled channel ``name``.
+
+        The declaration is cached per channel and repeated transparently after the
+        channel has been reopened, so producers can call this on every publish.
+        """
+        channel = await self.get_channel(name)
+        cached = self._exchanges.get(name)
+        if cached is not None and cached[0] is channel:
+            return cached[1]
+
+        exchange = await channel.declare_exchange(
+            self._settings.mq_exchange,
+            type=aio_pika.ExchangeType.TOPIC,
+            durable=True,
+        )
+        self._exchanges[name] = (channel, exchange)
+        return exchange
+
+    def get_pipeline(self, name: str) -> ConfirmPipeline:
+        """Return the confirm pipeline for publisher channel ``name``."""
+        pipeline = self._pipelines.get(name)
+        if pipeline is None:
+            pipeline = ConfirmPipeline(
+                max_in_flight=self._settings.mq_publish_max_in_flight,
+                confirm_batch_size=self._settings.mq_confirm_batch_size,
+            )
+            self._pipelines[name] = pipeline
+        return pipeline
+
+    def channel_health(self) -> dict[str, dict[str, Any]]:
+        """Per-channel health: open flag, QoS, reopen count and publisher counters."""
+        health: dict[str, dict[str, Any]] = {}
+        for name, channel in self._channels.items():
+            entry: dict[str, Any] = {
+                "open": not channel.is_closed,
+                "prefetch_count": self._channel_prefetch.get(name),
+                "reopens": self._channel_reopens.get(name, 0),
+            }
+            pipeline = self._pipelines.get(name)
+            if pipeline is not None:
+                entry["publisher"] = pipeline.stats.as_dict()
+            health[name] = entry
+        return health
@@ -6,14 +6,20 @@ import asyncio
 import json
 from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
 
-import aio_pika
 from aio_pika.abc import AbstractIncomingMessage
 from loguru import logger
 from pydantic import BaseModel, ValidationError
 
+from src.mq.connection import CONSUMER_CHANNEL, channel_name
+from src.mq.dispatcher import TaskDispatcher
+from src.mq.registry import TaskRegistry
 from src.schemas.commands import (
+    CONTROL_TASK_TYPES,
     CollectCCFractionsParams,
+    ControlCommand,
+    ResetStateCommand,
     RobotCommand,
+    SeedStateCommand,
     SetupCartridgesParams,
     SetupTubeRackParams,
     StartCCParams,
@@ -21,6 +27,7 @@ from src.schemas.commands import (
     TakePhotoParams,
     TaskType,
     TerminateCCParams,
+    decode_command,
 )
 from src.schemas.results import RobotResult
 
@@ -31,6 +38,7 @@ if TYPE_CHECKING:
     from src.mq.connection import MQConnection
     from src.mq.log_producer import LogProducer
     from src.mq.producer import ResultProducer
+    from src.schemas.protocol import TypedRobotCommand
     from src.state.preconditions import PreconditionChecker
     from src.state.world_state import WorldState
 
@@ -71,6 +79,13 @@ PARAM_MODELS: dict[TaskType, type[BaseModel]] = {
 
 LONG_RUNNING_TASKS: set[TaskType] = {TaskType.START_CC, TaskType.START_EVAPORATION}
 
+# Backoff (seconds) between attempts to re-subscribe after the consumer channel closed
+RESUBSCRIBE_MIN_DELAY = 0.5
+RESUBSCRIBE_MAX_DELAY = 30.0
+
+# Commands that stop the task of the given type running on the same device (or work station)
+TERMINATES: dict[TaskType, TaskType] = {TaskType.TERMINATE_CC: TaskType.START_CC}
+
 
 # ---------------------------------------------------------------------------
 # Consumer
@@ -78,7 +93,12 @@ LONG_RUNNING_TASKS: set[TaskType] = {TaskType.START_CC, TaskType.START_EVAPORATI
 
 
 class CommandConsumer:
-    """Consumes RobotCommand messages, routes them to the matching simulator."""
+    """Consumes RobotCommand messages, routes them to the matching simulator.
+
+    Each decoded command is handed to a ``TaskDispatcher`` and acknowledged as soon as
+    it is admitted; the simulation runs as a tracked task under the configured limits
+    and is listed in a ``TaskRegistry`` so a terminating command can cancel it.
+    """
 
     def __init__(
         self,
@@ -98,7 +118,14 @@ class CommandConsumer:
         self._simulators: dict[TaskType, BaseSimulator] = {}
         self._queue: AbstractQueue | None = None
         self._consumer_tag: str | None = None
+        self._consuming = False
+        self._resubscribe_task: asyncio.Task | None = None
         self._precondition_checker: PreconditionChecker | None = None
+        self._dispatcher = TaskDispatcher(
+            max_in_flight=settings.mq_max_in_flight_tasks or settings.mq_prefetch_count,
+            limits={TaskType(name): limit for name, limit in settings.task_concurrency_limits.items()},
+        )
+        self._registry = TaskRegistry()
 
     # -- public API ----------------------------------------------------------
 
@@ -107,27 +134,40 @@ class CommandConsumer:
         """Lazy-initialized precondition checker."""
         if self._world_state is not None and self._precondition_checker is None:
             from src.state.preconditions import PreconditionChecker
+            from src.state.rules import load_rules
 
-            self._precondition_checker = PreconditionChecker(self._world_state)
+            self._precondition_checker = PreconditionChecker(
+                self._world_state,
+                load_rules(self._settings.precondition_rules_file),
+                cache_size=self._settings.precondition_cache_size,
+            )
         return self._precondition_checker
 
+    @property
+    def dispatcher(self) -> TaskDispatcher:
+        """Dispatcher running admitted commands (exposes in-flight, queue depth and stats)."""
+        return self._dispatcher
+
+    @property
+    def registry(self) -> TaskRegistry:
+        """Commands whose simulation is running, by task id, device and work station."""
+        return self._registry
+
     def register_simulator(self, task_type: TaskType, simulator: BaseSimulator) -> None:
         """Register a simulator for a given task type."""
         self._simulators[task_type] = simulator
 
     async def initialize(self) -> None:
-        """Declare queue and exchange, bind them together."""
-        channel = await self._connection.get_channel()
+        """Declare queue and exchange on the pooled consumer channel, bind them together."""
+        consumer_channel = channel_name(CONSUMER_CHANNEL, self._settings.robot_id, self._settings.mq_channel_shards)
+        channel = await self._connection.get_channel(consumer_channel, prefetch_count=self._settings.mq_prefetch_count)
+        channel.close_callbacks.add(self._on_channel_closed)
 
         queue_name = f"{self._settings.robot_id}.cmd"
         routing_key = f"{self._settings.robot_id}.cmd"
 
         # Declare the topic exchange (idempotent, shared with producer)
-        exchange = await channel.declare_exchange(
-            self._settings.mq_exchange,
-            type=aio_pika.ExchangeType.TOPIC,
-            durable=True,
-        )
+        exchange = await self._connection.get_exchange(consumer_channel)
 
         # Declare the per-robot command queue
         self._queue = await channel.declare_queue(
@@ -151,124 +191,263 @@ class CommandConsumer:
             raise RuntimeError("Consumer not initialized. Call initialize() first.")
 
         self._consumer_tag = await self._queue.consume(self._process_message)
+        self._consuming = True
         logger.info("Consuming commands from queue '{}.cmd'...", self._settings.robot_id)
 
     async def stop(self) -> None:
         """Cancel the active consumer."""
+        self._consuming = False
+        if self._resubscribe_task is not None:
+            self._resubscribe_task.cancel()
+            self._resubscribe_task = None
         if self._queue is not None and self._consumer_tag is not None:
             await self._queue.cancel(self._consumer_tag)
             self._consumer_tag = None
             logger.info("Consumer stopped")
 
+    async def drain(self, timeout: float) -> int:
+        """Finish in-flight commands within ``timeout`` seconds, abandon the rest.
+
+        Every abandoned command gets a code 1003 result so the caller does not have to
+        wait for its own timeout. Call after ``stop()`` so no new commands arrive.
+
+        Returns:
+            Number of abandoned commands.
+        """
+        abandoned = await self._dispatcher.drain(timeout)
+        for task_id, task_type in abandoned:
+            logger.warning("Abandoning task {} ({}) at shutdown", task_id, task_type)
+            try:
+                await self._producer.publish_result(
+                    RobotResult(
+                        code=1003,
+                        msg=f"Task abandoned: mock server shut down before {task_type} completed",
+                        task_id=task_id,
+                    )
+                )
+            except Exception:
+                logger.exception("Failed to publish abandoned result for task {}", task_id)
+        logger.info("Consumer drained, dispatcher stats: {}", self._dispatcher.stats.as_dict())
+        logger.info("Task registry stats: {}", self._registry.stats.as_dict())
+        if self._precondition_checker is not None and self._precondition_checker.cache is not None:
+            logger.info("Precondition cache stats: {}", self._precondition_checker.cache.stats.as_dict())
+        return len(abandoned)
+
+    async def join(self, task_id: str | None = None) -> None:
+        """Wait until the command ``task_id`` (default: every admitted command) has finished."""
+        await self._dispatcher.join(task_id)
+
     # -- internal ------------------------------------------------------------
 
-    async def _process_message(self, message: AbstractIncomingMessage) -> None:  # noqa: C901
-        """Core routing logic: parse command, apply scenarios, dispatch to simulator."""
-        async with message.process(requeue=False):
+    def _on_channel_closed(self, channel: Any, exc: BaseException | None = None) -> None:
+        """Close callback of the consumer channel: re-subscribe unless we are stopping."""
+        if not self._consuming or (self._resubscribe_task is not None and not self._resubscribe_task.done()):
+            return
+        logger.warning("Consumer channel closed ({!r}), re-subscribing to '{}.cmd'", exc, self._settings.robot_id)
+        self._consumer_tag = None
+        self._resubscribe_task = asyncio.create_task(self._resubscribe())
+
+    async def _resubscribe(self) -> None:
+        """Re-declare the command queue on a reopened channel and consume again, with backoff."""
+        delay = RESUBSCRIBE_MIN_DELAY
+        while self._consuming:
             try:
-                # Log raw message for debugging
-                logger.debug("Raw message body (first 500 chars): {}", message.body[:500])
-                raw = json.loads(message.body)
-                logger.debug("Parsed JSON structure: {}", json.dumps(raw, indent=2)[:1000])
-
-                # Handle special command: reset_state (before Pydantic validation)
-                if raw.get("task_type") == "reset_state":
-                    task_id = raw.get("task_id", "unknown")
-                    if self._world_state is not None:
-                        self._world_state.reset()
-                        logger.info("World state reset via reset_state command")
-                        await self._producer.publish_result(
-                            RobotResult(code=200, msg="World state reset", task_id=task_id)
-                        )
-                    else:
-                        await self._producer.publish_result(
-                            RobotResult(code=1002, msg="World state tracking not enabled", task_id=task_id)
-                        )
-                    return
+                await self.initialize()
+                self._consumer_tag = await self._queue.consume(self._process_message)
+            except Exception:
+                logger.exception("Re-subscribing to '{}.cmd' failed, retrying in {}s", self._settings.robot_id, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RESUBSCRIBE_MAX_DELAY)
+            else:
+                logger.info("Consuming commands from queue '{}.cmd' again", self._settings.robot_id)
+                return
 
-                command = RobotCommand.model_validate(raw)
-            except json.JSONDecodeError:
-                logger.error("Failed to decode message body as JSON: {}", message.body[:200])
+    async def _process_message(self, message: AbstractIncomingMessage) -> None:
+        """Decode a command and hand it to the dispatcher; the message is acked once admitted."""
+        async with message.process(requeue=False, ignore_processed=True):
+            # Log raw message for debugging
+            logger.debug("Raw message body (first 500 chars): {}", message.body[:500])
+            command = self._decode(message.body)
+            if command is None:
                 return
-            except ValidationError as exc:
-                logger.error("Invalid RobotCommand envelope: {}", exc)
+            if isinstance(command, RobotResult):
+                # Invalid control command: not a TaskType, so it gets its 1001 reply here
+                await self._producer.publish_result(command)
                 return
 
-            task_id = command.task_id
-            task_type = command.task_type
+            # Control commands run inline, before the message is acked
+            if isinstance(command, ResetStateCommand):
+                await self._reset_state(command.task_id)
+                return
+            if isinstance(command, SeedStateCommand):
+                await self._seed_state(command)
+                return
 
-            logger.info("Received command: task_id={}, task_type={}, params={}", task_id, task_type, command.params)
-            logger.debug(
-                "Params dict keys: {}, Params values sample: {}",
-                list(command.params.keys())[:10],
-                {k: v for i, (k, v) in enumerate(command.params.items()) if i < 3},
+            task = await self._dispatcher.submit(command.task_id, command.task_type, lambda: self._execute(command))
+            if task is None:
+                # Shutting down: hand the command back to the broker for the next instance
+                logger.info("Not admitting task {} during shutdown, requeueing", command.task_id)
+                await message.nack(requeue=True)
+
+    @staticmethod
+    def _decode(body: bytes) -> TypedRobotCommand[Any] | ControlCommand | RobotCommand | RobotResult | None:
+        """Decode a message body in one pass, falling back to the bare envelope on bad params.
+
+        Returns the typed command on success. If only the params are invalid, returns the
+        ``RobotCommand`` envelope so the task still gets a 1001 result from ``_execute``;
+        for a control command (not a ``TaskType``) it returns that 1001 result directly.
+        Returns ``None`` for bodies that are not a valid command envelope at all.
+        """
+        try:
+            return decode_command(body)
+        except ValidationError as exc:
+            typed_error = exc
+
+        try:
+            return RobotCommand.model_validate_json(body)
+        except ValidationError as exc:
+            if any(error["type"] == "json_invalid" for error in exc.errors()):
+                logger.error("Failed to decode message body as JSON: {}", body[:200])
+                return None
+
+        raw = json.loads(body)
+        if isinstance(raw, dict) and raw.get("task_type") in CONTROL_TASK_TYPES:
+            task_id = raw.get("task_id")
+            task_id = task_id if isinstance(task_id, str) else "unknown"
+            logger.error("Invalid {} command {}: {}", raw["task_type"], task_id, typed_error)
+            return RobotResult(code=1001, msg=f"Parameter validation error: {typed_error}", task_id=task_id)
+        logger.error("Invalid RobotCommand envelope: {}", typed_error)
+        return None
+
+    async def _reset_state(self, task_id: str) -> None:
+        """Handle the ``reset_state`` control command."""
+        if self._world_state is not None:
+            self._world_state.reset()
+            logger.info("World state reset via reset_state command")
+            await self._producer.publish_result(RobotResult(code=200, msg="World state reset", task_id=task_id))
+        else:
+            await self._producer.publish_result(
+                RobotResult(code=1002, msg="World state tracking not enabled", task_id=task_id)
             )
 
-            try:
-                # --- Scenario overrides ---
-                if self._scenario_manager.should_timeout(task_type):
-                    logger.warning("Simulating timeout for task {}", task_id)
-                    return
+    async def _seed_state(self, command: SeedStateCommand) -> None:
+        """Handle the ``seed_state`` control command."""
+        if self._world_state is not None:
+            count = self._world_state.seed(
+                command.params.entities, replace=command.params.replace, task_id=command.task_id
+            )
+            logger.info("World state seeded via seed_state command ({} entities)", count)
+            await self._producer.publish_result(
+                RobotResult(code=200, msg=f"World state seeded with {count} entities", task_id=command.task_id)
+            )
+        else:
+            await self._producer.publish_result(
+                RobotResult(code=1002, msg="World state tracking not enabled", task_id=command.task_id)
+            )
 
-                if self._scenario_manager.should_fail(task_type):
-                    failure_result = self._scenario_manager.get_failure_result(task_id, task_type)
-                    logger.warning("Simulating failure for task {}", task_id)
-                    await self._producer.publish_result(failure_result)
-                    return
+    async def _execute(self, command: TypedRobotCommand[Any] | RobotCommand) -> None:  # noqa: C901
+        """Core routing logic: apply scenarios, check preconditions, run the simulator."""
+        task_id = command.task_id
+        task_type = command.task_type
+
+        logger.info("Received command: task_id={}, task_type={}, params={}", task_id, task_type, command.params)
+
+        try:
+            # --- Scenario overrides ---
+            if self._scenario_manager.should_timeout(task_type):
+                logger.warning("Simulating timeout for task {}", task_id)
+                return
 
-                # --- Simulator lookup ---
-                simulator = self._simulators.get(task_type)
-                if simulator is None:
+            if self._scenario_manager.should_fail(task_type):
+                failure_result = self._scenario_manager.get_failure_result(task_id, task_type)
+                logger.warning("Simulating failure for task {}", task_id)
+                await self._producer.publish_result(failure_result)
+                return
+
+            # --- Simulator lookup ---
+            simulator = self._simulators.get(task_type)
+            if simulator is None:
+                error_result = RobotResult(
+                    code=1000,
+                    msg=f"Unknown task type: {task_type}",
+                    task_id=task_id,
+                )
+                await self._producer.publish_result(error_result)
+                return
+
+            # --- Task-specific params (already typed unless decoding fell back to the envelope) ---
+            if isinstance(command, RobotCommand):
+                params_model = self._parse_params(task_type, command.params)
+            else:
+                params_model = command.params
+
+            self._registry.register(task_id, task_type, params_model)
+
+            # --- Terminate the task this command stops, freeing its reservations ---
+            if task_type in TERMINATES:
+                await self._terminate_running(task_id, TERMINATES[task_type], params_model)
+
+            # --- Precondition check ---
+            if self.precondition_checker is not None:
+                precondition_result = self.precondition_checker.check_and_reserve(task_id, task_type, params_model)
+                if not precondition_result.ok:
+                    logger.warning(
+                        "Precondition check failed for task {}: {}",
+                        task_id,
+                        precondition_result.error_msg,
+                    )
                     error_result = RobotResult(
-                        code=1000,
-                        msg=f"Unknown task type: {task_type}",
+                        code=precondition_result.error_code,
+                        msg=precondition_result.error_msg,
                         task_id=task_id,
                     )
                     await self._producer.publish_result(error_result)
                     return
 
-                # --- Parse task-specific params ---
-                params_model = self._parse_params(task_type, command.params)
-
-                # --- Precondition check ---
-                if self.precondition_checker is not None:
-                    precondition_result = self.precondition_checker.check(task_type, params_model)
-                    if not precondition_result.ok:
-                        logger.warning(
-                            "Precondition check failed for task {}: {}",
-                            task_id,
-                            precondition_result.error_msg,
-                        )
-                        error_result = RobotResult(
-                            code=precondition_result.error_code,
-                            msg=precondition_result.error_msg,
-                            task_id=task_id,
-                        )
-                        await self._producer.publish_result(error_result)
-                        return
-
-                # --- Dispatch ---
-                if task_type in LONG_RUNNING_TASKS:
-                    asyncio.create_task(self._run_long_task(task_id, task_type, simulator, params_model))
-                else:
-                    result = await simulator.simulate(task_id, task_type, params_model)
-                    await self._publish_final_log(result)
-                    await self._producer.publish_result(result)
-                    # Apply state updates after successful execution
-                    if self._world_state is not None and result.is_success():
-                        self._world_state.apply_updates(result.updates)
-
-            except ValidationError as exc:
-                logger.error("Parameter validation failed for task {}: {}", task_id, exc)
-                logger.error("Raw params that failed validation: {}", json.dumps(command.params, indent=2)[:500])
-                await self._producer.publish_result(
-                    RobotResult(code=1001, msg=f"Parameter validation error: {exc}", task_id=task_id)
-                )
-            except Exception:
+            # --- Run ---
+            result = await simulator.simulate(task_id, task_type, params_model)
+            self._registry.finish(task_id)
+            await self._publish_final_log(result)
+            await self._producer.publish_result(result)
+            # Apply state updates after successful execution
+            if self._world_state is not None and result.is_success():
+                self._world_state.apply_updates(result.updates, task_id=task_id)
+
+        except asyncio.CancelledError:
+            running = self._registry.get(task_id)
+            task = asyncio.current_task()
+            if running is None or running.terminated_by is None or task.cancelling() > 1:
+                raise  # shutdown drain (also when it hit a terminated task): reported as abandoned by drain()
+            task.uncancel()
+            logger.info("Task {} ({}) terminated by task {}", task_id, task_type, running.terminated_by)
+            await self._producer.publish_result(
+                RobotResult(code=1004, msg=f"Task terminated by task {running.terminated_by}", task_id=task_id)
+            )
+        except ValidationError as exc:
+            logger.error("Parameter validation failed for task {}: {}", task_id, exc)
+            logger.opt(lazy=True).error(
+                "Raw params that failed validation: {}",
+                lambda: json.dumps(
+                    command.params if isinstance(command.params, dict) else command.params.model_dump(mode="json"),
+                    indent=2,
+                )[:500],
+            )
+            await self._producer.publish_result(
+                RobotResult(code=1001, msg=f"Parameter validation error: {exc}", task_id=task_id)
+            )
+        except Exception:
+            if task_type in LONG_RUNNING_TASKS:
+                logger.exception("Long-running task {} ({}) failed", task_id, task_type)
+                msg = "Internal mock server error (long-running)"
+            else:
                 logger.exception("Unexpected error processing task {}", task_id)
-                await self._producer.publish_result(
-                    RobotResult(code=9999, msg="Internal mock server error", task_id=task_id)
-                )
+                msg = "Internal mock server error"
+            await self._producer.publish_result(RobotResult(code=9999, msg=msg, task_id=task_id))
+        finally:
+            self._registry.unregister(task_id)
+            # Failed, cancelled or update-less tasks still hold their reservations here
+            if self._world_state is not None:
+                self._world_state.reservations.release(task_id)
 
     # -- helpers -------------------------------------------------------------
 
@@ -280,33 +459,31 @@ class CommandConsumer:
             raise ValueError(f"No parameter model registered for {task_type}")
         return model_cls.model_validate(raw_params)
 
+    async def _terminate_running(self, task_id: str, task_type: TaskType, params: BaseModel) -> None:
+        """Cancel the running ``task_type`` command on ``params``' device (or work station) and wait for it.
+
+        The cancelled command publishes its own code 1004 result and releases its
+        reservations before this returns, so its result always precedes the terminating
+        command's and the terminating command can claim the device.
+        """
+        running = self._registry.find(
+            task_type,
+            device_id=getattr(params, "device_id", None),
+            work_station=getattr(params, "work_station", None),
+        )
+        if running is None or self._registry.terminate(running.task_id, by=task_id) is None:
+            return
+        logger.info("Task {} terminating running task {} ({})", task_id, running.task_id, task_type)
+        await asyncio.wait([running.task])
+
     async def _publish_final_log(self, result: RobotResult) -> None:
         """Publish the final entity updates from a result to the log channel.
 
         This ensures the final entity state is available on both the log and result
-        channels, so BIC-lab-service can consume from either.
+        channels, so BIC-lab-service can consume from either. The broker confirm is
+        awaited so the log is routed before the result is published.
         """
         if self._log_producer is not None and result.is_success() and result.updates:
-            await self._log_producer.publish_log(result.task_id, result.updates, "task_completed")
-            await asyncio.sleep(1)  # Small delay to ensure log is published before result
-
-    async def _run_long_task(
-        self,
-        task_id: str,
-        task_type: TaskType,
-        simulator: BaseSimulator,
-        params: BaseModel,
-    ) -> None:
-        """Execute a long-running simulation and publish its result."""
-        try:
-            result = await simulator.simulate(task_id, task_type, params)
-            await self._publish_final_log(result)
-            await self._producer.publish_result(result)
-            # Apply state updates after successful execution
-            if self._world_state is not None and result.is_success():
-                self._world_state.apply_updates(result.updates)
-        except Exception:
-            logger.exception("Long-running task {} ({}) failed", task_id, task_type)
-            await self._producer.publish_result(
-                RobotResult(code=9999, msg="Internal mock server error (long-running)", task_id=task_id)
+            await self._log_producer.publish_log(
+                result.task_id, result.updates, "task_completed", wait_for_confirm=True
             )
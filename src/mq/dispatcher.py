@@ -0,0 +1,209 @@
+"""Bounded task dispatcher used by the command consumer.
+
+Commands are acknowledged as soon as the dispatcher admits them, so a slow simulation
+no longer pins its delivery inside the prefetch window. Admission is bounded by
+``max_in_flight`` (running + waiting jobs); when it is reached, ``submit()`` blocks and
+the broker stops delivering once the prefetch window is full. Admitted jobs then wait
+for a per-``TaskType`` concurrency slot before they run.
+
+On shutdown ``drain()`` stops admitting, gives running jobs a deadline to finish and
+cancels the rest, returning them so the caller can report them as abandoned.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine, Mapping
+    from typing import Any
+
+    from src.schemas.commands import TaskType
+
+
+@dataclass
+class DispatcherStats:
+    """Queue-depth and wait-time counters for a ``TaskDispatcher``.
+
+    Wait time is measured from admission to the moment the job acquires its
+    per-type concurrency slot and starts running.
+    """
+
+    submitted: int = 0
+    started: int = 0
+    completed: int = 0
+    failed: int = 0
+    abandoned: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+    queue_depth_max: int = 0
+    started_by_type: Counter[str] = field(default_factory=Counter)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a flat snapshot suitable for logging or a metrics endpoint."""
+        return {
+            "submitted": self.submitted,
+            "started": self.started,
+            "completed": self.completed,
+            "failed": self.failed,
+            "abandoned": self.abandoned,
+            "wait_time_avg_ms": (self.wait_time_total / self.started * 1000.0) if self.started else 0.0,
+            "wait_time_max_ms": self.wait_time_max * 1000.0,
+            "queue_depth_max": self.queue_depth_max,
+            "started_by_type": dict(self.started_by_type),
+        }
+
+
+class TaskDispatcher:
+    """Runs admitted jobs as tracked tasks under global and per-task-type limits.
+
+    Args:
+        max_in_flight: Maximum number of admitted jobs (running or waiting).
+        limits: Optional per-task-type concurrency limits. Task types without an
+            entry are only bounded by ``max_in_flight``.
+    """
+
+    def __init__(self, max_in_flight: int, limits: Mapping[TaskType, int] | None = None) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        if limits and min(limits.values()) < 1:
+            raise ValueError("Per-task-type concurrency limits must be >= 1")
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._limits: dict[TaskType, asyncio.Semaphore] = {
+            task_type: asyncio.Semaphore(limit) for task_type, limit in (limits or {}).items()
+        }
+        self._tasks: dict[asyncio.Task, tuple[str, TaskType]] = {}
+        self._by_task_id: dict[str, asyncio.Task] = {}
+        self._waiting: Counter[TaskType] = Counter()
+        self._closing = False
+        self.stats = DispatcherStats()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of admitted jobs that have not finished yet."""
+        return len(self._tasks)
+
+    @property
+    def closing(self) -> bool:
+        """True once ``drain()`` has started; no further jobs are admitted."""
+        return self._closing
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of admitted jobs still waiting for their task-type slot."""
+        return sum(self._waiting.values())
+
+    def queue_depths(self) -> dict[str, int]:
+        """Waiting jobs per task type (only types with waiting jobs are listed)."""
+        return {str(task_type): depth for task_type, depth in self._waiting.items() if depth}
+
+    async def submit(
+        self,
+        task_id: str,
+        task_type: TaskType,
+        job: Callable[[], Coroutine[Any, Any, None]],
+    ) -> asyncio.Task | None:
+        """Admit a job, waiting while ``max_in_flight`` jobs are already admitted.
+
+        Args:
+            task_id: Task identifier, used for logging.
+            task_type: Selects the per-type concurrency limit.
+            job: Zero-argument coroutine function executed once a slot is free.
+
+        Returns:
+            The tracked task running the job, or ``None`` if the dispatcher is draining.
+        """
+        if self._slots.locked():
+            logger.debug("Dispatcher full ({} in flight), task {} waits for admission", self.in_flight, task_id)
+        await self._slots.acquire()
+        if self._closing:
+            self._slots.release()
+            return None
+
+        self.stats.submitted += 1
+        self._waiting[task_type] += 1
+        self.stats.queue_depth_max = max(self.stats.queue_depth_max, self.queue_depth)
+        task = asyncio.create_task(self._run(task_id, task_type, job, time.monotonic()), name=f"task:{task_id}")
+        self._tasks[task] = (task_id, task_type)
+        self._by_task_id[task_id] = task
+        task.add_done_callback(self._on_done)
+        return task
+
+    async def join(self, task_id: str | None = None) -> None:
+        """Wait until the job for ``task_id`` — or every admitted job — has finished."""
+        if task_id is not None:
+            task = self._by_task_id.get(task_id)
+            if task is not None:
+                await asyncio.wait([task])
+            return
+        while self._tasks:
+            await asyncio.wait(list(self._tasks))
+
+    async def drain(self, timeout: float) -> list[tuple[str, TaskType]]:
+        """Stop admitting jobs, wait up to ``timeout`` seconds, then cancel what is left.
+
+        Returns:
+            ``(task_id, task_type)`` of every job that was cancelled unfinished.
+        """
+        self._closing = True
+        pending = list(self._tasks)
+        if not pending:
+            return []
+
+        logger.info("Draining {} in-flight task(s), deadline {}s", len(pending), timeout)
+        unfinished = set(pending)
+        if timeout > 0:
+            _, unfinished = await asyncio.wait(pending, timeout=timeout)
+        abandoned = [self._tasks[task] for task in unfinished if task in self._tasks]
+        for task in unfinished:
+            task.cancel()
+        await asyncio.gather(*unfinished, return_exceptions=True)
+        self.stats.abandoned += len(abandoned)
+        return abandoned
+
+    async def _run(
+        self,
+        task_id: str,
+        task_type: TaskType,
+        job: Callable[[], Coroutine[Any, Any, None]],
+        admitted_at: float,
+    ) -> None:
+        limit = self._limits.get(task_type)
+        try:
+            if limit is not None:
+                await limit.acquire()
+        finally:
+            self._waiting[task_type] -= 1
+
+        wait_time = time.monotonic() - admitted_at
+        self.stats.started += 1
+        self.stats.started_by_type[str(task_type)] += 1
+        self.stats.wait_time_total += wait_time
+        self.stats.wait_time_max = max(self.stats.wait_time_max, wait_time)
+        if limit is not None and wait_time > 0.001:
+            logger.debug("Task {} ({}) waited {:.3f}s for a concurrency slot", task_id, task_type, wait_time)
+
+        try:
+            await job()
+        finally:
+            if limit is not None:
+                limit.release()
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        task_id, _ = self._tasks.pop(task)
+        if self._by_task_id.get(task_id) is task:
+            del self._by_task_id[task_id]
+        self._slots.release()
+        if task.cancelled():
+            self.stats.failed += 1
+        elif task.exception() is not None:
+            self.stats.failed += 1
+            logger.opt(exception=task.exception()).error("Dispatched job for task {} crashed", task_id)
+        else:
+            self.stats.completed += 1
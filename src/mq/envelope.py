@@ -0,0 +1,107 @@
+"""Outbound message envelope — serialize once, reuse the bytes everywhere.
+
+Producers build one ``OutboundMessage`` per publish. The model is dumped to JSON bytes
+exactly once; those bytes become the AMQP body, feed the publisher byte counters and
+back the log line. Pretty-printing happens only when a log sink actually renders it,
+via ``logger.opt(lazy=True)`` and ``OutboundMessage.pretty``.
+
+Log and result bodies are mostly entity updates, many of them repeated verbatim
+(robot moving, device in use, ...). ``from_model_with_updates`` serializes only the
+message shell and splices in each update's pre-rendered JSON fragment from the
+``UpdateTemplateCache``; the bytes are identical to serializing the full model.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+import aio_pika
+
+from src.generators.entity_updates import UPDATE_TEMPLATES
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from pydantic import BaseModel
+
+    from src.generators.entity_updates import UpdateTemplateCache
+    from src.schemas.results import EntityUpdate
+
+_EMPTY_UPDATES = b'"updates":[]'
+
+
+class OutboundMessage:
+    """A serialized message ready to be published on a routing key."""
+
+    __slots__ = ("body", "delivery_mode", "headers", "routing_key")
+
+    def __init__(
+        self,
+        body: bytes,
+        routing_key: str,
+        *,
+        persistent: bool = True,
+        headers: dict[str, Any] | None = None,
+    ) -> None:
+        self.body = body
+        self.routing_key = routing_key
+        self.delivery_mode = aio_pika.DeliveryMode.PERSISTENT if persistent else aio_pika.DeliveryMode.NOT_PERSISTENT
+        self.headers = headers
+
+    @classmethod
+    def from_model(
+        cls,
+        model: BaseModel,
+        routing_key: str,
+        *,
+        persistent: bool = True,
+        headers: dict[str, Any] | None = None,
+    ) -> OutboundMessage:
+        """Serialize ``model`` to compact JSON bytes (the only serialization for this message)."""
+        return cls(model.model_dump_json().encode(), routing_key, persistent=persistent, headers=headers)
+
+    @classmethod
+    def from_model_with_updates(
+        cls,
+        model: BaseModel,
+        updates: Sequence[EntityUpdate],
+        routing_key: str,
+        *,
+        persistent: bool = True,
+        headers: dict[str, Any] | None = None,
+        templates: UpdateTemplateCache = UPDATE_TEMPLATES,
+    ) -> OutboundMessage:
+        """Serialize ``model``, built with an empty ``updates`` list, as if it held ``updates``.
+
+        The model is serialized as is and each update's JSON is spliced into
+        ``"updates":[]``: the pre-rendered fragment for updates built by ``templates``,
+        otherwise the update serialized on its own (cheaper than serializing it through
+        the ``EntityUpdate`` union). The bytes are the same as ``from_model`` on a model
+        holding ``updates``.
+        """
+        body = model.model_dump_json().encode()
+        if updates:
+            fragment = templates.fragment
+            spliced = b'"updates":[' + b",".join([fragment(update) for update in updates]) + b"]"
+            # A JSON string cannot contain this unescaped, so the first match is the field itself
+            body = body.replace(_EMPTY_UPDATES, spliced, 1)
+        return cls(body, routing_key, persistent=persistent, headers=headers)
+
+    @property
+    def size(self) -> int:
+        """Body size in bytes."""
+        return len(self.body)
+
+    def to_amqp(self) -> aio_pika.Message:
+        """Wrap the serialized body in an ``aio_pika.Message`` without copying it."""
+        return aio_pika.Message(
+            body=self.body,
+            content_type="application/json",
+            delivery_mode=self.delivery_mode,
+            headers=self.headers,
+        )
+
+    def pretty(self) -> str:
+        """Indented JSON for human-readable logs; call lazily, it re-parses the body."""
+        return json.dumps(json.loads(self.body), indent=2, ensure_ascii=False)
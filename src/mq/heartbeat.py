@@ -1,4 +1,9 @@
-"""Heartbeat publisher — sends periodic heartbeat via {robot_id}.hb."""
+"""Heartbeat publisher — sends periodic heartbeat via {robot_id}.hb.
+
+While running, the publisher follows the robot entity through the ``WorldState`` change
+feed and keeps its state and work station cached, instead of re-reading the world on
+every beat.
+"""
 
 from __future__ import annotations
 
@@ -6,10 +11,12 @@ import asyncio
 import contextlib
 from typing import TYPE_CHECKING
 
-import aio_pika
 from loguru import logger
 
+from src.clock import Clock, RealClock
 from src.generators.entity_updates import generate_robot_timestamp
+from src.mq.connection import HEARTBEAT_CHANNEL, channel_name
+from src.mq.envelope import OutboundMessage
 from src.schemas.protocol import RobotState
 
 if TYPE_CHECKING:
@@ -17,32 +24,45 @@ if TYPE_CHECKING:
 
     from src.config import MockSettings
     from src.mq.connection import MQConnection
+    from src.state.changes import Subscription
     from src.state.world_state import WorldState
 
 
 class HeartbeatPublisher:
     """Publishes periodic heartbeat messages to {robot_id}.hb via the topic exchange."""
 
-    def __init__(self, connection: MQConnection, settings: MockSettings, world_state: WorldState | None = None) -> None:
+    def __init__(
+        self,
+        connection: MQConnection,
+        settings: MockSettings,
+        world_state: WorldState | None = None,
+        *,
+        clock: Clock | None = None,
+    ) -> None:
         self._connection = connection
         self._settings = settings
         self._world_state = world_state
+        self._clock = clock or RealClock()
         self._exchange: AbstractExchange | None = None
         self._task: asyncio.Task | None = None
+        self._watch_task: asyncio.Task | None = None
+        self._subscription: Subscription | None = None
+        self._robot_status: tuple[RobotState, str | None] | None = None  # cached from the change feed
         self._running = False
+        self._channel_name = HEARTBEAT_CHANNEL
 
     async def initialize(self) -> None:
-        """Declare the exchange (idempotent) and cache reference."""
-        channel = await self._connection.get_channel()
-        self._exchange = await channel.declare_exchange(
-            self._settings.mq_exchange,
-            type=aio_pika.ExchangeType.TOPIC,
-            durable=True,
-        )
+        """Declare the exchange (idempotent) on the pooled heartbeat channel and cache reference."""
+        self._channel_name = channel_name(HEARTBEAT_CHANNEL, self._settings.robot_id, self._settings.mq_channel_shards)
+        self._exchange = await self._connection.get_exchange(self._channel_name)
 
     async def start(self) -> None:
         """Start the heartbeat background task."""
         self._running = True
+        if self._world_state is not None:
+            self._subscription = self._world_state.changes.subscribe(maxsize=16, entity_types=("robot",))
+            self._robot_status = self._read_robot_status()
+            self._watch_task = asyncio.create_task(self._follow_robot(self._subscription, self._world_state.version))
         self._task = asyncio.create_task(self._heartbeat_loop())
         logger.info("Heartbeat started (interval={}s)", self._settings.heartbeat_interval)
 
@@ -54,6 +74,15 @@ class HeartbeatPublisher:
             with contextlib.suppress(asyncio.CancelledError):
                 await self._task
             self._task = None
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._watch_task
+            self._watch_task = None
+        self._robot_status = None
         logger.info("Heartbeat stopped")
 
     async def _heartbeat_loop(self) -> None:
@@ -63,7 +92,7 @@ class HeartbeatPublisher:
                 await self._publish_heartbeat()
             except Exception:
                 logger.exception("Failed to publish heartbeat")
-            await asyncio.sleep(self._settings.heartbeat_interval)
+            await self._clock.sleep(self._settings.heartbeat_interval, background=True)
 
     async def _publish_heartbeat(self) -> None:
         """Publish a single heartbeat message."""
@@ -72,35 +101,54 @@ class HeartbeatPublisher:
         if self._exchange is None:
             raise RuntimeError("HeartbeatPublisher not initialized. Call initialize() first.")
 
-        # Read current robot state from world state if available
-        current_state = RobotState.IDLE
-        work_station: str | None = None
-        if self._world_state is not None:
-            robot_state = self._world_state.get_robot_state(self._settings.robot_id)
-            if robot_state:
-                state_str = robot_state.get("state", "idle")
-                # Map to RobotState enum, default to IDLE for unknown values
-                try:
-                    current_state = RobotState(state_str)
-                except ValueError:
-                    current_state = RobotState.IDLE
-                work_station = robot_state.get("location")
+        # Cached from the change feed while running, read directly otherwise
+        current_state, work_station = self._robot_status or self._read_robot_status()
 
         msg = HeartbeatMessage(
             robot_id=self._settings.robot_id,
-            timestamp=generate_robot_timestamp(),
+            timestamp=generate_robot_timestamp(self._clock.now()),
             state=current_state,
             Work_station=work_station,
         )
-        routing_key = f"{self._settings.robot_id}.hb"
-        body = msg.model_dump_json().encode()
-
-        await self._exchange.publish(
-            aio_pika.Message(
-                body=body,
-                content_type="application/json",
-                delivery_mode=aio_pika.DeliveryMode.NOT_PERSISTENT,
-            ),
-            routing_key=routing_key,
-        )
-        logger.debug("Heartbeat published via {} (state={})", routing_key, current_state)
+        envelope = OutboundMessage.from_model(msg, f"{self._settings.robot_id}.hb", persistent=False)
+
+        exchange = await self._connection.get_exchange(self._channel_name)
+        await exchange.publish(envelope.to_amqp(), routing_key=envelope.routing_key)
+        logger.debug("Heartbeat published via {} (state={})", envelope.routing_key, current_state)
+
+    def _read_robot_status(self) -> tuple[RobotState, str | None]:
+        """Current robot state and work station, read from world state if available."""
+        if self._world_state is None:
+            return RobotState.IDLE, None
+        robot_state = self._world_state.get_robot_state(self._settings.robot_id)
+        if not robot_state:
+            return RobotState.IDLE, None
+        return _as_robot_state(robot_state.get("state", "idle")), robot_state.get("location")
+
+    async def _follow_robot(self, subscription: Subscription, read_version: int) -> None:
+        """Keep ``_robot_status`` in step with robot changes from the world state feed."""
+        seen_dropped = 0
+        async for batch in subscription:
+            if batch.version <= read_version:
+                continue  # already reflected in the status read at start()
+            if batch.reset or subscription.dropped != seen_dropped:
+                seen_dropped = subscription.dropped
+                self._robot_status = self._read_robot_status()
+                continue
+            for change in batch.changes:
+                if change.entity_id != self._settings.robot_id:
+                    continue
+                state, work_station = self._robot_status or (RobotState.IDLE, None)
+                if "state" in change.fields:
+                    state = _as_robot_state(change.fields["state"][1])
+                if "location" in change.fields:
+                    work_station = change.fields["location"][1]
+                self._robot_status = (state, work_station)
+
+
+def _as_robot_state(value: object) -> RobotState:
+    """Map a stored state to ``RobotState``, defaulting to IDLE for unknown values."""
+    try:
+        return RobotState(value)
+    except ValueError:
+        return RobotState.IDLE
@@ -5,66 +5,95 @@ from __future__ import annotations
 from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
-import aio_pika
 from loguru import logger
 
+from src.clock import Clock, RealClock
 from src.generators.entity_updates import generate_robot_timestamp
+from src.mq.connection import LOG_CHANNEL, channel_name
+from src.mq.envelope import OutboundMessage
+from src.mq.sequencing import TaskSequencer
 
 if TYPE_CHECKING:
     from aio_pika.abc import AbstractExchange
 
     from src.config import MockSettings
     from src.mq.connection import MQConnection
-    from src.schemas.results import EntityUpdate
+    from src.mq.publisher import ConfirmPipeline
+    from src.schemas.results import ChromatogramChunk, EntityUpdate
 
 
 class LogProducer:
     """Publishes real-time log messages to {robot_id}.log via the topic exchange."""
 
-    def __init__(self, connection: MQConnection, settings: MockSettings) -> None:
+    def __init__(
+        self,
+        connection: MQConnection,
+        settings: MockSettings,
+        sequencer: TaskSequencer | None = None,
+        *,
+        clock: Clock | None = None,
+    ) -> None:
         self._connection = connection
         self._settings = settings
+        self._clock = clock or RealClock()
+        self._sequencer = sequencer if sequencer is not None else TaskSequencer()
         self._exchange: AbstractExchange | None = None
+        self._pipeline: ConfirmPipeline | None = None
+        self._channel_name = LOG_CHANNEL
 
     async def initialize(self) -> None:
-        """Declare the topic exchange (idempotent) and cache a reference."""
-        channel = await self._connection.get_channel()
-        self._exchange = await channel.declare_exchange(
-            self._settings.mq_exchange,
-            type=aio_pika.ExchangeType.TOPIC,
-            durable=True,
-        )
+        """Declare the topic exchange (idempotent) on the pooled log channel."""
+        self._channel_name = channel_name(LOG_CHANNEL, self._settings.robot_id, self._settings.mq_channel_shards)
+        self._exchange = await self._connection.get_exchange(self._channel_name)
+        self._pipeline = self._connection.get_pipeline(self._channel_name)
         logger.info("LogProducer initialized, exchange: {}", self._settings.mq_exchange)
 
-    async def publish_log(self, task_id: str, updates: Sequence[EntityUpdate], msg: str = "state_update") -> None:
-        """Publish a log message with entity state updates to {robot_id}.log."""
+    async def publish_log(
+        self,
+        task_id: str,
+        updates: Sequence[EntityUpdate],
+        msg: str = "state_update",
+        *,
+        wait_for_confirm: bool = False,
+        chromatogram: ChromatogramChunk | None = None,
+    ) -> None:
+        """Publish a log message with entity state updates to {robot_id}.log.
+
+        By default this returns once the message is handed to the channel and the
+        broker confirm is awaited in the background by the ``ConfirmPipeline``. With
+        ``wait_for_confirm`` it returns only after the broker has accepted the message,
+        which is how the consumer guarantees the final log precedes the result.
+
+        ``chromatogram`` attaches the next piece of a running CC's UV trace.
+        """
         from src.schemas.results import LogMessage
 
-        if self._exchange is None:
+        if self._exchange is None or self._pipeline is None:
             raise RuntimeError("LogProducer not initialized. Call initialize() first.")
 
         log_msg = LogMessage(
             task_id=task_id,
-            updates=list(updates),
             msg=msg,
-            timestamp=generate_robot_timestamp(),
+            timestamp=generate_robot_timestamp(self._clock.now()),
+            chromatogram=chromatogram,
         )
 
-        routing_key = f"{self._settings.robot_id}.log"
-        body = log_msg.model_dump_json().encode()
-
-        await self._exchange.publish(
-            aio_pika.Message(
-                body=body,
-                content_type="application/json",
-                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
-            ),
-            routing_key=routing_key,
+        envelope = OutboundMessage.from_model_with_updates(
+            log_msg,
+            updates,
+            f"{self._settings.robot_id}.log",
+            headers=self._sequencer.headers(task_id),
         )
 
-        logger.debug(
+        with self._clock.busy():
+            exchange = await self._connection.get_exchange(self._channel_name)
+            confirm = await self._pipeline.publish(exchange, envelope.to_amqp(), envelope.routing_key)
+            if wait_for_confirm:
+                await confirm
+
+        logger.opt(lazy=True).debug(
             "Published log for task {} via {}: {}",
-            task_id,
-            routing_key,
-            log_msg.model_dump_json(indent=2),
+            lambda: task_id,
+            lambda: envelope.routing_key,
+            envelope.pretty,
         )
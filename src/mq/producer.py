@@ -4,56 +4,71 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-import aio_pika
 from loguru import logger
 
+from src.clock import Clock, RealClock
+from src.mq.connection import RESULT_CHANNEL, channel_name
+from src.mq.envelope import OutboundMessage
+from src.mq.sequencing import TaskSequencer
+
 if TYPE_CHECKING:
     from aio_pika.abc import AbstractExchange
 
     from src.config import MockSettings
     from src.mq.connection import MQConnection
+    from src.mq.publisher import ConfirmPipeline
     from src.schemas.results import RobotResult
 
 
 class ResultProducer:
     """Publishes simulation results via the topic exchange with per-robot routing keys."""
 
-    def __init__(self, connection: MQConnection, settings: MockSettings) -> None:
+    def __init__(
+        self,
+        connection: MQConnection,
+        settings: MockSettings,
+        sequencer: TaskSequencer | None = None,
+        *,
+        clock: Clock | None = None,
+    ) -> None:
         self._connection = connection
         self._settings = settings
+        self._clock = clock or RealClock()
+        self._sequencer = sequencer if sequencer is not None else TaskSequencer()
         self._exchange: AbstractExchange | None = None
+        self._pipeline: ConfirmPipeline | None = None
+        self._channel_name = RESULT_CHANNEL
 
     async def initialize(self) -> None:
-        """Declare the topic exchange (idempotent) and cache a reference."""
-        channel = await self._connection.get_channel()
-        self._exchange = await channel.declare_exchange(
-            self._settings.mq_exchange,
-            type=aio_pika.ExchangeType.TOPIC,
-            durable=True,
-        )
+        """Declare the topic exchange (idempotent) on the pooled result channel."""
+        self._channel_name = channel_name(RESULT_CHANNEL, self._settings.robot_id, self._settings.mq_channel_shards)
+        self._exchange = await self._connection.get_exchange(self._channel_name)
+        self._pipeline = self._connection.get_pipeline(self._channel_name)
         logger.info("Producer initialized, exchange: {}", self._settings.mq_exchange)
 
     async def publish_result(self, result: RobotResult) -> None:
-        """Serialize and publish a RobotResult to the exchange with routing key <robot_id>.result."""
-        if self._exchange is None:
+        """Serialize and publish a RobotResult to <robot_id>.result and wait for the broker confirm."""
+        if self._exchange is None or self._pipeline is None:
             raise RuntimeError("Producer not initialized. Call initialize() first.")
 
-        routing_key = f"{self._settings.robot_id}.result"
-        body = result.model_dump_json().encode()
-
-        await self._exchange.publish(
-            aio_pika.Message(
-                body=body,
-                content_type="application/json",
-                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
-            ),
-            routing_key=routing_key,
+        envelope = OutboundMessage.from_model_with_updates(
+            result.model_copy(update={"updates": []}),
+            result.updates,
+            f"{self._settings.robot_id}.result",
+            headers=self._sequencer.headers(result.task_id, final=True),
         )
 
-        logger.info(
+        with self._clock.busy():
+            # Re-resolved per publish so a reopened channel is picked up transparently
+            exchange = await self._connection.get_exchange(self._channel_name)
+            confirm = await self._pipeline.publish(exchange, envelope.to_amqp(), envelope.routing_key)
+            # Results are rare and must not be lost — wait for the broker confirm.
+            await confirm
+
+        logger.opt(lazy=True).info(
             "Published result for task {} (code={}) via {}: {}",
-            result.task_id,
-            result.code,
-            routing_key,
-            result.model_dump_json(indent=2),
+            lambda: result.task_id,
+            lambda: result.code,
+            lambda: envelope.routing_key,
+            envelope.pretty,
         )
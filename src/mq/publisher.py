@@ -0,0 +1,143 @@
+"""Publisher-confirm pipeline shared by the result and log producers.
+
+Channels are opened in publisher-confirm mode, so every ``exchange.publish`` resolves
+only once the broker has acknowledged the message. Awaiting each publish inline costs a
+full broker round trip per message; ``ConfirmPipeline`` instead hands messages to the
+channel immediately, keeps at most ``max_in_flight`` of them unconfirmed, and awaits
+the outstanding confirms in batches from a single background task.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from aio_pika.abc import AbstractExchange, AbstractMessage
+
+
+@dataclass
+class PublisherStats:
+    """Throughput and confirm-latency counters for a ``ConfirmPipeline``.
+
+    Confirm latency is measured from hand-off to the settlement of the batch the
+    message was awaited in, so it is an upper bound for individual messages.
+    """
+
+    published: int = 0
+    bytes_published: int = 0
+    confirmed: int = 0
+    failed: int = 0
+    confirm_batches: int = 0
+    confirm_latency_total: float = 0.0
+    confirm_latency_max: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def as_dict(self) -> dict[str, float]:
+        """Return a flat snapshot suitable for logging or a metrics endpoint."""
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        settled = self.confirmed + self.failed
+        return {
+            "published": self.published,
+            "bytes_published": self.bytes_published,
+            "confirmed": self.confirmed,
+            "failed": self.failed,
+            "in_flight": self.published - settled,
+            "confirm_batches": self.confirm_batches,
+            "confirm_latency_avg_ms": (self.confirm_latency_total / settled * 1000.0) if settled else 0.0,
+            "confirm_latency_max_ms": self.confirm_latency_max * 1000.0,
+            "throughput_per_sec": self.confirmed / elapsed,
+        }
+
+
+class ConfirmPipeline:
+    """Bounded, batched publisher-confirm pipeline.
+
+    ``publish()`` returns as soon as the message is handed to the channel; the returned
+    task resolves when the broker confirms it (or raises on nack / channel failure).
+    Callers that need the delivery guarantee await that task, fire-and-forget callers
+    simply drop it — failures are still counted and logged by the pipeline.
+
+    Messages published through one pipeline reach the channel in call order, which is
+    the order the broker routes them in.
+    """
+
+    def __init__(self, max_in_flight: int = 256, confirm_batch_size: int = 64) -> None:
+        if max_in_flight < 1 or confirm_batch_size < 1:
+            raise ValueError("max_in_flight and confirm_batch_size must be >= 1")
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._batch_size = confirm_batch_size
+        self._unconfirmed: dict[asyncio.Task, float] = {}
+        self._has_unconfirmed = asyncio.Event()
+        self._batch_settled = asyncio.Condition()
+        self._reaper: asyncio.Task | None = None
+        self.stats = PublisherStats()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of messages handed to the channel but not yet confirmed."""
+        return len(self._unconfirmed)
+
+    async def publish(self, exchange: AbstractExchange, message: AbstractMessage, routing_key: str) -> asyncio.Task:
+        """Hand a message to the channel, waiting only if ``max_in_flight`` is reached."""
+        await self._slots.acquire()
+        task = asyncio.create_task(exchange.publish(message, routing_key=routing_key))
+        self._unconfirmed[task] = time.monotonic()
+        self.stats.published += 1
+        self.stats.bytes_published += len(message.body)
+        self._has_unconfirmed.set()
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_confirms())
+        return task
+
+    async def flush(self) -> None:
+        """Wait until every message published so far is confirmed or failed."""
+        pending = list(self._unconfirmed)
+        if not pending:
+            return
+        async with self._batch_settled:
+            await self._batch_settled.wait_for(lambda: not any(task in self._unconfirmed for task in pending))
+
+    async def close(self) -> None:
+        """Flush outstanding confirms and stop the background reaper."""
+        await self.flush()
+        if self._reaper is not None:
+            self._reaper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reaper
+            self._reaper = None
+
+    async def _reap_confirms(self) -> None:
+        """Background loop: await outstanding confirms in batches and update counters."""
+        while True:
+            if not self._unconfirmed:
+                self._has_unconfirmed.clear()
+                await self._has_unconfirmed.wait()
+                continue
+
+            batch = list(islice(self._unconfirmed.items(), self._batch_size))
+            await asyncio.wait([task for task, _ in batch])
+            settled_at = time.monotonic()
+            self.stats.confirm_batches += 1
+
+            for task, sent_at in batch:
+                del self._unconfirmed[task]
+                self._slots.release()
+                latency = settled_at - sent_at
+                self.stats.confirm_latency_total += latency
+                self.stats.confirm_latency_max = max(self.stats.confirm_latency_max, latency)
+                exc = None if task.cancelled() else task.exception()
+                if task.cancelled() or exc is not None:
+                    self.stats.failed += 1
+                    logger.error("Publish not confirmed by broker: {!r}", exc or "cancelled")
+                else:
+                    self.stats.confirmed += 1
+
+            async with self._batch_settled:
+                self._batch_settled.notify_all()
@@ -0,0 +1,128 @@
+"""Registry of running commands, indexed for cancellation.
+
+The dispatcher runs every admitted command as its own task, but nothing links a
+``terminate_column_chromatography`` to the ``start_column_chromatography`` it is meant
+to stop. ``TaskRegistry`` records each command while its simulation runs, indexed by
+``task_id``, ``device_id`` and ``work_station``, so a terminating command can look up
+the task running on its device and cancel it.
+
+Cancellation is cooperative: a task is cancellable only while it simulates. Once the
+consumer calls ``finish()`` it is publishing its result and is left to complete, so a
+result is never cut in half and exactly one result is published per task. A cancelled
+task learns who terminated it from ``RunningTask.terminated_by`` and publishes its own
+"terminated" result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+    from src.schemas.commands import TaskType
+
+
+@dataclass(slots=True)
+class RunningTask:
+    """A command whose simulation is running."""
+
+    task_id: str
+    task_type: TaskType
+    device_id: str | None
+    work_station: str | None
+    task: asyncio.Task
+    terminated_by: str | None = None  # task id of the command that cancelled it
+    finishing: bool = False  # publishing its result, no longer cancellable
+
+
+@dataclass
+class RegistryStats:
+    """Counters for a ``TaskRegistry``."""
+
+    registered: int = 0
+    terminated: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {"registered": self.registered, "terminated": self.terminated}
+
+
+class TaskRegistry:
+    """Running commands by task id, device and work station."""
+
+    def __init__(self) -> None:
+        self._tasks: dict[str, RunningTask] = {}
+        self._by_device: dict[str, dict[str, RunningTask]] = {}
+        self._by_work_station: dict[str, dict[str, RunningTask]] = {}
+        self.stats = RegistryStats()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def register(self, task_id: str, task_type: TaskType, params: BaseModel) -> RunningTask:
+        """Record the current asyncio task as running ``task_id``, indexed by its params' device and station."""
+        task = asyncio.current_task()
+        if task is None:
+            raise RuntimeError("TaskRegistry.register() must be called from a running task")
+        running = RunningTask(
+            task_id=task_id,
+            task_type=task_type,
+            device_id=getattr(params, "device_id", None),
+            work_station=getattr(params, "work_station", None),
+            task=task,
+        )
+        self.unregister(task_id)
+        self._tasks[task_id] = running
+        if running.device_id:
+            self._by_device.setdefault(running.device_id, {})[task_id] = running
+        if running.work_station:
+            self._by_work_station.setdefault(running.work_station, {})[task_id] = running
+        self.stats.registered += 1
+        return running
+
+    def unregister(self, task_id: str) -> None:
+        """Forget ``task_id`` (no-op if it is not registered)."""
+        running = self._tasks.pop(task_id, None)
+        if running is None:
+            return
+        for index, key in ((self._by_device, running.device_id), (self._by_work_station, running.work_station)):
+            entries = index.get(key) if key else None
+            if entries is not None:
+                entries.pop(task_id, None)
+                if not entries:
+                    del index[key]
+
+    def get(self, task_id: str) -> RunningTask | None:
+        return self._tasks.get(task_id)
+
+    def find(
+        self, task_type: TaskType, *, device_id: str | None = None, work_station: str | None = None
+    ) -> RunningTask | None:
+        """The cancellable ``task_type`` task on ``device_id``, else the one at ``work_station``."""
+        for index, key in ((self._by_device, device_id), (self._by_work_station, work_station)):
+            for running in index.get(key, {}).values() if key else ():
+                if running.task_type == task_type and not running.finishing and running.terminated_by is None:
+                    return running
+        return None
+
+    def finish(self, task_id: str) -> None:
+        """Mark ``task_id`` as publishing its result; it can no longer be terminated."""
+        running = self._tasks.get(task_id)
+        if running is not None:
+            running.finishing = True
+
+    def terminate(self, task_id: str, *, by: str) -> RunningTask | None:
+        """Cancel ``task_id`` on behalf of the command ``by``.
+
+        Returns:
+            The cancelled task, or None if it is not running, already finishing or already terminated.
+        """
+        running = self._tasks.get(task_id)
+        if running is None or running.finishing or running.terminated_by is not None:
+            return None
+        running.terminated_by = by
+        running.task.cancel()
+        self.stats.terminated += 1
+        return running
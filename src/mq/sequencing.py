@@ -0,0 +1,50 @@
+"""Per-task message sequence numbers shared by the log and result producers.
+
+Logs and results travel on different channels, so the broker does not order them
+relative to each other. Every message published for a task therefore carries
+``x-task-seq`` (1, 2, 3, ... in publish order); the result additionally carries
+``x-task-final``. A consumer that sees result ``seq = N`` knows exactly ``N - 1`` log
+messages precede it and can hold the result back until they have arrived.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+TASK_ID_HEADER = "x-task-id"
+TASK_SEQ_HEADER = "x-task-seq"
+TASK_FINAL_HEADER = "x-task-final"
+
+
+class TaskSequencer:
+    """Hands out monotonically increasing sequence numbers per task id.
+
+    Counters are dropped when the final (result) number is taken. Tasks that never
+    publish a result (e.g. simulated timeouts) are evicted least-recently-used once
+    more than ``max_tasks`` are tracked.
+    """
+
+    def __init__(self, max_tasks: int = 10_000) -> None:
+        self._max_tasks = max_tasks
+        self._counters: OrderedDict[str, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def next(self, task_id: str) -> int:
+        """Return the next sequence number for an intermediate (log) message."""
+        seq = self._counters.pop(task_id, 0) + 1
+        self._counters[task_id] = seq
+        if len(self._counters) > self._max_tasks:
+            self._counters.popitem(last=False)
+        return seq
+
+    def final(self, task_id: str) -> int:
+        """Return the sequence number for the task's result and forget the task."""
+        return self._counters.pop(task_id, 0) + 1
+
+    def headers(self, task_id: str, *, final: bool = False) -> dict[str, str | int | bool]:
+        """Build the AMQP headers for the next message of ``task_id``."""
+        if final:
+            return {TASK_ID_HEADER: task_id, TASK_SEQ_HEADER: self.final(task_id), TASK_FINAL_HEADER: True}
+        return {TASK_ID_HEADER: task_id, TASK_SEQ_HEADER: self.next(task_id)}
@@ -6,7 +6,9 @@ Uses string-based enums for mock-friendly parsing (StrEnum values work as string
 
 from __future__ import annotations
 
-from pydantic import BaseModel
+from typing import Annotated, Any, Literal
+
+from pydantic import BaseModel, ConfigDict, Discriminator, Tag, TypeAdapter
 
 from src.schemas.protocol import (
     BinState,
@@ -35,7 +37,9 @@ from src.schemas.protocol import (
     TaskType,
     TerminateCCParams,
     ToolState,
+    TypedRobotCommand,
 )
+from src.schemas.results import EntityUpdate
 
 # Re-export for backwards compatibility
 __all__ = [
@@ -58,6 +62,13 @@ __all__ = [
     "CCGradientConfig",
     # Command wrapper
     "RobotCommand",
+    "ResetStateCommand",
+    "SeedStateParams",
+    "SeedStateCommand",
+    "ControlCommand",
+    "AnyRobotCommand",
+    "COMMAND_ADAPTER",
+    "decode_command",
     # Parameter schemas
     "SetupCartridgesParams",
     "SetupTubeRackParams",
@@ -82,3 +93,77 @@ class RobotCommand(BaseModel):
     task_id: str
     task_type: TaskType
     params: dict
+
+
+# --- Control Commands (mock-only, not part of the robot protocol) ---
+
+
+class ResetStateCommand(BaseModel):
+    """Clears the mock's world state. ``params`` is accepted and ignored."""
+
+    task_id: str = "unknown"
+    task_type: Literal["reset_state"]
+    params: dict = {}
+
+
+class SeedStateParams(BaseModel):
+    """A lab layout loaded into world state in one validated batch.
+
+    Also the format of the ``MOCK_STATE_SEED_FILE`` fixture. Unknown keys are rejected
+    and ``entities`` is required, so a misspelled document cannot wipe the world with
+    an empty ``replace``.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    replace: bool = True  # clear the world first; False merges into the current state
+    entities: list[EntityUpdate]
+
+
+class SeedStateCommand(BaseModel):
+    """Bulk-loads a lab layout into the mock's world state."""
+
+    task_id: str = "unknown"
+    task_type: Literal["seed_state"]
+    params: SeedStateParams
+
+
+ControlCommand = ResetStateCommand | SeedStateCommand
+
+CONTROL_TASK_TYPES: frozenset[str] = frozenset({"reset_state", "seed_state"})
+
+
+# --- Single-pass decoding ---
+
+
+def _command_tag(value: Any) -> str | None:
+    """Discriminator: route on the raw ``task_type`` string before any validation."""
+    task_type = value.get("task_type") if isinstance(value, dict) else getattr(value, "task_type", None)
+    return str(task_type) if task_type is not None else None
+
+
+AnyRobotCommand = Annotated[
+    Annotated[TypedRobotCommand[SetupCartridgesParams], Tag(TaskType.SETUP_CARTRIDGES)]
+    | Annotated[TypedRobotCommand[SetupTubeRackParams], Tag(TaskType.SETUP_TUBE_RACK)]
+    | Annotated[TypedRobotCommand[TakePhotoParams], Tag(TaskType.TAKE_PHOTO)]
+    | Annotated[TypedRobotCommand[StartCCParams], Tag(TaskType.START_CC)]
+    | Annotated[TypedRobotCommand[TerminateCCParams], Tag(TaskType.TERMINATE_CC)]
+    | Annotated[TypedRobotCommand[CollectCCFractionsParams], Tag(TaskType.COLLECT_CC_FRACTIONS)]
+    | Annotated[TypedRobotCommand[StartEvaporationParams], Tag(TaskType.START_EVAPORATION)]
+    | Annotated[ResetStateCommand, Tag("reset_state")]
+    | Annotated[SeedStateCommand, Tag("seed_state")],
+    Discriminator(_command_tag),
+]
+
+# Built once at import; validating straight from bytes skips json.loads and the dict round trip.
+COMMAND_ADAPTER: TypeAdapter[AnyRobotCommand] = TypeAdapter(AnyRobotCommand)
+
+
+def decode_command(body: bytes | str) -> TypedRobotCommand[Any] | ControlCommand:
+    """Decode an MQ message body into a typed command in a single validation pass.
+
+    Raises:
+        pydantic.ValidationError: If the body is not JSON, the ``task_type`` is unknown
+            or the envelope / params do not match the task's schema.
+    """
+    return COMMAND_ADAPTER.validate_json(body)
@@ -6,9 +6,9 @@ includes ``description`` field on all entity properties.
 
 from __future__ import annotations
 
-from typing import Annotated, Literal
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, SerializerFunctionWrapHandler, model_serializer
 
 from src.schemas.protocol import (
     CapturedImage as CapturedImage,  # noqa: PLC0414
@@ -22,7 +22,13 @@ from src.schemas.protocol import (
 # --- Entity Property Models ---
 
 
-class RobotProperties(BaseModel):
+class _FrozenModel(BaseModel):
+    """Entity models are immutable so one instance can be shared by many messages."""
+
+    model_config = ConfigDict(frozen=True)
+
+
+class RobotProperties(_FrozenModel):
     """Properties for robot entity updates."""
 
     location: str
@@ -30,7 +36,7 @@ class RobotProperties(BaseModel):
     description: str = ""
 
 
-class CartridgeProperties(BaseModel):
+class CartridgeProperties(_FrozenModel):
     """Properties for silica/sample cartridge entity updates."""
 
     location: str
@@ -38,7 +44,7 @@ class CartridgeProperties(BaseModel):
     description: str = ""
 
 
-class TubeRackProperties(BaseModel):
+class TubeRackProperties(_FrozenModel):
     """Properties for tube rack entity updates."""
 
     location: str
@@ -46,7 +52,7 @@ class TubeRackProperties(BaseModel):
     description: str = ""
 
 
-class RoundBottomFlaskProperties(BaseModel):
+class RoundBottomFlaskProperties(_FrozenModel):
     """Properties for round bottom flask entity updates."""
 
     location: str
@@ -54,14 +60,14 @@ class RoundBottomFlaskProperties(BaseModel):
     description: str = ""
 
 
-class CCSExtModuleProperties(BaseModel):
+class CCSExtModuleProperties(_FrozenModel):
     """Properties for CC external module entity updates."""
 
     state: str  # DeviceState or plain string
     description: str = ""
 
 
-class CCMachineProperties(BaseModel):
+class CCMachineProperties(_FrozenModel):
     """Properties for CC machine entity updates (v0.3 ground truth)."""
 
     state: str  # DeviceState or plain string
@@ -70,7 +76,7 @@ class CCMachineProperties(BaseModel):
     description: str = ""
 
 
-class EvaporatorProperties(BaseModel):
+class EvaporatorProperties(_FrozenModel):
     """Properties for evaporator entity updates with sensor readings."""
 
     state: str = "idle"  # DeviceState or plain string
@@ -83,7 +89,7 @@ class EvaporatorProperties(BaseModel):
     description: str = ""
 
 
-class PCCChuteProperties(BaseModel):
+class PCCChuteProperties(_FrozenModel):
     """Properties for post-column-chromatography chute entity updates."""
 
     state: str = "idle"  # DeviceState or plain string
@@ -98,7 +104,7 @@ class PCCChuteProperties(BaseModel):
 # --- Entity Update Models (Discriminated Union) ---
 
 
-class RobotUpdate(BaseModel):
+class RobotUpdate(_FrozenModel):
     """Robot state/location update."""
 
     type: Literal["robot"] = "robot"
@@ -106,7 +112,7 @@ class RobotUpdate(BaseModel):
     properties: RobotProperties
 
 
-class SilicaCartridgeUpdate(BaseModel):
+class SilicaCartridgeUpdate(_FrozenModel):
     """Silica cartridge state update."""
 
     type: Literal["silica_cartridge"] = "silica_cartridge"
@@ -114,7 +120,7 @@ class SilicaCartridgeUpdate(BaseModel):
     properties: CartridgeProperties
 
 
-class SampleCartridgeUpdate(BaseModel):
+class SampleCartridgeUpdate(_FrozenModel):
     """Sample cartridge state update."""
 
     type: Literal["sample_cartridge"] = "sample_cartridge"
@@ -122,7 +128,7 @@ class SampleCartridgeUpdate(BaseModel):
     properties: CartridgeProperties
 
 
-class TubeRackUpdate(BaseModel):
+class TubeRackUpdate(_FrozenModel):
     """Tube rack state update."""
 
     type: Literal["tube_rack"] = "tube_rack"
@@ -130,7 +136,7 @@ class TubeRackUpdate(BaseModel):
     properties: TubeRackProperties
 
 
-class RoundBottomFlaskUpdate(BaseModel):
+class RoundBottomFlaskUpdate(_FrozenModel):
     """Round bottom flask state update."""
 
     type: Literal["round_bottom_flask"] = "round_bottom_flask"
@@ -138,7 +144,7 @@ class RoundBottomFlaskUpdate(BaseModel):
     properties: RoundBottomFlaskProperties
 
 
-class CCSExtModuleUpdate(BaseModel):
+class CCSExtModuleUpdate(_FrozenModel):
     """CC external module state update."""
 
     type: Literal["ccs_ext_module"] = "ccs_ext_module"
@@ -146,7 +152,7 @@ class CCSExtModuleUpdate(BaseModel):
     properties: CCSExtModuleProperties
 
 
-class CCSystemUpdate(BaseModel):
+class CCSystemUpdate(_FrozenModel):
     """Column chromatography machine state update (v0.3: column_chromatography_machine)."""
 
     type: Literal["column_chromatography_machine", "isco_combiflash_nextgen_300"]
@@ -154,7 +160,7 @@ class CCSystemUpdate(BaseModel):
     properties: CCMachineProperties
 
 
-class EvaporatorUpdate(BaseModel):
+class EvaporatorUpdate(_FrozenModel):
     """Evaporator state update with sensor readings."""
 
     type: Literal["evaporator"] = "evaporator"
@@ -162,7 +168,7 @@ class EvaporatorUpdate(BaseModel):
     properties: EvaporatorProperties
 
 
-class PCCLeftChuteUpdate(BaseModel):
+class PCCLeftChuteUpdate(_FrozenModel):
     """Post-CC left chute state update."""
 
     type: Literal["pcc_left_chute"] = "pcc_left_chute"
@@ -170,7 +176,7 @@ class PCCLeftChuteUpdate(BaseModel):
     properties: PCCChuteProperties
 
 
-class PCCRightChuteUpdate(BaseModel):
+class PCCRightChuteUpdate(_FrozenModel):
     """Post-CC right chute state update."""
 
     type: Literal["pcc_right_chute"] = "pcc_right_chute"
@@ -211,6 +217,23 @@ class RobotResult(BaseModel):
         return self.code == 200
 
 
+class ChromatogramChunk(BaseModel):
+    """Consecutive samples of a CC run's UV trace, streamed with the run's log messages.
+
+    Mock-server internal type — not part of v0.3 protocol. Sample ``i`` was taken at
+    ``start_time + i * sample_interval`` seconds of (unscaled) run time.
+    """
+
+    sequence: int  # chunk index within the run, from 0
+    start_time: float
+    sample_interval: float
+    wavelength_nm: int = 254
+    absorbance: list[float] = Field(default_factory=list)  # AU
+    solvent_b_ratio: list[float] = Field(default_factory=list)  # % solvent B reaching the detector
+    collecting: list[bool] = Field(default_factory=list)  # fraction collector diverting to tubes
+    final: bool = False
+
+
 class LogMessage(BaseModel):
     """Log message published to {robot_id}.log during skill execution.
 
@@ -222,6 +245,15 @@ class LogMessage(BaseModel):
     task_id: str
     updates: list[EntityUpdate] = Field(default_factory=list)
     timestamp: str  # ISO format
+    chromatogram: ChromatogramChunk | None = None
+
+    @model_serializer(mode="wrap")
+    def _omit_missing_chromatogram(self, handler: SerializerFunctionWrapHandler) -> dict[str, Any]:
+        """Leave ``chromatogram`` out of logs that carry no UV trace, as before the field existed."""
+        data = handler(self)
+        if self.chromatogram is None:
+            data.pop("chromatogram", None)
+        return data
 
 
 class HeartbeatMessage(BaseModel):
@@ -260,6 +292,7 @@ __all__ = [
     "EntityUpdate",
     "CapturedImage",
     "RobotResult",
+    "ChromatogramChunk",
     "LogMessage",
     "HeartbeatMessage",
 ]
@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-import asyncio
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
 from loguru import logger
 
+from src.clock import Clock, RealClock
 from src.generators.timing import calculate_delay
 
 if TYPE_CHECKING:
@@ -18,7 +18,7 @@ if TYPE_CHECKING:
     from src.mq.log_producer import LogProducer
     from src.mq.producer import ResultProducer
     from src.schemas.commands import TaskType
-    from src.schemas.results import EntityUpdate, RobotResult
+    from src.schemas.results import ChromatogramChunk, EntityUpdate, RobotResult
     from src.state.world_state import WorldState
 
 
@@ -32,11 +32,13 @@ class BaseSimulator(ABC):
         *,
         log_producer: LogProducer | None = None,
         world_state: WorldState | None = None,
+        clock: Clock | None = None,
     ) -> None:
         self._producer = producer
         self._settings = settings
         self._log_producer = log_producer
         self._world_state = world_state
+        self._clock = clock or RealClock()
 
     @property
     def robot_id(self) -> str:
@@ -53,6 +55,11 @@ class BaseSimulator(ABC):
         """The minimum delay from settings."""
         return self._settings.min_delay_seconds
 
+    @property
+    def clock(self) -> Clock:
+        """The clock pacing this simulator and stamping its timestamps."""
+        return self._clock
+
     @property
     def image_base_url(self) -> str:
         """The image base URL from settings."""
@@ -63,16 +70,32 @@ class BaseSimulator(ABC):
         """Simulate a robot task and return the result."""
         ...
 
-    async def _publish_log(self, task_id: str, updates: Sequence[EntityUpdate], msg: str = "state_update") -> None:
-        """Publish a real-time log entry via the log channel if a LogProducer is available."""
-        if self._log_producer is not None:
+    async def _publish_log(
+        self,
+        task_id: str,
+        updates: Sequence[EntityUpdate],
+        msg: str = "state_update",
+        *,
+        chromatogram: ChromatogramChunk | None = None,
+    ) -> None:
+        """Publish a real-time log entry via the log channel if a LogProducer is available.
+
+        The updates are also recorded as telemetry in the WorldState entity history.
+        """
+        if self._world_state is not None:
+            self._world_state.observe(updates, task_id=task_id)
+        if self._log_producer is None:
+            return
+        if chromatogram is None:
             await self._log_producer.publish_log(task_id, updates, msg)
+        else:
+            await self._log_producer.publish_log(task_id, updates, msg, chromatogram=chromatogram)
 
     async def _apply_delay(self, base_min: float, base_max: float) -> None:
         """Apply a randomized delay scaled by the multiplier."""
         delay = calculate_delay(base_min, base_max, self.multiplier, self.min_delay)
         logger.debug("Applying delay: {:.2f}s (base {}-{}, multiplier {})", delay, base_min, base_max, self.multiplier)
-        await asyncio.sleep(delay)
+        await self._clock.sleep(delay)
 
     def _find_entity_at_location(self, entity_type: str, location: str) -> str | None:
         """Look up an entity ID by type and location from WorldState.
@@ -83,11 +106,8 @@ class BaseSimulator(ABC):
         """
         if self._world_state is None:
             return None
-        entities = self._world_state.get_entities_by_type(entity_type)
-        for entity_id, props in entities.items():
-            if props.get("location") == location:
-                return entity_id
-        return None
+        found = self._world_state.find_at_location(entity_type, location)
+        return found[0] if found is not None else None
 
     def _resolve_entity_id(self, entity_type: str, location: str) -> str:
         """Resolve an entity ID from WorldState, falling back to the location string.
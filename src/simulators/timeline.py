@@ -0,0 +1,813 @@
+"""Data-driven task timelines and the generic simulator that runs them.
+
+A ``Timeline`` describes how one task type plays out: optional ``start`` updates applied
+to the world state as the run begins (so a running task's device is visibly in use), a
+list of steps (log emissions, randomized delays, named values, loops over items, periodic
+progress over a duration) and the final ``RobotResult``. The built-in simulators are the
+timelines in ``default_timelines.json``; ``MOCK_SIMULATOR_TIMELINES_FILE`` (JSON, or YAML
+with PyYAML installed) may replace any of them per task type without code changes.
+
+A value in a timeline is one of three things, and nothing else is evaluated:
+
+- a JSON literal (lists and objects may contain the other two);
+- a reference, written ``"=name"`` or ``"=name.attr.attr"``, to a run name (``params``,
+  ``task_id``, ``robot_id``, ``multiplier``), a ``let`` / ``each`` / ``progress`` name,
+  or a field of one (attributes of models, keys of entity mappings);
+- a call, ``{"fn": "<name>", "args": [value, ...]}``, of one of the functions registered
+  in ``TIMELINE_FUNCTIONS`` (``add``, ``mul``, ``concat``, ``choose``, ``resolve``, …).
+
+Every reference and call is checked against the names in scope when the timeline is
+compiled (``compile_timelines``), so an unknown name fails at startup, not mid-task.
+
+Entity updates are written as ``{"entity": <kind>, "args": {...}}`` and built with the
+matching ``create_*_update`` generator, so timeline output is identical to the models
+the hand-written simulators produced. They go through ``UPDATE_TEMPLATES``: an update
+whose arguments repeat (the robot moving to a station, a device in use) is built and
+serialized once per process.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import zlib
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any, Literal
+
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
+
+from src.generators.chromatogram import ChromatogramPeak, generate_chromatogram
+from src.generators.entity_updates import (
+    UPDATE_TEMPLATES,
+    create_cc_system_update,
+    create_ccs_ext_module_update,
+    create_evaporator_update,
+    create_pcc_left_chute_update,
+    create_pcc_right_chute_update,
+    create_robot_update,
+    create_round_bottom_flask_update,
+    create_sample_cartridge_update,
+    create_silica_cartridge_update,
+    create_tube_rack_update,
+    generate_robot_timestamp,
+)
+from src.generators.evaporation import schedule_evaporation
+from src.generators.images import generate_captured_images
+from src.generators.timing import calculate_cc_duration, calculate_intermediate_interval
+from src.schemas.commands import RobotState, TaskType
+from src.schemas.results import EntityUpdate, RobotResult
+from src.simulators.base import BaseSimulator
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from src.clock import Clock
+    from src.config import MockSettings
+    from src.generators.chromatogram import Chromatogram
+    from src.generators.evaporation import EvaporationRun, EvaporationSchedule, EvaporatorReading
+    from src.mq.log_producer import LogProducer
+    from src.mq.producer import ResultProducer
+    from src.schemas.protocol import CCExperimentParams, EvaporationProfiles
+    from src.schemas.results import CapturedImage, ChromatogramChunk
+    from src.state.world_state import WorldState
+
+DEFAULT_TIMELINES_PATH = Path(__file__).with_name("default_timelines.json")
+
+UPDATE_FACTORIES: dict[str, Callable[..., EntityUpdate]] = {
+    "robot": create_robot_update,
+    "silica_cartridge": create_silica_cartridge_update,
+    "sample_cartridge": create_sample_cartridge_update,
+    "tube_rack": create_tube_rack_update,
+    "round_bottom_flask": create_round_bottom_flask_update,
+    "ccs_ext_module": create_ccs_ext_module_update,
+    "cc_system": create_cc_system_update,
+    "evaporator": create_evaporator_update,
+    "pcc_left_chute": create_pcc_left_chute_update,
+    "pcc_right_chute": create_pcc_right_chute_update,
+}
+
+# device_type -> world-state entity type, for take_photo device snapshots
+DEVICE_ENTITY_TYPES: dict[str, str] = {
+    "combiflash": "column_chromatography_machine",
+    "column_chromatography": "column_chromatography_machine",
+    "column_chromatography_machine": "column_chromatography_machine",
+    "column_chromatography_system": "column_chromatography_machine",
+    "isco_combiflash_nextgen_300": "column_chromatography_machine",
+    "cc-isco-300p": "column_chromatography_machine",
+    "evaporator": "evaporator",
+    "rotary_evaporator": "evaporator",
+    "re-buchi-r180": "evaporator",
+}
+
+
+# ---------------------------------------------------------------------------
+# Timeline format
+# ---------------------------------------------------------------------------
+
+
+class UpdateTemplate(BaseModel):
+    """An entity update built by the ``create_*_update`` generator for ``entity``."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    entity: Literal[
+        "robot",
+        "silica_cartridge",
+        "sample_cartridge",
+        "tube_rack",
+        "round_bottom_flask",
+        "ccs_ext_module",
+        "cc_system",
+        "evaporator",
+        "pcc_left_chute",
+        "pcc_right_chute",
+    ]
+    args: dict[str, Any] = Field(default_factory=dict)  # generator keyword arguments
+
+
+class Call(BaseModel):
+    """A call to the timeline function ``fn`` (see ``TIMELINE_FUNCTIONS``) with ``args`` values."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    fn: str
+    args: list[Any] = Field(default_factory=list)
+
+
+# A value: a JSON literal, an "=name.attr" reference or a {"fn": ..., "args": [...]} call
+Value = float | str | Call
+
+# A list of templates, references and calls (each yielding an update, a list of updates
+# or None to skip), or one reference or call yielding a list of updates.
+Updates = list[UpdateTemplate | Call | str] | Call | str
+
+
+class LetStep(BaseModel):
+    """Bind ``name`` to a value or to a list of built updates for later steps."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    op: Literal["let"]
+    name: str
+    value: Any = None
+    updates: Updates | None = None
+
+    @model_validator(mode="after")
+    def _one_source(self) -> LetStep:
+        if self.updates is not None and self.value is not None:
+            raise ValueError(f"let {self.name!r}: set either value or updates, not both")
+        return self
+
+
+class LogStep(BaseModel):
+    """Publish a log entry with entity updates."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    op: Literal["log"]
+    msg: Call | str = "state_update"
+    updates: Updates = Field(default_factory=list)
+    chromatogram: Call | str | None = None  # value yielding a ChromatogramChunk (or None) to attach
+
+
+class DelayStep(BaseModel):
+    """Sleep a uniform random delay in [min, max] scaled by the delay multiplier."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    op: Literal["delay"]
+    min: Value
+    max: Value
+
+
+class EachStep(BaseModel):
+    """Run ``steps`` once per item, with the item bound to ``as``."""
+
+    model_config = ConfigDict(extra="forbid", populate_by_name=True)
+
+    op: Literal["each"]
+    items: Any
+    as_: str = Field(alias="as")
+    steps: list[Step]
+
+
+class ProgressStep(BaseModel):
+    """Spread ``steps`` over ``duration`` seconds (already scaled) at ``min_updates`` or more ticks.
+
+    ``interval`` (seconds, or None) ticks more often, e.g. at a telemetry rate. Inside,
+    ``elapsed``, ``total`` and ``progress`` (0..1) describe the current tick.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    op: Literal["progress"]
+    duration: Value
+    min_updates: int = Field(default=3, ge=1)
+    interval: Value | None = None
+    steps: list[Step]
+
+
+Step = Annotated[LetStep | LogStep | DelayStep | EachStep | ProgressStep, Field(discriminator="op")]
+
+EachStep.model_rebuild()
+ProgressStep.model_rebuild()
+
+
+class ResultSpec(BaseModel):
+    """The final ``RobotResult``."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    code: int = 200
+    msg: str = "success"
+    updates: Updates = Field(default_factory=list)
+    images: Call | str | None = None
+
+
+class Timeline(BaseModel):
+    """How one task type is simulated."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    task_type: TaskType
+    description: str = ""
+    start: Updates = Field(default_factory=list)  # applied to the world state when the run begins
+    steps: list[Step] = Field(default_factory=list)
+    result: ResultSpec = Field(default_factory=ResultSpec)
+
+
+TIMELINES_ADAPTER: TypeAdapter[list[Timeline]] = TypeAdapter(list[Timeline])
+
+
+# ---------------------------------------------------------------------------
+# Values
+# ---------------------------------------------------------------------------
+
+
+def _add(*values: float) -> float:
+    return sum(values)
+
+
+def _mul(*values: float) -> float:
+    return math.prod(values)
+
+
+def _concat(*parts: Any) -> str:
+    return "".join(str(part) for part in parts)
+
+
+def _equals(left: Any, right: Any) -> bool:
+    return left == right
+
+
+def _choose(condition: Any, if_true: Any, if_false: Any) -> Any:
+    return if_true if condition else if_false
+
+
+def _as_list(value: Any) -> list[Any]:
+    return value if isinstance(value, list) else [value]
+
+
+def _prop(entity: Mapping[str, Any] | None, key: str, default: Any = None) -> Any:
+    return entity.get(key, default) if entity else default
+
+
+def _coalesce(*values: Any) -> Any:
+    return next((value for value in values if value is not None), None)
+
+
+def _dump(model: BaseModel | None) -> dict[str, Any] | None:
+    return model.model_dump() if model is not None else None
+
+
+def _count(items: Iterable[Any], value: Any) -> int:
+    return sum(1 for item in items if item == value)
+
+
+def _robot_state(value: Any) -> RobotState:
+    try:
+        return RobotState(value)
+    except ValueError:
+        return RobotState.IDLE
+
+
+def _chromatogram_chunk(trace: Chromatogram | None, progress: float) -> ChromatogramChunk | None:
+    return trace.chunk(progress) if trace is not None else None
+
+
+_PURE_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "add": _add,
+    "as_list": _as_list,
+    "choose": _choose,
+    "chromatogram_chunk": _chromatogram_chunk,
+    "coalesce": _coalesce,
+    "concat": _concat,
+    "count": _count,
+    "dump": _dump,
+    "equals": _equals,
+    "len": len,
+    "max": max,
+    "min": min,
+    "mul": _mul,
+    "prop": _prop,
+    "robot_state": _robot_state,
+}
+
+# Functions that need the running simulator, bound per run by ``TimelineSimulator``
+_SIMULATOR_FUNCTIONS = (
+    "capture_images",
+    "cc_duration",
+    "chromatogram",
+    "device_update",
+    "entity",
+    "evaporation_schedule",
+    "evaporation_state",
+    "resolve",
+    "telemetry_interval",
+    "timestamp",
+)
+
+TIMELINE_FUNCTIONS = frozenset(_PURE_FUNCTIONS) | frozenset(_SIMULATOR_FUNCTIONS)
+
+# Names every timeline starts with
+_RUN_NAMES = frozenset({"task_id", "robot_id", "params", "multiplier"})
+
+Evaluator = Callable[[dict[str, Any]], Any]
+
+
+class TimelineError(ValueError):
+    """A timeline that cannot be compiled."""
+
+
+def _compile_reference(path: str, names: frozenset[str], where: str) -> Evaluator:
+    """Compile ``name.attr.attr`` into a lookup in the run scope."""
+    head, *attrs = path.split(".")
+    if not all(part.isidentifier() for part in (head, *attrs)):
+        raise TimelineError(f"{where}: invalid reference '={path}', expected '=name' or '=name.attr'")
+    if head not in names:
+        raise TimelineError(f"{where}: unknown name {head!r} in '={path}'")
+    if any(attr.startswith("_") for attr in attrs):
+        raise TimelineError(f"{where}: private attribute in '={path}'")
+    if not attrs:
+        return lambda scope: scope[head]
+
+    def resolve(scope: dict[str, Any]) -> Any:
+        value = scope[head]
+        for attr in attrs:
+            value = value.get(attr) if isinstance(value, Mapping) else getattr(value, attr)
+        return value
+
+    return resolve
+
+
+def _compile_call(name: str, args: list[Any], names: frozenset[str], where: str) -> Evaluator:
+    """Compile a call to the timeline function ``name`` with compiled ``args``."""
+    if name not in TIMELINE_FUNCTIONS:
+        raise TimelineError(f"{where}: unknown function {name!r}")
+    compiled = [_compile_value(arg, names, where) for arg in args]
+    return lambda scope: scope[name](*(arg(scope) for arg in compiled))
+
+
+def _compile_value(raw: Any, names: frozenset[str], where: str) -> Evaluator:
+    """Compile a literal, ``=reference`` or ``{"fn": ...}`` call; containers are compiled element-wise."""
+    if isinstance(raw, str) and raw.startswith("="):
+        return _compile_reference(raw[1:].strip(), names, where)
+    if isinstance(raw, Call):
+        return _compile_call(raw.fn, raw.args, names, where)
+    if isinstance(raw, dict):
+        if "fn" in raw:
+            if not isinstance(raw["fn"], str) or not isinstance(raw.get("args", []), list) or set(raw) - {"fn", "args"}:
+                raise TimelineError(f"{where}: a call is {{'fn': <name>, 'args': [...]}}, got {raw!r}")
+            return _compile_call(raw["fn"], raw.get("args", []), names, where)
+        items = [(key, _compile_value(value, names, where)) for key, value in raw.items()]
+        return lambda scope: {key: value(scope) for key, value in items}
+    if isinstance(raw, list):
+        elements = [_compile_value(value, names, where) for value in raw]
+        return lambda scope: [value(scope) for value in elements]
+    return lambda scope: raw
+
+
+def _compile_updates(raw: Updates, names: frozenset[str], where: str) -> Callable[[dict[str, Any]], list[EntityUpdate]]:
+    if not isinstance(raw, list):
+        if isinstance(raw, str) and not raw.startswith("="):
+            raise TimelineError(f"{where}: updates must be a list, a reference or a call")
+        value = _compile_value(raw, names, where)
+        return lambda scope: list(value(scope))
+
+    parts: list[tuple[bool, Evaluator]] = []  # (is_template, build)
+    for item in raw:
+        if isinstance(item, UpdateTemplate):
+            factory = UPDATE_FACTORIES[item.entity]
+            args = _compile_value(item.args, names, f"{where} ({item.entity})")
+            parts.append(
+                (True, lambda scope, factory=factory, args=args: UPDATE_TEMPLATES.build(factory, **args(scope)))
+            )
+        elif isinstance(item, Call) or item.startswith("="):
+            parts.append((False, _compile_value(item, names, where)))
+        else:
+            raise TimelineError(f"{where}: update entries must be templates, references or calls, got {item!r}")
+
+    def build(scope: dict[str, Any]) -> list[EntityUpdate]:
+        updates: list[EntityUpdate] = []
+        for is_template, make in parts:
+            value = make(scope)
+            if is_template:
+                updates.append(value)
+            elif isinstance(value, list | tuple):
+                updates.extend(value)
+            elif value is not None:
+                updates.append(value)
+        return updates
+
+    return build
+
+
+# ---------------------------------------------------------------------------
+# Compiled steps
+# ---------------------------------------------------------------------------
+
+
+class _Let:
+    __slots__ = ("name", "value")
+
+    def __init__(self, name: str, value: Callable[[dict[str, Any]], Any]) -> None:
+        self.name = name
+        self.value = value
+
+    async def run(self, sim: TimelineSimulator, scope: dict[str, Any]) -> None:
+        scope[self.name] = self.value(scope)
+
+
+class _Log:
+    __slots__ = ("chromatogram", "msg", "updates")
+
+    def __init__(
+        self,
+        msg: Callable[[dict[str, Any]], Any],
+        updates: Callable[[dict[str, Any]], list],
+        chromatogram: Callable[[dict[str, Any]], Any] | None = None,
+    ) -> None:
+        self.msg = msg
+        self.updates = updates
+        self.chromatogram = chromatogram
+
+    async def run(self, sim: TimelineSimulator, scope: dict[str, Any]) -> None:
+        chunk = self.chromatogram(scope) if self.chromatogram is not None else None
+        await sim._publish_log(scope["task_id"], self.updates(scope), self.msg(scope), chromatogram=chunk)
+
+
+class _Delay:
+    __slots__ = ("high", "low")
+
+    def __init__(self, low: Callable[[dict[str, Any]], Any], high: Callable[[dict[str, Any]], Any]) -> None:
+        self.low = low
+        self.high = high
+
+    async def run(self, sim: TimelineSimulator, scope: dict[str, Any]) -> None:
+        await sim._apply_delay(self.low(scope), self.high(scope))
+
+
+class _Each:
+    __slots__ = ("items", "name", "steps")
+
+    def __init__(self, items: Callable[[dict[str, Any]], Any], name: str, steps: tuple[_Step, ...]) -> None:
+        self.items = items
+        self.name = name
+        self.steps = steps
+
+    async def run(self, sim: TimelineSimulator, scope: dict[str, Any]) -> None:
+        for item in self.items(scope):
+            scope[self.name] = item
+            for step in self.steps:
+                await step.run(sim, scope)
+
+
+class _Progress:
+    __slots__ = ("duration", "interval", "min_updates", "steps")
+
+    def __init__(
+        self,
+        duration: Callable[[dict[str, Any]], Any],
+        min_updates: int,
+        steps: tuple[_Step, ...],
+        interval: Callable[[dict[str, Any]], Any] | None = None,
+    ) -> None:
+        self.duration = duration
+        self.min_updates = min_updates
+        self.steps = steps
+        self.interval = interval
+
+    async def run(self, sim: TimelineSimulator, scope: dict[str, Any]) -> None:
+        total = self.duration(scope)
+        interval = calculate_intermediate_interval(total, self.min_updates)
+        requested = self.interval(scope) if self.interval is not None else None
+        if requested is not None and 0 < requested < interval:
+            interval = requested
+        elapsed = 0.0
+        while elapsed < total:
+            sleep_time = min(interval, total - elapsed)
+            await sim.clock.sleep(sleep_time)
+            elapsed += sleep_time
+            if elapsed < total:
+                scope["elapsed"] = elapsed
+                scope["total"] = total
+                scope["progress"] = min(elapsed / total, 1.0)
+                for step in self.steps:
+                    await step.run(sim, scope)
+                logger.debug("Progress for task {}: {:.0f}/{:.0f}s", scope["task_id"], elapsed, total)
+
+
+_Step = _Let | _Log | _Delay | _Each | _Progress
+
+
+class CompiledTimeline:
+    """A ``Timeline`` with every value compiled; shared by all simulators and runs."""
+
+    __slots__ = (
+        "description",
+        "images",
+        "result_code",
+        "result_msg",
+        "result_updates",
+        "start_updates",
+        "steps",
+        "task_type",
+    )
+
+    def __init__(self, timeline: Timeline) -> None:
+        self.task_type = timeline.task_type
+        self.description = timeline.description
+        self.start_updates = (
+            _compile_updates(timeline.start, frozenset(_RUN_NAMES), f"{timeline.task_type.value} start")
+            if timeline.start
+            else None
+        )
+        names = set(_RUN_NAMES)
+        self.steps = _compile_steps(timeline.steps, names, timeline.task_type.value)
+        frozen = frozenset(names)
+        where = f"{timeline.task_type.value} result"
+        self.result_code = timeline.result.code
+        self.result_msg = timeline.result.msg
+        self.result_updates = _compile_updates(timeline.result.updates, frozen, where)
+        self.images = _compile_value(timeline.result.images, frozen, where) if timeline.result.images else None
+
+    async def run(self, sim: TimelineSimulator, scope: dict[str, Any]) -> RobotResult:
+        if self.start_updates is not None:
+            sim._apply_started(scope["task_id"], self.start_updates(scope))
+        for step in self.steps:
+            await step.run(sim, scope)
+        images: list[CapturedImage] | None = self.images(scope) if self.images is not None else None
+        return RobotResult(
+            code=self.result_code,
+            msg=self.result_msg,
+            task_id=scope["task_id"],
+            updates=self.result_updates(scope),
+            images=images,
+        )
+
+
+def _check_bindable(name: str, where: str) -> None:
+    if name in TIMELINE_FUNCTIONS or name in _RUN_NAMES:
+        raise TimelineError(f"{where}: {name!r} is reserved and cannot be bound")
+
+
+def _compile_steps(steps: list[Any], names: set[str], where: str) -> tuple[_Step, ...]:
+    """Compile ``steps`` in order; ``names`` grows with every ``let`` (visible to later steps)."""
+    compiled: list[_Step] = []
+    for index, step in enumerate(steps):
+        here = f"{where} step {index} ({step.op})"
+        frozen = frozenset(names)
+        match step:
+            case LetStep():
+                _check_bindable(step.name, here)
+                value = (
+                    _compile_updates(step.updates, frozen, here)
+                    if step.updates is not None
+                    else _compile_value(step.value, frozen, here)
+                )
+                compiled.append(_Let(step.name, value))
+                names.add(step.name)
+            case LogStep():
+                chromatogram = _compile_value(step.chromatogram, frozen, here) if step.chromatogram else None
+                compiled.append(
+                    _Log(
+                        _compile_value(step.msg, frozen, here),
+                        _compile_updates(step.updates, frozen, here),
+                        chromatogram,
+                    )
+                )
+            case DelayStep():
+                compiled.append(_Delay(_compile_value(step.min, frozen, here), _compile_value(step.max, frozen, here)))
+            case EachStep():
+                items = _compile_value(step.items, frozen, here)
+                _check_bindable(step.as_, here)
+                names.add(step.as_)
+                compiled.append(_Each(items, step.as_, _compile_steps(step.steps, names, here)))
+            case ProgressStep():
+                duration = _compile_value(step.duration, frozen, here)
+                interval = _compile_value(step.interval, frozen, here) if step.interval is not None else None
+                names.update(("elapsed", "total", "progress"))
+                compiled.append(
+                    _Progress(duration, step.min_updates, _compile_steps(step.steps, names, here), interval)
+                )
+    return tuple(compiled)
+
+
+def merge_timelines(base: Iterable[Timeline], overrides: Iterable[Timeline]) -> list[Timeline]:
+    """Timelines from ``overrides`` replace ``base`` timelines of the same task type."""
+    merged = {timeline.task_type: timeline for timeline in base}
+    for timeline in overrides:
+        merged[timeline.task_type] = timeline
+    return list(merged.values())
+
+
+def compile_timelines(timelines: Iterable[Timeline]) -> dict[TaskType, CompiledTimeline]:
+    """Compile each timeline, keyed by task type.
+
+    Raises:
+        TimelineError: If an expression is invalid or uses a name not in scope.
+    """
+    return {timeline.task_type: CompiledTimeline(timeline) for timeline in timelines}
+
+
+def read_timelines(path: str | Path) -> list[Timeline]:
+    """Timelines from a JSON file, or a YAML file (``.yaml`` / ``.yml``, needs PyYAML).
+
+    Raises:
+        pydantic.ValidationError: If a timeline in the file is invalid.
+        RuntimeError: If the file is YAML and PyYAML is not installed.
+    """
+    path = Path(path)
+    if path.suffix.lower() not in (".yaml", ".yml"):
+        return TIMELINES_ADAPTER.validate_json(path.read_bytes())
+    try:
+        import yaml
+    except ImportError as exc:
+        raise RuntimeError(f"Reading YAML timelines from {path} requires PyYAML (pip install pyyaml)") from exc
+    return TIMELINES_ADAPTER.validate_python(yaml.safe_load(path.read_text(encoding="utf-8")))
+
+
+def load_timelines(path: str | Path | None = None) -> list[Timeline]:
+    """Built-in timelines, with the timelines in the JSON or YAML file at ``path`` replacing them per task type.
+
+    Raises:
+        pydantic.ValidationError: If a timeline in the file is invalid.
+    """
+    defaults = read_timelines(DEFAULT_TIMELINES_PATH)
+    if path is None:
+        return defaults
+    extra = read_timelines(path)
+    logger.info("Loaded {} simulator timelines from {}", len(extra), path)
+    return merge_timelines(defaults, extra)
+
+
+@functools.cache
+def timeline_table(path: str | None = None) -> dict[TaskType, CompiledTimeline]:
+    """Compiled timelines for ``path``, built once per process and shared by every robot."""
+    return compile_timelines(load_timelines(path))
+
+
+# ---------------------------------------------------------------------------
+# Simulator
+# ---------------------------------------------------------------------------
+
+
+class TimelineSimulator(BaseSimulator):
+    """Runs the compiled timeline for a task type.
+
+    ``task_types`` restricts a subclass to the task types it is registered for; the
+    base class accepts any task type with a timeline.
+    """
+
+    task_types: tuple[TaskType, ...] = ()
+
+    def __init__(
+        self,
+        producer: ResultProducer,
+        settings: MockSettings,
+        *,
+        log_producer: LogProducer | None = None,
+        world_state: WorldState | None = None,
+        clock: Clock | None = None,
+        timelines: Mapping[TaskType, CompiledTimeline] | None = None,
+    ) -> None:
+        super().__init__(producer, settings, log_producer=log_producer, world_state=world_state, clock=clock)
+        self._timelines = timelines if timelines is not None else timeline_table(settings.simulator_timelines_file)
+        self._functions: dict[str, Callable[..., Any]] = {
+            **_PURE_FUNCTIONS,
+            "capture_images": self._capture_images,
+            "cc_duration": self._cc_duration,
+            "chromatogram": self._chromatogram,
+            "device_update": self._device_update,
+            "entity": self._entity,
+            "evaporation_schedule": self._evaporation_schedule,
+            "evaporation_state": self._evaporation_state,
+            "resolve": self._resolve_entity_id,
+            "telemetry_interval": self._telemetry_interval,
+            "timestamp": self._timestamp,
+        }
+
+    async def simulate(self, task_id: str, task_type: TaskType, params: BaseModel) -> RobotResult:
+        """Run the timeline for ``task_type``."""
+        timeline = self._timelines.get(task_type)
+        if timeline is None or (self.task_types and task_type not in self.task_types):
+            raise ValueError(f"{type(self).__name__} cannot handle task: {task_type}")
+        logger.info("Simulating {} for task {}", task_type.value, task_id)
+        scope: dict[str, Any] = {
+            **self._functions,
+            "task_id": task_id,
+            "robot_id": self.robot_id,
+            "params": params,
+            "multiplier": self.multiplier,
+        }
+        result = await timeline.run(self, scope)
+        logger.debug("Simulation of {} complete for task {}", task_type.value, task_id)
+        return result
+
+    def _apply_started(self, task_id: str, updates: list[EntityUpdate]) -> None:
+        """Make a started task's device state visible at once; its reservations stay held."""
+        if self._world_state is not None:
+            self._world_state.apply_updates(updates, task_id=task_id, release=False)
+
+    # -- timeline functions ----------------------------------------------------
+
+    def _timestamp(self) -> str:
+        return generate_robot_timestamp(self._clock.now())
+
+    def _entity(self, entity_type: str, entity_id: str) -> Mapping[str, Any] | None:
+        return self._world_state.get_entity(entity_type, entity_id) if self._world_state is not None else None
+
+    def _cc_duration(self, run_minutes: int) -> float:
+        return calculate_cc_duration(run_minutes, self.multiplier)
+
+    def _chromatogram(self, experiment_params: CCExperimentParams, seed: str) -> Chromatogram | None:
+        """The run's UV trace, reproducible per ``seed`` (the task id); None when disabled in settings."""
+        sample_rate = self._settings.cc_chromatogram_sample_rate
+        if sample_rate <= 0:
+            return None
+        peaks = [ChromatogramPeak(**peak) for peak in self._settings.cc_chromatogram_peaks] or None
+        return generate_chromatogram(
+            experiment_params, sample_rate=sample_rate, peaks=peaks, seed=zlib.crc32(seed.encode())
+        )
+
+    def _run_time(self, scaled: float) -> float:
+        """Simulated seconds back in unscaled process time."""
+        return scaled / self.multiplier if self.multiplier > 0 else 0.0
+
+    def _evaporation_schedule(self, profiles: EvaporationProfiles) -> EvaporationSchedule:
+        """Every profile stage at its trigger; stage times and durations are unscaled run time."""
+        return schedule_evaporation(profiles, volume=self._settings.re_solvent_volume_ml)
+
+    def _evaporation_state(self, model: EvaporationRun, elapsed: float) -> EvaporatorReading:
+        return model.at(self._run_time(elapsed))
+
+    def _telemetry_interval(self) -> float | None:
+        """Clock seconds between evaporator telemetry logs, or None to use the progress ticks.
+
+        ``re_telemetry_rate`` counts logs per second of run time; like every other run time
+        it is scaled onto the clock by the delay multiplier (the clock applies its own scale).
+        """
+        rate = self._settings.re_telemetry_rate
+        return self.multiplier / rate if rate > 0 else None
+
+    def _capture_images(
+        self, work_station: str, device_id: str, device_type: str, components: list[str] | str
+    ) -> list[CapturedImage]:
+        return generate_captured_images(
+            self.image_base_url, work_station, device_id, device_type, components, now=self._clock.now()
+        )
+
+    def _device_update(self, device_id: str, device_type: str) -> EntityUpdate | None:
+        """Current state of a photographed device as an update, if world_state tracks it."""
+        if self._world_state is None:
+            return None
+
+        entity_type = DEVICE_ENTITY_TYPES.get(device_type)
+        if entity_type is None:
+            logger.warning("Unknown device_type for photo: {}", device_type)
+            return None
+
+        device_state = self._world_state.get_entity(entity_type, device_id)
+        if device_state is None:
+            logger.debug("No device state found in world_state for {} ({})", device_id, device_type)
+            return None
+
+        if entity_type == "column_chromatography_machine":
+            return create_cc_system_update(
+                system_id=device_id,
+                state=device_state.get("state", "idle"),
+                experiment_params=device_state.get("experiment_params"),
+                start_timestamp=device_state.get("start_timestamp"),
+            )
+        return create_evaporator_update(
+            evaporator_id=device_id,
+            state=device_state.get("state", "idle"),
+            lower_height=device_state.get("lower_height", 0.0),
+            rpm=device_state.get("rpm", 0),
+            target_temperature=device_state.get("target_temperature", 0.0),
+            current_temperature=device_state.get("current_temperature", 0.0),
+            target_pressure=device_state.get("target_pressure", 0.0),
+            current_pressure=device_state.get("current_pressure", 0.0),
+        )
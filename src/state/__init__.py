@@ -2,11 +2,25 @@
 
 from __future__ import annotations
 
+from src.state.changes import ChangeBatch, ChangeFeed, EntityChange, Subscription
+from src.state.history import EntityHistory, HistoryEntry
+from src.state.journal import WorldJournal
 from src.state.preconditions import PreconditionChecker, PreconditionResult
-from src.state.world_state import WorldState
+from src.state.seeding import load_seed_file, seed_from_file
+from src.state.world_state import WorldSnapshot, WorldState
 
 __all__ = [
     "WorldState",
+    "WorldSnapshot",
+    "WorldJournal",
+    "EntityHistory",
+    "HistoryEntry",
+    "ChangeFeed",
+    "ChangeBatch",
+    "EntityChange",
+    "Subscription",
+    "load_seed_file",
+    "seed_from_file",
     "PreconditionChecker",
     "PreconditionResult",
 ]
@@ -0,0 +1,221 @@
+"""WorldState change feed — field-level diffs pushed to async subscribers.
+
+Every batch applied to ``WorldState`` (and every reset) is published as one
+``ChangeBatch`` carrying the new snapshot version and, per entity, the fields whose
+values changed as ``(old, new)`` pairs. Diffs are only computed while at least one
+subscriber is attached.
+
+Each ``Subscription`` owns a bounded queue. When a slow subscriber's queue is full the
+configured ``OverflowPolicy`` decides what happens:
+
+- ``drop_oldest`` (default): discard the oldest queued batch to make room.
+- ``drop_newest``: discard the incoming batch.
+- ``disconnect``: close the subscription; iteration ends after the queued batches.
+
+Dropped batches are counted on the subscription (``dropped``); a subscriber that needs
+an exact picture resynchronizes from ``WorldState.snapshot()`` when the count grows.
+Publishing never blocks the writer and is safe from threads other than the
+subscriber's event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping
+
+OverflowPolicy = Literal["drop_oldest", "drop_newest", "disconnect"]
+OVERFLOW_POLICIES: tuple[OverflowPolicy, ...] = ("drop_oldest", "drop_newest", "disconnect")
+
+_MISSING = object()
+
+
+@dataclass(frozen=True, slots=True)
+class EntityChange:
+    """Field-level diff of one entity within a batch."""
+
+    entity_type: str
+    entity_id: str
+    created: bool
+    fields: dict[str, tuple[Any, Any]]  # field -> (old, new); old is None for created entities
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeBatch:
+    """All changes produced by one ``apply_updates`` call or reset."""
+
+    version: int
+    changes: tuple[EntityChange, ...] = ()
+    reset: bool = False
+
+
+def diff_entity(
+    entity_type: str, entity_id: str, old: Mapping[str, Any] | None, new: Mapping[str, Any]
+) -> EntityChange | None:
+    """Diff two property dicts; None when nothing changed."""
+    if old is None:
+        return EntityChange(entity_type, entity_id, True, {key: (None, value) for key, value in new.items()})
+    fields = {key: (old.get(key), value) for key, value in new.items() if old.get(key, _MISSING) != value}
+    fields.update({key: (value, None) for key, value in old.items() if key not in new})
+    return EntityChange(entity_type, entity_id, False, fields) if fields else None
+
+
+@dataclass
+class FeedStats:
+    """Counters for a ``ChangeFeed``."""
+
+    published: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    disconnected: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "disconnected": self.disconnected,
+        }
+
+
+class Subscription:
+    """A subscriber's bounded stream of ``ChangeBatch`` objects; iterate with ``async for``."""
+
+    def __init__(
+        self,
+        feed: ChangeFeed,
+        *,
+        maxsize: int,
+        overflow: OverflowPolicy,
+        entity_types: Collection[str] | None,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("Subscription maxsize must be >= 1")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self._feed = feed
+        self._loop = asyncio.get_running_loop()
+        self._queue: deque[ChangeBatch] = deque()
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._entity_types = frozenset(entity_types) if entity_types is not None else None
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.dropped = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def close(self) -> None:
+        """Detach from the feed; batches already queued can still be read."""
+        if not self._closed:
+            self._closed = True
+            self._feed._subscribers.discard(self)
+            self._ready.set()
+
+    async def get(self) -> ChangeBatch | None:
+        """Next batch, waiting if necessary; None once closed and drained."""
+        while not self._queue:
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        return self._queue.popleft()
+
+    def __aiter__(self) -> Subscription:
+        return self
+
+    async def __anext__(self) -> ChangeBatch:
+        batch = await self.get()
+        if batch is None:
+            raise StopAsyncIteration
+        return batch
+
+    def _wants(self, batch: ChangeBatch) -> ChangeBatch | None:
+        if self._entity_types is None or batch.reset:
+            return batch
+        changes = tuple(change for change in batch.changes if change.entity_type in self._entity_types)
+        return ChangeBatch(batch.version, changes) if changes else None
+
+    def _offer(self, batch: ChangeBatch) -> None:
+        """Enqueue ``batch`` applying the overflow policy; runs on the subscriber's loop."""
+        if self._closed:
+            return
+        stats = self._feed.stats
+        if len(self._queue) >= self._maxsize:
+            match self._overflow:
+                case "drop_oldest":
+                    self._queue.popleft()
+                case "drop_newest":
+                    self.dropped += 1
+                    stats.dropped += 1
+                    return
+                case "disconnect":
+                    logger.warning("Change feed subscriber fell {} batches behind, disconnecting", self._maxsize)
+                    stats.disconnected += 1
+                    self.close()
+                    return
+            self.dropped += 1
+            stats.dropped += 1
+        self._queue.append(batch)
+        stats.delivered += 1
+        self._ready.set()
+
+
+class ChangeFeed:
+    """Fan-out of ``ChangeBatch`` objects from one ``WorldState`` to its subscribers."""
+
+    def __init__(self) -> None:
+        self._subscribers: set[Subscription] = set()
+        self.stats = FeedStats()
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(
+        self,
+        *,
+        maxsize: int = 256,
+        overflow: OverflowPolicy = "drop_oldest",
+        entity_types: Collection[str] | None = None,
+    ) -> Subscription:
+        """Attach a subscriber on the running event loop.
+
+        Args:
+            maxsize: Batches buffered before the overflow policy applies.
+            overflow: ``drop_oldest``, ``drop_newest`` or ``disconnect``.
+            entity_types: Only deliver changes to these entity types (resets are always delivered).
+        """
+        subscription = Subscription(self, maxsize=maxsize, overflow=overflow, entity_types=entity_types)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def publish(self, batch: ChangeBatch) -> None:
+        """Deliver ``batch`` to every interested subscriber without blocking."""
+        self.stats.published += 1
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for subscription in tuple(self._subscribers):
+            filtered = subscription._wants(batch)
+            if filtered is None:
+                continue
+            if subscription._loop is running:
+                subscription._offer(filtered)
+            else:
+                try:
+                    subscription._loop.call_soon_threadsafe(subscription._offer, filtered)
+                except RuntimeError:  # subscriber's loop is closed
+                    subscription.close()
@@ -0,0 +1,206 @@
+"""Bounded per-entity property history for ``WorldState``.
+
+``WorldState`` only holds the latest properties of each entity. ``EntityHistory`` keeps
+the recent past as well: one fixed-size ring per ``(entity_type, entity_id)`` of
+timestamped property versions, each tagged with the task that produced it. It answers
+questions such as "what was the evaporator's temperature curve during task X" without
+replaying broker logs.
+
+- Appends are O(1): a ring overwrites its oldest slot once full.
+- Time-range queries binary-search the one entity's ring (timestamps are kept
+  non-decreasing per ring), so they never scan other entities.
+- Memory is hard-capped twice: per ring (``capacity``, overridable per entity type;
+  0 disables a type) and across all rings (``max_entries``). When a new entry would
+  exceed ``max_entries``, the ring of the least recently updated entity is evicted.
+
+Entries share the immutable ``PropertyRecord`` stored in the snapshot, so recording a
+batch that was applied to the world costs one small tuple per entity.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from src.clock import Clock, RealClock
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Mapping
+
+_Key = tuple[str, str]
+
+
+class HistoryEntry(NamedTuple):
+    """One recorded property version of an entity."""
+
+    timestamp: float  # clock time as POSIX seconds
+    version: int  # world-state version current when recorded
+    task_id: str | None
+    properties: Mapping[str, Any]
+
+
+class _Ring:
+    """Fixed-capacity ring of entries in timestamp order."""
+
+    __slots__ = ("_entries", "_start", "capacity")
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._entries: list[HistoryEntry] = []
+        self._start = 0  # index of the oldest entry once the ring has wrapped
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _at(self, position: int) -> HistoryEntry:
+        return self._entries[(self._start + position) % len(self._entries)]
+
+    def append(self, entry: HistoryEntry) -> bool:
+        """Add ``entry``; returns True if an old entry was overwritten."""
+        if len(self._entries) < self.capacity:
+            self._entries.append(entry)
+            return False
+        self._entries[self._start] = entry
+        self._start = (self._start + 1) % self.capacity
+        return True
+
+    def last(self) -> HistoryEntry | None:
+        return self._at(len(self._entries) - 1) if self._entries else None
+
+    def _bisect(self, timestamp: float, *, right: bool) -> int:
+        low, high = 0, len(self._entries)
+        while low < high:
+            middle = (low + high) // 2
+            value = self._at(middle).timestamp
+            if value < timestamp or (right and value == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def between(self, since: float | None, until: float | None) -> list[HistoryEntry]:
+        first = self._bisect(since, right=False) if since is not None else 0
+        end = self._bisect(until, right=True) if until is not None else len(self._entries)
+        return [self._at(position) for position in range(first, end)]
+
+
+def _seconds(value: datetime | float | None) -> float | None:
+    return value.timestamp() if isinstance(value, datetime) else value
+
+
+class EntityHistory:
+    """Per-entity rings of recent property versions.
+
+    Args:
+        capacity: Entries kept per entity (0 records nothing unless overridden per type).
+        capacities: Per entity type overrides of ``capacity``; 0 disables a type.
+        max_entries: Hard cap on entries across all rings.
+        clock: Source of entry timestamps.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 64,
+        *,
+        capacities: Mapping[str, int] | None = None,
+        max_entries: int = 100_000,
+        clock: Clock | None = None,
+    ) -> None:
+        if capacity < 0 or max_entries < 1:
+            raise ValueError("History capacity must be >= 0 and max_entries >= 1")
+        self._capacity = capacity
+        self._capacities = dict(capacities or {})
+        self._max_entries = max_entries
+        self._clock = clock if clock is not None else RealClock()
+        self._rings: OrderedDict[_Key, _Ring] = OrderedDict()  # least recently updated first
+        self._entries = 0
+        self._lock = Lock()
+        self.evicted = 0  # rings dropped to stay under max_entries
+
+    def __len__(self) -> int:
+        """Total entries held across all rings."""
+        return self._entries
+
+    def capacity_for(self, entity_type: str) -> int:
+        """Ring size used for ``entity_type``."""
+        return self._capacities.get(entity_type, self._capacity)
+
+    def record(
+        self,
+        entries: Collection[tuple[str, str, Mapping[str, Any]]],
+        *,
+        version: int,
+        task_id: str | None = None,
+    ) -> None:
+        """Append one version per ``(entity_type, entity_id, properties)``, all stamped now."""
+        if not entries:
+            return
+        now = self._clock.now().timestamp()
+        with self._lock:
+            for entity_type, entity_id, properties in entries:
+                capacity = self.capacity_for(entity_type)
+                if capacity <= 0:
+                    continue
+                key = (entity_type, entity_id)
+                ring = self._rings.get(key)
+                if ring is None:
+                    ring = self._rings[key] = _Ring(min(capacity, self._max_entries))
+                else:
+                    self._rings.move_to_end(key)
+                previous = ring.last()
+                timestamp = now if previous is None or now >= previous.timestamp else previous.timestamp
+                if not ring.append(HistoryEntry(timestamp, version, task_id, properties)):
+                    self._entries += 1
+                    self._evict(keep=key)
+
+    def _evict(self, keep: _Key) -> None:
+        """Drop least recently updated rings until under ``max_entries``."""
+        while self._entries > self._max_entries:
+            key = next(iter(self._rings))
+            if key == keep:
+                break
+            self._entries -= len(self._rings.pop(key))
+            self.evicted += 1
+
+    def query(
+        self,
+        entity_type: str,
+        entity_id: str,
+        *,
+        since: datetime | float | None = None,
+        until: datetime | float | None = None,
+        task_id: str | None = None,
+    ) -> list[HistoryEntry]:
+        """Recorded versions of one entity, oldest first.
+
+        Args:
+            entity_type: Entity type (e.g., "evaporator")
+            entity_id: Entity ID
+            since: Inclusive lower time bound (datetime or POSIX seconds)
+            until: Inclusive upper time bound (datetime or POSIX seconds)
+            task_id: Only versions produced by this task
+
+        Returns:
+            Matching entries; empty if the entity has no history
+        """
+        with self._lock:
+            ring = self._rings.get((entity_type, entity_id))
+            if ring is None:
+                return []
+            entries = ring.between(_seconds(since), _seconds(until))
+        if task_id is not None:
+            entries = [entry for entry in entries if entry.task_id == task_id]
+        return entries
+
+    def tracked(self) -> list[tuple[str, str]]:
+        """``(entity_type, entity_id)`` pairs with recorded history."""
+        with self._lock:
+            return list(self._rings)
+
+    def clear(self) -> None:
+        """Drop all recorded history."""
+        with self._lock:
+            self._rings.clear()
+            self._entries = 0
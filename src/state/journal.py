@@ -0,0 +1,258 @@
+"""Durable WorldState persistence: compact snapshot + append-only write-ahead journal.
+
+Layout of a state directory (one per robot)::
+
+    snapshot.json     {"version": N, "entities": {entity_type: {entity_id: properties}}}
+    journal.jsonl     one record per applied batch after the snapshot:
+                      {"v": N+1, "op": "apply", "e": [[entity_type, entity_id, properties], ...]}
+                      {"v": N+2, "op": "reset"}
+                      {"v": N+3, "op": "replace", "e": [...]}   (seed: reset + apply)
+    journal.1.jsonl   records of a compaction in progress (only while one runs)
+
+``WorldState`` appends a record for every batch while holding its writer lock. Every
+``snapshot_every`` records the journal is compacted without blocking writers: under the
+lock the journal is only renamed to ``journal.1.jsonl`` and a fresh one opened; a
+background thread then writes the current (immutable) snapshot to a temporary file,
+atomically renames it over ``snapshot.json`` and deletes the rotated segment. Records
+carry the version they produce, so a crash at any point only leaves records that replay
+either needs or skips.
+
+Recovery reads the snapshot in one ``json.loads`` and decodes the journal (rotated
+segment first) line by line straight from a memory mapping, then rebuilds the indexes in
+a single pass. A torn last journal line (crash mid-append) is dropped and truncated.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from loguru import logger
+
+from src.state.records import json_default
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from src.state.world_state import WorldSnapshot
+
+SNAPSHOT_FILE = "snapshot.json"
+JOURNAL_FILE = "journal.jsonl"
+ROTATED_JOURNAL_FILE = "journal.1.jsonl"
+
+EntityRecord = tuple[str, str, Mapping[str, Any]]
+
+
+def _encode(record: dict[str, Any]) -> bytes:
+    return json.dumps(record, separators=(",", ":"), default=json_default).encode() + b"\n"
+
+
+def _map(path: Path) -> mmap.mmap | None:
+    """Read-only mapping of ``path``, or None if it is missing or empty."""
+    try:
+        with path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return None
+
+
+class WorldJournal:
+    """Snapshot + write-ahead journal for one ``WorldState``.
+
+    Args:
+        directory: State directory; created if missing.
+        snapshot_every: Journal records between compactions (0 disables periodic compaction).
+        fsync: ``os.fsync`` after every journal append (durable across power loss, slower).
+    """
+
+    def __init__(self, directory: str | Path, *, snapshot_every: int = 1000, fsync: bool = False) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._snapshot_path = self.directory / SNAPSHOT_FILE
+        self._journal_path = self.directory / JOURNAL_FILE
+        self._rotated_path = self.directory / ROTATED_JOURNAL_FILE
+        self._snapshot_every = snapshot_every
+        self._fsync = fsync
+        self._records = 0
+        self._file: BinaryIO | None = None
+        self._compaction: threading.Thread | None = None
+
+    @property
+    def records_since_snapshot(self) -> int:
+        """Journal records written (or replayed) since the last compaction."""
+        return self._records
+
+    @property
+    def compacting(self) -> bool:
+        """Whether a background compaction is running."""
+        return self._compaction is not None and self._compaction.is_alive()
+
+    # -- recovery --------------------------------------------------------------
+
+    def load(self) -> tuple[int, dict[str, dict[str, dict[str, Any]]]]:
+        """Recover ``(version, entities by type)`` from the snapshot and journal.
+
+        Must be called once, before the first ``append``; it also opens the journal
+        for appending.
+        """
+        version = 0
+        by_type: dict[str, dict[str, dict[str, Any]]] = {}
+
+        try:
+            raw = self._snapshot_path.read_bytes()
+        except FileNotFoundError:
+            raw = b""
+        if raw:
+            snapshot = json.loads(raw)
+            version = snapshot["version"]
+            by_type = snapshot["entities"]
+
+        snapshot_version = version
+        interrupted = self._rotated_path.exists()
+        if interrupted:
+            version, by_type, _ = self._replay(self._rotated_path, version, by_type)
+        version, by_type, good_bytes = self._replay(self._journal_path, version, by_type)
+
+        self._file = self._journal_path.open("ab")
+        if self._file.tell() != good_bytes:
+            self._file.truncate(good_bytes)
+            self._file.seek(good_bytes)
+        if interrupted:
+            # Finish the compaction a crash interrupted before the next one rotates again
+            logger.warning("Completing interrupted compaction of {}", self.directory)
+            self._write_snapshot(version, by_type)
+            self._file.truncate(0)
+            self._file.seek(0)
+            self._records = 0
+            self._rotated_path.unlink()
+
+        logger.info(
+            "Restored world state v{} from {} ({} entities, snapshot v{} + {} journal records)",
+            version,
+            self.directory,
+            sum(len(bucket) for bucket in by_type.values()),
+            snapshot_version,
+            version - snapshot_version,
+        )
+        return version, by_type
+
+    def _replay(
+        self, path: Path, version: int, by_type: dict[str, dict[str, dict[str, Any]]]
+    ) -> tuple[int, dict[str, dict[str, dict[str, Any]]], int]:
+        """Apply the records of ``path`` newer than ``version``; returns the new state and its intact length."""
+        good_bytes = 0
+        mapped = _map(path)
+        if mapped is None:
+            return version, by_type, good_bytes
+        with mapped:
+            while line := mapped.readline():
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Dropping torn journal record at byte {} in {}", good_bytes, path)
+                    break
+                good_bytes = mapped.tell()
+                self._records += 1
+                if record["v"] <= version:
+                    continue  # already contained in the snapshot
+                version = record["v"]
+                if record["op"] in ("reset", "replace"):
+                    by_type = {}
+                for entity_type, entity_id, properties in record.get("e", ()):
+                    by_type.setdefault(entity_type, {})[entity_id] = properties
+        return version, by_type, good_bytes
+
+    # -- writing ---------------------------------------------------------------
+
+    def append(self, version: int, entities: Iterable[EntityRecord], *, replace: bool = False) -> None:
+        """Record an applied batch producing ``version``; ``replace`` clears the world first."""
+        self._write({"v": version, "op": "replace" if replace else "apply", "e": list(entities)})
+
+    def append_reset(self, version: int) -> None:
+        """Record a reset producing ``version``."""
+        self._write({"v": version, "op": "reset"})
+
+    def should_compact(self) -> bool:
+        """Whether enough records accumulated for a periodic compaction."""
+        return self._snapshot_every > 0 and self._records >= self._snapshot_every and not self.compacting
+
+    def start_compaction(self, snapshot: WorldSnapshot) -> None:
+        """Rotate the journal and write ``snapshot`` from a background thread.
+
+        Called with the writer lock held, right after the record producing ``snapshot``
+        was appended; only the rotation (a rename) happens before it returns. Later
+        records go to the fresh journal and are replayed on top of the snapshot.
+        """
+        self.wait()
+        if self._file is not None:
+            if self._rotated_path.exists():
+                # A failed compaction left its segment behind: keep those records
+                with self._rotated_path.open("ab") as rotated:
+                    rotated.write(self._journal_path.read_bytes())
+                self._file.truncate(0)
+                self._file.seek(0)
+            else:
+                self._file.close()
+                self._journal_path.replace(self._rotated_path)
+                self._file = self._journal_path.open("ab")
+        self._records = 0
+        self._compaction = threading.Thread(target=self._compact, args=(snapshot,), name="world-journal-compaction")
+        self._compaction.start()
+
+    def compact(self, snapshot: WorldSnapshot) -> None:
+        """Rotate the journal, write ``snapshot`` and wait for it to be on disk."""
+        self.start_compaction(snapshot)
+        self.wait()
+
+    def wait(self) -> None:
+        """Block until a running background compaction has finished."""
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+
+    def close(self) -> None:
+        """Wait for a running compaction and close the journal file."""
+        self.wait()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _compact(self, snapshot: WorldSnapshot) -> None:
+        try:
+            self._write_snapshot(
+                snapshot.version,
+                {entity_type: snapshot.entities_of_type(entity_type) for entity_type in snapshot.entity_types()},
+            )
+            self._rotated_path.unlink(missing_ok=True)
+        except OSError:
+            logger.exception("World state compaction to {} failed; records kept in the journal", self.directory)
+            return
+        logger.debug(
+            "World state snapshot v{} written to {} ({} entities)", snapshot.version, self.directory, len(snapshot)
+        )
+
+    def _write_snapshot(self, version: int, entities: Mapping[str, Mapping[str, Any]]) -> None:
+        """Write the snapshot to a temporary file and atomically rename it into place."""
+        by_type = {entity_type: dict(bucket) for entity_type, bucket in entities.items()}
+        tmp_path = self._snapshot_path.with_suffix(".tmp")
+        with tmp_path.open("wb") as f:
+            f.write(json.dumps({"version": version, "entities": by_type}, default=json_default).encode())
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(self._snapshot_path)
+
+    def _write(self, record: dict[str, Any]) -> None:
+        if self._file is None:
+            raise RuntimeError("WorldJournal not loaded. Call load() first.")
+        self._file.write(_encode(record))
+        self._file.flush()
+        if self._fsync:
+            os.fsync(self._file.fileno())
+        self._records += 1
@@ -2,18 +2,38 @@
 
 Validates that required entities exist and are in valid states before
 skill execution begins. Returns error codes in 2000-2099 range for violations.
+
+The checks themselves are declarative ``PreconditionRule`` objects (see ``rules.py``),
+compiled once into a per-task dispatch table; a check is a dict lookup plus one
+snapshot read per rule.
+
+Results are memoized per ``(task_type, entity keys from the params)``. An entry is
+reused as-is while the world version is unchanged; after other writes it is reused if
+every entity the rules resolved is still the same immutable record, so only writes to
+the entities a check actually read invalidate it.
+
+``check_and_reserve`` additionally claims the device or work station a task operates
+on (see ``reservations.py``), so concurrent tasks cannot both pass against the same
+pre-task state.
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 from pydantic import BaseModel
 
+from src.state.rules import DEFAULT_RULES, compile_rules, stats_by_rule
+
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
     from src.schemas.commands import TaskType
-    from src.state.world_state import WorldState
+    from src.state.reservations import Resource
+    from src.state.rules import CompiledRule, PreconditionRule
+    from src.state.world_state import WorldSnapshot, WorldState
 
 
 class PreconditionResult(BaseModel):
@@ -24,6 +44,110 @@ class PreconditionResult(BaseModel):
     error_msg: str = ""
 
 
+_OK = PreconditionResult(ok=True)
+
+_Dependencies = tuple["Mapping[str, Any] | None", ...]
+
+
+@dataclass
+class CacheStats:
+    """Counters for a ``PreconditionCache``."""
+
+    hits: int = 0  # includes revalidated entries
+    misses: int = 0
+    revalidated: int = 0  # world changed, but not the entities the check read
+    invalidated: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "invalidated": self.invalidated,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class _CacheEntry:
+    __slots__ = ("dependencies", "result", "version")
+
+    def __init__(self, version: int, dependencies: _Dependencies, result: PreconditionResult) -> None:
+        self.version = version
+        self.dependencies = dependencies  # entity each evaluated rule resolved, by identity
+        self.result = result
+
+
+class PreconditionCache:
+    """Bounded memo of precondition results, validated against the world version.
+
+    Args:
+        maxsize: Entries kept; the oldest entry is evicted when full.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        if maxsize < 1:
+            raise ValueError("PreconditionCache maxsize must be >= 1")
+        self._maxsize = maxsize
+        self._entries: dict[tuple[str, tuple[str | None, ...]], _CacheEntry] = {}
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(
+        self,
+        task_type: str,
+        keys: tuple[str | None, ...],
+        rules: tuple[CompiledRule, ...],
+        snapshot: WorldSnapshot,
+    ) -> PreconditionResult | None:
+        """Cached result still valid for ``snapshot``, or None.
+
+        A hit is credited to the ``cache_hits`` / ``cached_failures`` counters of the
+        rules the cached check evaluated.
+        """
+        entry = self._entries.get((task_type, keys))
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if entry.version != snapshot.version:
+            for rule, key, dependency in zip(rules, keys, entry.dependencies, strict=False):
+                if key is not None and rule.resolve(snapshot, key) is not dependency:
+                    del self._entries[(task_type, keys)]
+                    self.stats.invalidated += 1
+                    self.stats.misses += 1
+                    return None
+            entry.version = snapshot.version
+            self.stats.revalidated += 1
+        self.stats.hits += 1
+        chain = len(entry.dependencies)  # rules up to and including the failing one
+        for rule, key in zip(rules[:chain], keys, strict=False):
+            if key is not None:
+                rule.stats.cache_hits += 1
+        if not entry.result.ok:
+            rules[chain - 1].stats.cached_failures += 1
+        return entry.result
+
+    def store(
+        self,
+        task_type: str,
+        keys: tuple[str | None, ...],
+        version: int,
+        dependencies: _Dependencies,
+        result: PreconditionResult,
+    ) -> None:
+        if len(self._entries) >= self._maxsize:
+            del self._entries[next(iter(self._entries))]
+            self.stats.evictions += 1
+        self._entries[(task_type, keys)] = _CacheEntry(version, dependencies, result)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
 class PreconditionChecker:
     """Validates task preconditions against current world state.
 
@@ -31,189 +155,117 @@ class PreconditionChecker:
     before a task begins execution.
     """
 
-    def __init__(self, world_state: WorldState) -> None:
+    def __init__(
+        self,
+        world_state: WorldState,
+        rules: Iterable[PreconditionRule] | None = None,
+        cache_size: int = 4096,
+    ) -> None:
         """Initialize precondition checker.
 
         Args:
             world_state: World state to check against
+            rules: Precondition rules to enforce (default: the built-in ``DEFAULT_RULES``)
+            cache_size: Memoized results kept (0 disables memoization)
         """
         self._world_state = world_state
+        self._table: dict[str, tuple[CompiledRule, ...]] = compile_rules(rules if rules is not None else DEFAULT_RULES)
+        self.cache = PreconditionCache(cache_size) if cache_size > 0 else None
 
-    def _find_entity_at_location(self, entity_type: str, location: str) -> tuple[str, dict[str, Any]] | None:
-        """Find an entity by type whose ``location`` property matches.
+    def check(self, task_type: TaskType, params: BaseModel) -> PreconditionResult:
+        """Check if preconditions are met for a task.
 
-        Some entities (tube_rack, round_bottom_flask) are keyed in WorldState
-        by their location_id string rather than by work_station_id.  This
-        helper searches all entities of the given type for one located at
-        ``location``.
+        Args:
+            task_type: Task to validate
+            params: Validated task parameters
 
         Returns:
-            (entity_id, properties) tuple, or None if not found.
+            PreconditionResult with ok=True if checks pass, ok=False with error otherwise
         """
-        entities = self._world_state.get_entities_by_type(entity_type)
-        for entity_id, props in entities.items():
-            if props.get("location") == location:
-                return entity_id, props
-        return None
-
-    def check(self, task_type: TaskType, params: BaseModel) -> PreconditionResult:
-        """Check if preconditions are met for a task.
+        rules = self._table.get(task_type)
+        if not rules:
+            # Tasks with no meaningful preconditions (take_photo, setup_tube_rack)
+            return _OK
+
+        snapshot = self._world_state.snapshot()
+        keys = tuple(rule.key(params) for rule in rules)
+        cache = self.cache
+        if cache is not None:
+            cached = cache.lookup(task_type, keys, rules, snapshot)
+            if cached is not None:
+                if not cached.ok:
+                    logger.warning("Precondition failed for {} (cached): {}", task_type, cached.error_msg)
+                return cached
+
+        result = _OK
+        dependencies: list[Mapping[str, Any] | None] = []
+        for rule, key in zip(rules, keys, strict=True):
+            if key is None:
+                rule.stats.skipped += 1
+                dependencies.append(None)
+                continue
+            entity, failure = rule.evaluate(snapshot, key)
+            dependencies.append(entity)
+            if failure is not None:
+                error_code, error_msg = failure
+                logger.warning("Precondition failed for {} ({}): {}", task_type, rule.name, error_msg)
+                result = PreconditionResult(ok=False, error_code=error_code, error_msg=error_msg)
+                break
+        if cache is not None:
+            cache.store(task_type, keys, snapshot.version, tuple(dependencies), result)
+        return result
+
+    def check_and_reserve(self, task_id: str, task_type: TaskType, params: BaseModel) -> PreconditionResult:
+        """Check preconditions and, if they pass, claim the task's resources atomically.
+
+        The claim is held until ``WorldState`` applies the task's updates or the caller
+        releases it via ``world_state.reservations.release(task_id)``.
 
         Args:
+            task_id: Task that will hold the reservation
             task_type: Task to validate
             params: Validated task parameters
 
         Returns:
-            PreconditionResult with ok=True if checks pass, ok=False with error otherwise
+            PreconditionResult; a resource held by another task fails with the
+            reserving rule's conflict code
         """
-        # Import here to avoid circular dependency
-        from src.schemas.commands import TaskType
-
-        match task_type:
-            case TaskType.SETUP_CARTRIDGES:
-                return self._check_setup_cartridges(params)
-            case TaskType.START_CC:
-                return self._check_start_cc(params)
-            case TaskType.TERMINATE_CC:
-                return self._check_terminate_cc(params)
-            case TaskType.COLLECT_CC_FRACTIONS:
-                return self._check_collect_cc_fractions(params)
-            case TaskType.START_EVAPORATION:
-                return self._check_start_evaporation(params)
-            case _:
-                # Tasks with no meaningful preconditions (take_photo, setup_tube_rack)
-                return PreconditionResult(ok=True)
-
-    # --- Precondition implementations ---
-
-    def _check_setup_cartridges(self, params: BaseModel) -> PreconditionResult:
-        """Check setup_cartridges: ext_module must not already be in use."""
-        work_station = getattr(params, "work_station", None)
-        if work_station is None:
-            return PreconditionResult(ok=True)  # No work station to check
-
-        ext_module = self._world_state.get_entity("ccs_ext_module", work_station)
-
-        if ext_module is not None:
-            state = ext_module.get("state", "")
-            if state in ("using", "mounted", "inuse"):
-                logger.warning(
-                    "Precondition failed for setup_cartridges: ext_module {} already in state '{}'",
-                    work_station,
-                    state,
-                )
-                return PreconditionResult(
-                    ok=False,
-                    error_code=2001,
-                    error_msg=f"External module {work_station} already has cartridges (state: {state})",
-                )
-
-        return PreconditionResult(ok=True)
-
-    def _check_start_cc(self, params: BaseModel) -> PreconditionResult:
-        """Check start_cc: CC system must not already be running."""
-        device_id = getattr(params, "device_id", None)
-        if device_id is None:
-            return PreconditionResult(ok=True)
-
-        cc_system = self._world_state.get_entity("column_chromatography_machine", device_id)
-        if cc_system is not None:
-            state = cc_system.get("state", "")
-            if state in ("running", "using"):
-                logger.warning("Precondition failed for start_cc: CC machine {} already in use ({})", device_id, state)
-                return PreconditionResult(
-                    ok=False,
-                    error_code=2020,
-                    error_msg=f"Column chromatography machine {device_id} is already in use (state: {state})",
-                )
-
-        return PreconditionResult(ok=True)
-
-    def _check_terminate_cc(self, params: BaseModel) -> PreconditionResult:
-        """Check terminate_cc: CC system must be in use."""
-        device_id = getattr(params, "device_id", None)
-        if device_id is None:
-            return PreconditionResult(ok=True)
-
-        cc_system = self._world_state.get_entity("column_chromatography_machine", device_id)
-        if cc_system is None:
-            logger.warning("Precondition failed for terminate_cc: CC machine {} not found", device_id)
-            return PreconditionResult(
-                ok=False,
-                error_code=2030,
-                error_msg=f"Column chromatography machine {device_id} not found in world state",
-            )
-
-        state = cc_system.get("state", "")
-        if state not in ("running", "using"):
-            logger.warning(
-                "Precondition failed for terminate_cc: CC machine {} in state '{}', expected 'using'",
-                device_id,
-                state,
-            )
-            return PreconditionResult(
-                ok=False,
-                error_code=2031,
-                error_msg=f"Column chromatography machine {device_id} is not in use (current state: {state})",
-            )
-
-        return PreconditionResult(ok=True)
-
-    def _check_collect_cc_fractions(self, params: BaseModel) -> PreconditionResult:
-        """Check collect_cc_fractions: tube_rack must exist and be in use or contaminated."""
-        work_station = getattr(params, "work_station", None)
-        if work_station is None:
-            return PreconditionResult(ok=True)
-
-        # Try direct lookup first, then fall back to location-based search.
-        # tube_rack entities are keyed by location_id (e.g. "bic_09C_l3_002"),
-        # not by work_station.
-        tube_rack = self._world_state.get_entity("tube_rack", work_station)
-        if tube_rack is None:
-            result = self._find_entity_at_location("tube_rack", work_station)
-            if result is not None:
-                _, tube_rack = result
-
-        if tube_rack is None:
-            logger.warning("Precondition failed for collect_cc_fractions: tube_rack at {} not found", work_station)
-            return PreconditionResult(
-                ok=False,
-                error_code=2040,
-                error_msg=f"Tube rack at work station {work_station} not found in world state",
-            )
-
-        state = tube_rack.get("state", "")
-        # Accept "used", "using", "inuse", "contaminated" and compound states
-        valid_states = ("used", "using", "inuse", "contaminated")
-        if not any(s in state for s in valid_states):
-            logger.warning(
-                "Precondition failed for collect_cc_fractions: tube_rack at {} state '{}', need valid state",
-                work_station,
-                state,
-            )
-            return PreconditionResult(
-                ok=False,
-                error_code=2041,
-                error_msg=f"Tube rack at {work_station} must be in use (current: {state})",
-            )
-
-        return PreconditionResult(ok=True)
-
-    def _check_start_evaporation(self, params: BaseModel) -> PreconditionResult:
-        """Check start_evaporation: evaporator must not already be in use."""
-        device_id = getattr(params, "device_id", None)
-        if device_id is None:
-            return PreconditionResult(ok=True)
-
-        evaporator = self._world_state.get_entity("evaporator", device_id)
-        if evaporator is not None:
-            state = evaporator.get("state", "idle")
-            if state == "using":
-                logger.warning("Precondition failed for start_evaporation: evaporator {} already in use", device_id)
-                return PreconditionResult(
-                    ok=False,
-                    error_code=2050,
-                    error_msg=f"Evaporator {device_id} is already in use",
-                )
-
-        return PreconditionResult(ok=True)
+        reservations = self._world_state.reservations
+        with reservations.lock:
+            for rule in self._table.get(task_type, ()):
+                key = rule.key(params)
+                if rule.conflict_code is None or key is None:
+                    continue
+                conflict = reservations.claim(task_id, ((rule.entity_type, key),))
+                if conflict is not None:
+                    reservations.release(task_id)
+                    (kind, resource_id), holder = conflict
+                    logger.warning(
+                        "Reservation conflict for {} task {}: {} {} held by task {}",
+                        task_type,
+                        task_id,
+                        kind,
+                        resource_id,
+                        holder,
+                    )
+                    return PreconditionResult(
+                        ok=False,
+                        error_code=rule.conflict_code,
+                        error_msg=f"{kind} {resource_id} is reserved by in-flight task {holder}",
+                    )
+            result = self.check(task_type, params)
+            if not result.ok:
+                reservations.release(task_id)
+        return result
+
+    def resources_for(self, task_type: TaskType, params: BaseModel) -> tuple[Resource, ...]:
+        """Resources a task claims while it runs (empty for tasks that share everything)."""
+        return tuple(
+            (rule.entity_type, key)
+            for rule in self._table.get(task_type, ())
+            if rule.conflict_code is not None and (key := rule.key(params)) is not None
+        )
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-rule evaluation, failure and latency counters keyed by rule name."""
+        return stats_by_rule(self._table)
@@ -0,0 +1,173 @@
+"""Compact, immutable entity property records for ``WorldState``.
+
+``PropertyRecord`` replaces the ``model_dump()`` dict previously stored per entity. A
+record is two slots — a shared ``_Shape`` (field names plus a name → position index,
+one per distinct property layout, i.e. per properties model) and a tuple of values —
+so the per-entity cost is a small object and a tuple instead of a hash table.
+
+Records are built straight from the pydantic properties model by reading its fields,
+without the dump-and-copy cycle. Nested models (``experiment_params``,
+``ContainerState``) become nested records, lists become ``FrozenList`` (a read-only
+tuple that still compares equal to lists), and strings are interned; identical nested
+records are shared between entities through a bounded LRU table.
+
+Records implement ``collections.abc.Mapping``, so existing ``props.get("state")`` /
+``props["location"]`` readers keep working, records compare equal to dicts with the
+same content, and pydantic accepts them wherever a dict of model data is expected.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_MAX_INTERNED = 4096
+
+
+class _Shape:
+    """Field layout shared by every record with the same field names."""
+
+    __slots__ = ("fields", "index")
+
+    def __init__(self, fields: tuple[str, ...]) -> None:
+        self.fields = fields
+        self.index = {name: position for position, name in enumerate(fields)}
+
+
+_shapes: dict[tuple[str, ...], _Shape] = {}
+_interned: OrderedDict[PropertyRecord, PropertyRecord] = OrderedDict()
+
+
+def _shape(fields: tuple[str, ...]) -> _Shape:
+    shape = _shapes.get(fields)
+    if shape is None:
+        shape = _shapes[fields] = _Shape(tuple(sys.intern(name) for name in fields))
+    return shape
+
+
+class FrozenList(tuple):
+    """Read-only list value of a record: a tuple that compares equal to lists with the same items."""
+
+    __slots__ = ()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, list):
+            return tuple.__eq__(self, tuple(other))
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = tuple.__hash__
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class PropertyRecord(Mapping[str, Any]):
+    """Immutable mapping of entity properties stored as a shared shape plus a value tuple."""
+
+    __slots__ = ("_shape", "_values")
+
+    def __init__(self, shape: _Shape, values: tuple[Any, ...]) -> None:
+        self._shape = shape
+        self._values = values
+
+    @classmethod
+    def from_model(cls, model: BaseModel) -> PropertyRecord:
+        """Build a record from a properties model without dumping it."""
+        fields = tuple(type(model).model_fields)
+        return cls(_shape(fields), tuple(freeze(getattr(model, name)) for name in fields))
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> PropertyRecord:
+        """Build a record from plain data (e.g. properties restored from JSON)."""
+        if isinstance(data, PropertyRecord):
+            return data
+        return cls(_shape(tuple(data)), tuple(freeze(value) for value in data.values()))
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._shape.index[key]]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        position = self._shape.index.get(key)
+        return default if position is None else self._values[position]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._shape.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._shape.fields)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PropertyRecord):
+            return self._shape.fields == other._shape.fields and self._values == other._values
+        if isinstance(other, Mapping):
+            return len(self) == len(other) and all(k in other and other[k] == v for k, v in self.items())
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self._shape.fields, self._values))
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+    def to_dict(self) -> dict[str, Any]:
+        """Deep conversion back to plain dicts and lists."""
+        return {name: _thaw(value) for name, value in zip(self._shape.fields, self._values, strict=True)}
+
+
+def freeze(value: Any) -> Any:
+    """Convert a property value to its immutable, compact stored form."""
+    if isinstance(value, str):
+        return sys.intern(value) if type(value) is str else value
+    if isinstance(value, BaseModel):
+        return _intern(PropertyRecord.from_model(value))
+    if isinstance(value, PropertyRecord):
+        return value
+    if isinstance(value, Mapping):
+        return _intern(PropertyRecord.from_mapping(value))
+    if isinstance(value, list | tuple):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def _intern(record: PropertyRecord) -> PropertyRecord:
+    """Share identical nested records between entities (LRU-bounded table)."""
+    try:
+        existing = _interned.get(record)
+    except TypeError:  # unhashable leaf value
+        return record
+    if existing is not None:
+        _interned.move_to_end(existing)
+        return existing
+    if len(_interned) >= _MAX_INTERNED:
+        _interned.popitem(last=False)
+    _interned[record] = record
+    return record
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, PropertyRecord):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """``json.dumps`` fallback that serializes records as objects."""
+    if isinstance(value, PropertyRecord):
+        return dict(value.items())
+    return str(value)
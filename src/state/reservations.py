@@ -0,0 +1,95 @@
+"""Exclusive resource reservations held by in-flight tasks.
+
+A precondition check reads the world as it is when a command starts, but the task's
+updates are only applied when its simulation finishes. Without a claim in between, two
+concurrent ``start_column_chromatography`` commands for the same device both pass.
+
+``ReservationTable`` closes that window: ``PreconditionChecker.check_and_reserve``
+evaluates the precondition and claims the task's resources (a device, an external
+module at a work station, ...) in one step under the table's lock. A conflicting task
+is rejected with a precondition error instead of waiting, so unrelated tasks still run
+in parallel. ``WorldState`` releases a task's claims in the same writer step that
+publishes its updates, so the resource is never observed free-but-stale; the consumer
+also releases them when a task fails or is cancelled.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import RLock
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+Resource = tuple[str, str]  # (kind, id), e.g. ("column_chromatography_machine", "cc-isco-300p_001")
+
+
+@dataclass
+class ReservationStats:
+    """Counters for a ``ReservationTable``."""
+
+    claimed: int = 0
+    conflicts: int = 0
+    released: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {"claimed": self.claimed, "conflicts": self.conflicts, "released": self.released}
+
+
+class ReservationTable:
+    """Thread-safe map of resource -> holding task id.
+
+    ``lock`` is reentrant so callers can hold it across a check and the following
+    ``claim`` to make the pair atomic.
+    """
+
+    def __init__(self) -> None:
+        self.lock = RLock()
+        self._holders: dict[Resource, str] = {}
+        self._by_task: dict[str, tuple[Resource, ...]] = {}
+        self.stats = ReservationStats()
+
+    def __len__(self) -> int:
+        return len(self._holders)
+
+    def holder(self, resource: Resource) -> str | None:
+        """Task currently holding ``resource``, if any."""
+        return self._holders.get(resource)
+
+    def held_by(self, task_id: str) -> tuple[Resource, ...]:
+        """Resources claimed by ``task_id``."""
+        return self._by_task.get(task_id, ())
+
+    def claim(self, task_id: str, resources: Iterable[Resource]) -> tuple[Resource, str] | None:
+        """Claim all ``resources`` for ``task_id``, or none of them.
+
+        Re-claiming a resource the task already holds succeeds.
+
+        Returns:
+            None on success, otherwise ``(resource, holding task id)`` of the first conflict.
+        """
+        wanted = tuple(resources)
+        with self.lock:
+            for resource in wanted:
+                holder = self._holders.get(resource)
+                if holder is not None and holder != task_id:
+                    self.stats.conflicts += 1
+                    return resource, holder
+            new = tuple(resource for resource in wanted if resource not in self._holders)
+            for resource in new:
+                self._holders[resource] = task_id
+            if new:
+                self._by_task[task_id] = (*self._by_task.get(task_id, ()), *new)
+                self.stats.claimed += len(new)
+        return None
+
+    def release(self, task_id: str) -> int:
+        """Release everything held by ``task_id``; returns the number of resources freed."""
+        with self.lock:
+            resources = self._by_task.pop(task_id, ())
+            for resource in resources:
+                if self._holders.get(resource) == task_id:
+                    del self._holders[resource]
+            self.stats.released += len(resources)
+        return len(resources)
@@ -0,0 +1,276 @@
+"""Declarative precondition rules, compiled into per-task dispatch tables.
+
+A ``PreconditionRule`` says, for one task type: which entity the task operates on
+(entity type + the params field holding its id), which states that entity may or may
+not be in, and the 2000-2099 error codes to return. Rules are data, so new ones can be
+loaded from a JSON file (``MOCK_PRECONDITION_RULES_FILE``) without code changes; a file
+rule with the name of a built-in rule replaces it, and ``"enabled": false`` removes it.
+
+``compile_rules`` turns the rule list into ``{task_type: (CompiledRule, ...)}`` once at
+startup: state lists become frozensets and each rule keeps its own hit / failure /
+latency counters. A rule may also reserve its entity while the task runs
+(``conflict_code``, see ``reservations.py``).
+
+States are matched exactly. Compound states (``"inuse,pulled_out"``) match if any
+comma-separated part does; each distinct state string is resolved once and cached on
+the rule.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Any, Literal
+
+from loguru import logger
+from pydantic import BaseModel, Field, TypeAdapter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from src.state.world_state import WorldSnapshot
+
+ErrorCode = Annotated[int, Field(ge=2000, le=2099)]
+_MAX_CACHED_STATES = 256
+
+
+class PreconditionRule(BaseModel):
+    """One declarative precondition on the entity a task operates on."""
+
+    name: str
+    task_type: str
+    entity_type: str
+    key_field: str  # params attribute holding the entity id (e.g. "device_id", "work_station")
+    lookup: Literal["id", "id_or_location"] = "id"  # id_or_location: fall back to an entity located at the key
+    allowed_states: list[str] | None = None  # if set, the entity's state must be one of these
+    forbidden_states: list[str] = Field(default_factory=list)
+    default_state: str = ""  # state assumed when the entity has no "state" field
+    state_code: ErrorCode
+    state_message: str = "{entity_type} {key} is in state '{state}'"
+    required: bool = False  # an untracked entity fails with missing_code
+    missing_code: ErrorCode | None = None
+    missing_message: str = "{entity_type} {key} not found in world state"
+    conflict_code: ErrorCode | None = None  # reserve the entity while the task runs; None = no reservation
+    enabled: bool = True
+
+
+PRECONDITION_RULES_ADAPTER: TypeAdapter[list[PreconditionRule]] = TypeAdapter(list[PreconditionRule])
+
+DEFAULT_RULES: tuple[PreconditionRule, ...] = (
+    PreconditionRule(
+        name="setup_cartridges.ext_module_free",
+        task_type="setup_tubes_to_column_machine",
+        entity_type="ccs_ext_module",
+        key_field="work_station",
+        forbidden_states=["using", "mounted", "inuse"],
+        state_code=2001,
+        state_message="External module {key} already has cartridges (state: {state})",
+        conflict_code=2002,
+    ),
+    PreconditionRule(
+        name="start_cc.machine_free",
+        task_type="start_column_chromatography",
+        entity_type="column_chromatography_machine",
+        key_field="device_id",
+        forbidden_states=["running", "using"],
+        state_code=2020,
+        state_message="Column chromatography machine {key} is already in use (state: {state})",
+        conflict_code=2021,
+    ),
+    PreconditionRule(
+        # Checked after the consumer cancelled the start_cc holding the machine, whose
+        # timeline marked it in use when it began
+        name="terminate_cc.machine_running",
+        task_type="terminate_column_chromatography",
+        entity_type="column_chromatography_machine",
+        key_field="device_id",
+        allowed_states=["running", "using"],
+        state_code=2031,
+        state_message="Column chromatography machine {key} is not in use (current state: {state})",
+        required=True,
+        missing_code=2030,
+        missing_message="Column chromatography machine {key} not found in world state",
+        conflict_code=2032,
+    ),
+    PreconditionRule(
+        # tube_rack entities are keyed by location_id, so fall back to the rack at the work station
+        name="collect_cc_fractions.tube_rack_in_use",
+        task_type="collect_column_chromatography_fractions",
+        entity_type="tube_rack",
+        key_field="work_station",
+        lookup="id_or_location",
+        allowed_states=["used", "using", "inuse", "contaminated"],
+        state_code=2041,
+        state_message="Tube rack at {key} must be in use (current: {state})",
+        required=True,
+        missing_code=2040,
+        missing_message="Tube rack at work station {key} not found in world state",
+        conflict_code=2042,
+    ),
+    PreconditionRule(
+        name="start_evaporation.evaporator_free",
+        task_type="start_evaporation",
+        entity_type="evaporator",
+        key_field="device_id",
+        forbidden_states=["using"],
+        default_state="idle",
+        state_code=2050,
+        state_message="Evaporator {key} is already in use",
+        conflict_code=2051,
+    ),
+)
+
+
+@dataclass
+class RuleStats:
+    """Counters for one compiled rule.
+
+    ``evaluations``, ``failures`` and the latencies count actual evaluations, i.e.
+    ``PreconditionCache`` misses. Checks the cache answered for the rule are counted
+    separately in ``cache_hits`` and ``cached_failures``; the sums are every check.
+    """
+
+    evaluations: int = 0
+    failures: int = 0
+    skipped: int = 0  # key field absent from params
+    cache_hits: int = 0  # checks of this rule answered by the precondition cache
+    cached_failures: int = 0  # cache hits that failed on this rule
+    time_total_ns: int = 0
+    time_max_ns: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "evaluations": self.evaluations,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "cache_hits": self.cache_hits,
+            "cached_failures": self.cached_failures,
+            "latency_avg_us": (self.time_total_ns / self.evaluations / 1000.0) if self.evaluations else 0.0,
+            "latency_max_us": self.time_max_ns / 1000.0,
+        }
+
+
+class CompiledRule:
+    """A ``PreconditionRule`` with precomputed state sets and counters."""
+
+    __slots__ = (
+        "_state_verdicts",
+        "allowed",
+        "conflict_code",
+        "default_state",
+        "entity_type",
+        "forbidden",
+        "key_field",
+        "missing_code",
+        "missing_message",
+        "name",
+        "required",
+        "state_code",
+        "state_message",
+        "stats",
+        "use_location",
+    )
+
+    def __init__(self, rule: PreconditionRule) -> None:
+        self.name = rule.name
+        self.entity_type = rule.entity_type
+        self.key_field = rule.key_field
+        self.use_location = rule.lookup == "id_or_location"
+        self.allowed = frozenset(rule.allowed_states) if rule.allowed_states is not None else None
+        self.forbidden = frozenset(rule.forbidden_states)
+        self.default_state = rule.default_state
+        self.state_code = rule.state_code
+        self.state_message = rule.state_message
+        self.required = rule.required
+        self.missing_code = rule.missing_code
+        self.missing_message = rule.missing_message
+        self.conflict_code = rule.conflict_code
+        self.stats = RuleStats()
+        self._state_verdicts: dict[str, bool] = {}  # state string -> passes
+
+    def key(self, params: BaseModel) -> str | None:
+        """The entity id this rule looks at, or None if the params lack the key field."""
+        return getattr(params, self.key_field, None)
+
+    def _state_ok(self, state: str) -> bool:
+        verdict = self._state_verdicts.get(state)
+        if verdict is None:
+            parts = {state, *(part.strip() for part in state.split(","))} if "," in state else {state}
+            verdict = (self.allowed is None or not self.allowed.isdisjoint(parts)) and self.forbidden.isdisjoint(parts)
+            if len(self._state_verdicts) < _MAX_CACHED_STATES:
+                self._state_verdicts[state] = verdict
+        return verdict
+
+    def evaluate(self, snapshot: WorldSnapshot, key: str) -> tuple[Mapping[str, Any] | None, tuple[int, str] | None]:
+        """Evaluate against ``snapshot``.
+
+        Returns:
+            ``(entity, failure)``: the entity the rule resolved (None if untracked) and
+            ``(error_code, message)`` on failure, else None
+        """
+        started = time.perf_counter_ns()
+        entity = self.resolve(snapshot, key)
+        failure = self._evaluate(entity, key)
+        elapsed = time.perf_counter_ns() - started
+        stats = self.stats
+        stats.evaluations += 1
+        stats.time_total_ns += elapsed
+        if elapsed > stats.time_max_ns:
+            stats.time_max_ns = elapsed
+        if failure is not None:
+            stats.failures += 1
+        return entity, failure
+
+    def resolve(self, snapshot: WorldSnapshot, key: str) -> Mapping[str, Any] | None:
+        """The entity this rule looks at in ``snapshot``, or None if untracked."""
+        entity = snapshot.get_entity(self.entity_type, key)
+        if entity is None and self.use_location:
+            found = snapshot.find_at_location(self.entity_type, key)
+            entity = found[1] if found is not None else None
+        return entity
+
+    def _evaluate(self, entity: Mapping[str, Any] | None, key: str) -> tuple[int, str] | None:
+        if entity is None:
+            if self.required and self.missing_code is not None:
+                return self.missing_code, self.missing_message.format(entity_type=self.entity_type, key=key)
+            return None
+        state = entity.get("state", self.default_state)
+        if self._state_ok(state):
+            return None
+        return self.state_code, self.state_message.format(entity_type=self.entity_type, key=key, state=state)
+
+
+def merge_rules(base: Iterable[PreconditionRule], overrides: Iterable[PreconditionRule]) -> list[PreconditionRule]:
+    """Rules from ``overrides`` replace same-named ``base`` rules; disabled rules are dropped."""
+    merged = {rule.name: rule for rule in base}
+    for rule in overrides:
+        merged[rule.name] = rule
+    return [rule for rule in merged.values() if rule.enabled]
+
+
+def compile_rules(rules: Iterable[PreconditionRule]) -> dict[str, tuple[CompiledRule, ...]]:
+    """Build the per-task dispatch table, keeping rule order within each task type."""
+    table: dict[str, list[CompiledRule]] = {}
+    for rule in rules:
+        if rule.enabled:
+            table.setdefault(rule.task_type, []).append(CompiledRule(rule))
+    return {task_type: tuple(compiled) for task_type, compiled in table.items()}
+
+
+def load_rules(path: str | Path | None) -> list[PreconditionRule]:
+    """Built-in rules merged with the rules in the JSON file at ``path`` (a list of rule objects).
+
+    Raises:
+        pydantic.ValidationError: If a rule in the file is invalid.
+    """
+    if path is None:
+        return list(DEFAULT_RULES)
+    extra = PRECONDITION_RULES_ADAPTER.validate_json(Path(path).read_bytes())
+    logger.info("Loaded {} precondition rules from {}", len(extra), path)
+    return merge_rules(DEFAULT_RULES, extra)
+
+
+def stats_by_rule(table: Mapping[str, tuple[CompiledRule, ...]]) -> dict[str, dict[str, Any]]:
+    """Per-rule counters keyed by rule name."""
+    return {rule.name: rule.stats.as_dict() for rules in table.values() for rule in rules}
@@ -0,0 +1,54 @@
+"""World-state fixture files — load a full lab layout in one validated batch.
+
+A fixture is a ``SeedStateParams`` JSON document (the same shape as the ``params`` of
+the ``seed_state`` control command)::
+
+    {
+      "replace": true,
+      "entities": [
+        {"type": "robot", "id": "{robot_id}", "properties": {"location": "ws_bic_09_fh_001", "state": "idle"}},
+        {"type": "silica_cartridge", "id": "sc-001", "properties": {"location": "ws_bic_09_fh_001", "state": "inuse"}}
+      ]
+    }
+
+``{robot_id}`` placeholders are substituted before validation, so one fixture can seed
+every robot of a fleet. Every entity is validated against its ``EntityUpdate`` schema
+before anything is applied; an invalid file raises and leaves the world untouched.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from src.schemas.commands import SeedStateParams
+
+if TYPE_CHECKING:
+    from src.state.world_state import WorldState
+
+
+def load_seed_file(path: str | Path, *, robot_id: str | None = None) -> SeedStateParams:
+    """Read and validate a fixture file.
+
+    Args:
+        path: Fixture JSON file
+        robot_id: Substituted for ``{robot_id}`` placeholders when given
+
+    Raises:
+        OSError: If the file cannot be read.
+        pydantic.ValidationError: If the document or any entity is invalid.
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    if robot_id is not None:
+        text = text.replace("{robot_id}", robot_id)
+    return SeedStateParams.model_validate_json(text)
+
+
+def seed_from_file(world_state: WorldState, path: str | Path, *, robot_id: str | None = None) -> int:
+    """Load a fixture file into ``world_state``; returns the number of entities seeded."""
+    seed = load_seed_file(path, robot_id=robot_id)
+    count = world_state.seed(seed.entities, replace=seed.replace)
+    logger.info("Seeded world state for {} from {} ({} entities)", robot_id or "robot", path, count)
+    return count
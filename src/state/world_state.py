@@ -2,49 +2,276 @@
 
 Maintains an in-memory snapshot of all tracked entities (robots, equipment, materials)
 based on entity updates from skill execution results. Thread-safe for concurrent access.
+
+State is published as immutable, versioned ``WorldSnapshot`` objects. Writers
+(``apply_updates``, ``seed``, ``reset``) serialize on a lock, build the next snapshot
+copy-on-write — only the buckets of entity types touched by the batch are copied —
+and swap it in with a single reference assignment. Readers never lock: they pick up
+whichever snapshot is current and see a consistent world for as long as they hold it.
+
+Entity properties are stored as compact immutable ``PropertyRecord`` mappings built
+directly from the update's properties model (see ``records.py``).
+
+Each snapshot indexes entities by type and entity ids by ``(entity_type, location)``,
+so lookups such as "which silica cartridge is mounted at this work station" are O(1)
+regardless of how many entities are tracked.
+
+Every applied batch is also published on ``WorldState.changes``, a ``ChangeFeed`` of
+field-level diffs that async subscribers consume instead of polling.
+
+An optional ``EntityHistory`` keeps a bounded, timestamped ring of past property
+versions per entity, tagged with the originating task.
+
+Resources claimed by in-flight tasks live in ``WorldState.reservations``; a task's
+claims are released in the same step that publishes its updates.
+
+With an optional ``WorldJournal`` the state survives restarts: it is restored from the
+journal on construction and every batch is appended to it before becoming visible.
 """
 
 from __future__ import annotations
 
-from threading import RLock
+from threading import Lock
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
+from src.state.changes import ChangeBatch, ChangeFeed, diff_entity
+from src.state.records import PropertyRecord
+from src.state.reservations import ReservationTable
+
 if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
     from src.schemas.results import EntityUpdate
+    from src.state.changes import EntityChange
+    from src.state.history import EntityHistory
+    from src.state.journal import EntityRecord, WorldJournal
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+class WorldSnapshot:
+    """Immutable view of the world at one version.
+
+    Property dicts handed out by a snapshot are shared with later snapshots and must
+    not be mutated by callers.
+    """
+
+    __slots__ = ("_by_location", "_by_type", "_size", "version")
+
+    def __init__(
+        self,
+        version: int,
+        by_type: dict[str, dict[str, PropertyRecord]],
+        by_location: dict[str, dict[str, tuple[str, ...]]],
+    ) -> None:
+        self.version = version
+        # entity_type -> entity_id -> properties
+        self._by_type = by_type
+        # entity_type -> location -> entity ids in tracking order
+        self._by_location = by_location
+        self._size = sum(len(bucket) for bucket in by_type.values())
+
+    @classmethod
+    def from_entities(cls, version: int, entities: Mapping[str, Mapping[str, Mapping[str, Any]]]) -> WorldSnapshot:
+        """Build a snapshot, including its location index, from entity properties grouped by type."""
+        by_type: dict[str, dict[str, PropertyRecord]] = {}
+        by_location: dict[str, dict[str, tuple[str, ...]]] = {}
+        for entity_type, entities_of_type in entities.items():
+            bucket: dict[str, PropertyRecord] = {}
+            locations: dict[str, tuple[str, ...]] = {}
+            for entity_id, properties in entities_of_type.items():
+                record = bucket[entity_id] = PropertyRecord.from_mapping(properties)
+                location = record.get("location")
+                if location is not None:
+                    locations[location] = (*locations.get(location, ()), entity_id)
+            by_type[entity_type] = bucket
+            by_location[entity_type] = locations
+        return cls(version, by_type, by_location)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get_entity(self, entity_type: str, entity_id: str) -> PropertyRecord | None:
+        """Properties of one entity, or None if not tracked."""
+        bucket = self._by_type.get(entity_type)
+        return bucket.get(entity_id) if bucket is not None else None
+
+    def has_entity(self, entity_type: str, entity_id: str) -> bool:
+        """Whether an entity is tracked."""
+        bucket = self._by_type.get(entity_type)
+        return bucket is not None and entity_id in bucket
+
+    def entity_types(self) -> tuple[str, ...]:
+        """Entity types with at least one tracked entity."""
+        return tuple(entity_type for entity_type, bucket in self._by_type.items() if bucket)
+
+    def entities_of_type(self, entity_type: str) -> Mapping[str, Mapping[str, Any]]:
+        """Read-only, non-copying mapping of entity_id -> properties for one type."""
+        bucket = self._by_type.get(entity_type)
+        return MappingProxyType(bucket) if bucket is not None else _EMPTY
+
+    def find_at_location(self, entity_type: str, location: str) -> tuple[str, Mapping[str, Any]] | None:
+        """First-tracked entity of a type at ``location`` as (entity_id, properties), or None."""
+        entity_ids = self._by_location.get(entity_type, {}).get(location)
+        if not entity_ids:
+            return None
+        return entity_ids[0], self._by_type[entity_type][entity_ids[0]]
+
+    def entity_ids_at_location(self, entity_type: str, location: str) -> tuple[str, ...]:
+        """All entity ids of a type at ``location``, in tracking order."""
+        return self._by_location.get(entity_type, {}).get(location, ())
 
 
 class WorldState:
     """Thread-safe in-memory state tracker for all entities in the robot's world.
 
-    Entities are keyed by (entity_type, entity_id) tuples. Each entity stores
-    its latest properties as a dictionary.
+    The current world is a versioned, immutable ``WorldSnapshot``: entities are keyed
+    by entity_type then entity_id, and each holds its latest properties as a read-only
+    ``PropertyRecord``. Writers build the next snapshot copy-on-write under a lock;
+    readers use whichever snapshot is current without locking.
     """
 
-    def __init__(self) -> None:
-        """Initialize empty world state."""
-        self._entities: dict[tuple[str, str], dict[str, Any]] = {}
-        self._lock = RLock()
+    def __init__(self, journal: WorldJournal | None = None, history: EntityHistory | None = None) -> None:
+        """Initialize world state, empty or restored from ``journal``.
 
-    def apply_updates(self, updates: list[EntityUpdate]) -> None:
+        Args:
+            journal: Optional durable journal; when given, state is recovered from it
+                and every subsequent batch is recorded in it.
+            history: Optional per-entity history; every applied batch (and telemetry
+                passed to ``observe``) is recorded in it.
+        """
+        self._journal = journal
+        self.history = history
+        if journal is not None:
+            version, by_type = journal.load()
+            self._snapshot = WorldSnapshot.from_entities(version, by_type)
+        else:
+            self._snapshot = WorldSnapshot(0, {}, {})
+        self._lock = Lock()  # serializes writers only
+        self.changes = ChangeFeed()
+        self.reservations = ReservationTable()
+
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot; bumped by every applied batch and reset."""
+        return self._snapshot.version
+
+    def snapshot(self) -> WorldSnapshot:
+        """Current immutable snapshot, for consistent multi-entity reads."""
+        return self._snapshot
+
+    def apply_updates(self, updates: list[EntityUpdate], *, task_id: str | None = None, release: bool = True) -> None:
         """Apply a batch of entity updates to the world state.
 
         Each update either creates a new entity or overwrites an existing one
-        with the latest properties.
+        with the latest properties. The whole batch becomes visible to readers
+        at once, as a single new version.
 
         Args:
             updates: List of entity updates from a RobotResult
+            task_id: Task that produced the updates, recorded in the entity history
+            release: Release ``task_id``'s reservations; False for updates a running task
+                publishes before it completes
+        """
+        if not updates:
+            return
+        with self._lock:
+            self._apply(updates, replace=False, log_each=True, task_id=task_id, release=release)
+
+    def seed(self, updates: list[EntityUpdate], *, replace: bool = True, task_id: str | None = None) -> int:
+        """Bulk-load a lab layout as a single new version.
+
+        Used by the startup fixture file and the ``seed_state`` control command to put
+        the world into any mid-workflow state without running the setup skills.
+
+        Args:
+            updates: Validated entity updates making up the layout
+            replace: Clear all tracked entities first; False merges into the current state
+            task_id: Seeding command, recorded in the entity history
+
+        Returns:
+            Number of entities seeded
         """
         with self._lock:
-            for update in updates:
-                entity_key = (update.type, update.id)
-                # Store properties as a dict for flexible access
-                properties_dict = update.properties.model_dump()
-                self._entities[entity_key] = properties_dict
-                logger.debug("World state updated: {} {} -> {}", update.type, update.id, properties_dict)
-
-    def get_entity(self, entity_type: str, entity_id: str) -> dict[str, Any] | None:
+            if replace or updates:
+                self._apply(updates, replace=replace, log_each=False, task_id=task_id)
+        logger.info("World state seeded with {} entities (replace={})", len(updates), replace)
+        return len(updates)
+
+    def _apply(
+        self, updates: list[EntityUpdate], *, replace: bool, log_each: bool, task_id: str | None, release: bool = True
+    ) -> None:
+        """Build, journal and publish the next snapshot; caller holds the writer lock."""
+        current = self._snapshot
+        by_type: dict[str, dict[str, PropertyRecord]] = {} if replace else dict(current._by_type)
+        by_location: dict[str, dict[str, tuple[str, ...]]] = {} if replace else dict(current._by_location)
+        copied: set[str] = set()
+        records: list[EntityRecord] = []
+        changes: list[EntityChange] | None = [] if self.changes.has_subscribers else None
+        for update in updates:
+            entity_type, entity_id = update.type, update.id
+            if entity_type not in copied:
+                by_type[entity_type] = dict(by_type.get(entity_type, {}))
+                by_location[entity_type] = dict(by_location.get(entity_type, {}))
+                copied.add(entity_type)
+            bucket = by_type[entity_type]
+            locations = by_location[entity_type]
+
+            # Read the properties model straight into an immutable record (no dump + copy)
+            properties = PropertyRecord.from_model(update.properties)
+            previous = bucket.get(entity_id)
+            old_location = previous.get("location") if previous is not None else None
+            new_location = properties.get("location")
+            if previous is None or old_location != new_location:
+                if old_location is not None:
+                    remaining = tuple(i for i in locations.get(old_location, ()) if i != entity_id)
+                    if remaining:
+                        locations[old_location] = remaining
+                    else:
+                        locations.pop(old_location, None)
+                if new_location is not None:
+                    locations[new_location] = (*locations.get(new_location, ()), entity_id)
+            bucket[entity_id] = properties
+            records.append((entity_type, entity_id, properties))
+            if changes is not None and (change := diff_entity(entity_type, entity_id, previous, properties)):
+                changes.append(change)
+            if log_each:
+                logger.debug("World state updated: {} {} -> {}", entity_type, entity_id, properties)
+
+        snapshot = WorldSnapshot(current.version + 1, by_type, by_location)
+        if self._journal is not None:
+            self._journal.append(snapshot.version, records, replace=replace)
+        self._snapshot = snapshot
+        if self.history is not None:
+            self.history.record(records, version=snapshot.version, task_id=task_id)
+        if task_id is not None and release:
+            # Hand the task's resources back only once its updates are visible
+            self.reservations.release(task_id)
+        if replace and changes is not None:
+            self.changes.publish(ChangeBatch(snapshot.version, tuple(changes), reset=True))
+        elif changes:
+            self.changes.publish(ChangeBatch(snapshot.version, tuple(changes)))
+        if self._journal is not None and self._journal.should_compact():
+            # Only the journal rotation happens under the lock; the snapshot is written off-thread
+            self._journal.start_compaction(snapshot)
+
+    def observe(self, updates: Sequence[EntityUpdate], *, task_id: str) -> None:
+        """Record in-progress telemetry (e.g. an evaporation ramp) in the entity history only.
+
+        The world itself is unchanged; a no-op unless history is enabled.
+        """
+        if self.history is None or not updates:
+            return
+        self.history.record(
+            [(update.type, update.id, PropertyRecord.from_model(update.properties)) for update in updates],
+            version=self._snapshot.version,
+            task_id=task_id,
+        )
+
+    def get_entity(self, entity_type: str, entity_id: str) -> PropertyRecord | None:
         """Retrieve an entity's current properties.
 
         Args:
@@ -52,10 +279,11 @@ class WorldState:
             entity_id: Entity ID
 
         Returns:
-            Dictionary of entity properties, or None if not tracked
+            Read-only mapping of entity properties, or None if not tracked. Nested
+            models are read-only mappings and lists are ``FrozenList`` tuples (equal
+            to lists with the same items); ``to_dict()`` returns plain dicts and lists.
         """
-        with self._lock:
-            return self._entities.get((entity_type, entity_id))
+        return self._snapshot.get_entity(entity_type, entity_id)
 
     def has_entity(self, entity_type: str, entity_id: str) -> bool:
         """Check if an entity is currently tracked.
@@ -67,8 +295,7 @@ class WorldState:
         Returns:
             True if entity exists in world state
         """
-        with self._lock:
-            return (entity_type, entity_id) in self._entities
+        return self._snapshot.has_entity(entity_type, entity_id)
 
     def get_entities_by_type(self, entity_type: str) -> dict[str, dict[str, Any]]:
         """Retrieve all entities of a given type.
@@ -77,14 +304,42 @@ class WorldState:
             entity_type: Entity type to filter by
 
         Returns:
-            Dictionary mapping entity_id -> properties for all matching entities
+            Dictionary mapping entity_id -> properties (plain dict copies) for all matching entities
         """
-        with self._lock:
-            return {
-                entity_id: props.copy() for (etype, entity_id), props in self._entities.items() if etype == entity_type
-            }
+        return {entity_id: props.to_dict() for entity_id, props in self._snapshot.entities_of_type(entity_type).items()}
+
+    def entities_of_type(self, entity_type: str) -> Mapping[str, Mapping[str, Any]]:
+        """Read-only, non-copying view of all entities of a given type.
+
+        The view belongs to the current snapshot and does not change when later
+        updates are applied. Callers must not mutate the property dicts it yields;
+        use ``get_entities_by_type`` for a private copy.
+
+        Args:
+            entity_type: Entity type to filter by
+
+        Returns:
+            Mapping of entity_id -> properties for all matching entities
+        """
+        return self._snapshot.entities_of_type(entity_type)
 
-    def get_robot_state(self, robot_id: str) -> dict[str, Any] | None:
+    def find_at_location(self, entity_type: str, location: str) -> tuple[str, Mapping[str, Any]] | None:
+        """Find the first-tracked entity of a type whose ``location`` matches, in O(1).
+
+        Args:
+            entity_type: Entity type (e.g., "silica_cartridge")
+            location: Location string (usually a work station id)
+
+        Returns:
+            (entity_id, properties) tuple without copying, or None if none is there
+        """
+        return self._snapshot.find_at_location(entity_type, location)
+
+    def entity_ids_at_location(self, entity_type: str, location: str) -> tuple[str, ...]:
+        """All entity ids of a type currently at ``location``, in tracking order."""
+        return self._snapshot.entity_ids_at_location(entity_type, location)
+
+    def get_robot_state(self, robot_id: str) -> PropertyRecord | None:
         """Convenience method to get robot entity state.
 
         Args:
@@ -98,5 +353,26 @@ class WorldState:
     def reset(self) -> None:
         """Clear all tracked entities back to empty state."""
         with self._lock:
-            self._entities.clear()
+            version = self._snapshot.version + 1
+            if self._journal is not None:
+                self._journal.append_reset(version)
+            self._snapshot = WorldSnapshot(version, {}, {})
+            if self.history is not None:
+                self.history.clear()
+            if self.changes.has_subscribers:
+                self.changes.publish(ChangeBatch(version, reset=True))
             logger.info("World state reset - all entities cleared")
+
+    def close(self) -> None:
+        """Write a final snapshot and close the journal, if persistence is enabled.
+
+        Blocks until the snapshot is on disk; async callers should run it in a thread.
+        """
+        if self._journal is None:
+            return
+        self._journal.wait()
+        with self._lock:
+            self._journal.start_compaction(self._snapshot)
+        self._journal.wait()
+        with self._lock:
+            self._journal.close()
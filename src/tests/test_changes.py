@@ -0,0 +1,167 @@
+"""Tests for the WorldState change feed."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from src.schemas.results import RobotUpdate, SilicaCartridgeUpdate
+from src.state.changes import ChangeFeed, diff_entity
+from src.state.world_state import WorldState
+
+
+def _robot(location: str, state: str = "idle") -> RobotUpdate:
+    return RobotUpdate(type="robot", id="robot-1", properties={"location": location, "state": state})
+
+
+def _cartridge(state: str) -> SilicaCartridgeUpdate:
+    return SilicaCartridgeUpdate(type="silica_cartridge", id="sc-1", properties={"location": "ws-1", "state": state})
+
+
+class TestDiffEntity:
+    """Field-level diffs."""
+
+    def test_created_entity_lists_all_fields(self) -> None:
+        change = diff_entity("robot", "r-1", None, {"state": "idle", "location": "ws-1"})
+        assert change is not None
+        assert change.created
+        assert change.fields == {"state": (None, "idle"), "location": (None, "ws-1")}
+
+    def test_only_changed_fields_are_reported(self) -> None:
+        change = diff_entity(
+            "robot", "r-1", {"state": "idle", "location": "ws-1"}, {"state": "idle", "location": "ws-2"}
+        )
+        assert change is not None
+        assert not change.created
+        assert change.fields == {"location": ("ws-1", "ws-2")}
+
+    def test_no_change_returns_none(self) -> None:
+        assert diff_entity("robot", "r-1", {"state": "idle"}, {"state": "idle"}) is None
+
+
+class TestChangeFeed:
+    """Delivery, filtering and overflow policies."""
+
+    @pytest.mark.asyncio
+    async def test_batches_carry_version_and_diffs(self) -> None:
+        ws = WorldState()
+        subscription = ws.changes.subscribe()
+
+        ws.apply_updates([_robot("ws-1"), _cartridge("unused")])
+        ws.apply_updates([_robot("ws-1")])  # no-op update publishes nothing
+        ws.apply_updates([_robot("ws-2", "working")])
+        ws.reset()
+
+        first = await subscription.get()
+        assert first.version == 1
+        assert [(c.entity_type, c.created) for c in first.changes] == [("robot", True), ("silica_cartridge", True)]
+        second = await subscription.get()
+        assert second.version == 3
+        assert second.changes[0].fields == {"location": ("ws-1", "ws-2"), "state": ("idle", "working")}
+        third = await subscription.get()
+        assert third.reset
+        assert third.version == 4
+        assert len(subscription) == 0
+
+    @pytest.mark.asyncio
+    async def test_entity_type_filter(self) -> None:
+        ws = WorldState()
+        subscription = ws.changes.subscribe(entity_types={"silica_cartridge"})
+
+        ws.apply_updates([_robot("ws-1")])
+        ws.apply_updates([_robot("ws-2"), _cartridge("inuse")])
+
+        batch = await subscription.get()
+        assert batch.version == 2
+        assert [c.entity_type for c in batch.changes] == ["silica_cartridge"]
+        assert len(subscription) == 0
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_keeps_latest_batches(self) -> None:
+        ws = WorldState()
+        subscription = ws.changes.subscribe(maxsize=2, overflow="drop_oldest")
+
+        for i in range(5):
+            ws.apply_updates([_robot(f"ws-{i}")])
+
+        assert subscription.dropped == 3
+        assert [(await subscription.get()).version for _ in range(2)] == [4, 5]
+        assert ws.changes.stats.dropped == 3
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_keeps_earliest_batches(self) -> None:
+        ws = WorldState()
+        subscription = ws.changes.subscribe(maxsize=2, overflow="drop_newest")
+
+        for i in range(5):
+            ws.apply_updates([_robot(f"ws-{i}")])
+
+        assert subscription.dropped == 3
+        assert [(await subscription.get()).version for _ in range(2)] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_disconnect_closes_slow_subscriber(self) -> None:
+        ws = WorldState()
+        subscription = ws.changes.subscribe(maxsize=1, overflow="disconnect")
+
+        ws.apply_updates([_robot("ws-1")])
+        ws.apply_updates([_robot("ws-2")])
+
+        assert subscription.closed
+        assert not ws.changes.has_subscribers
+        assert [batch.version async for batch in subscription] == [1]
+        assert ws.changes.stats.disconnected == 1
+
+    @pytest.mark.asyncio
+    async def test_waiting_subscriber_is_woken(self) -> None:
+        ws = WorldState()
+        subscription = ws.changes.subscribe()
+        waiter = asyncio.create_task(subscription.get())
+        await asyncio.sleep(0)
+
+        ws.apply_updates([_robot("ws-1")])
+
+        batch = await asyncio.wait_for(waiter, timeout=1.0)
+        assert batch.version == 1
+
+    @pytest.mark.asyncio
+    async def test_publish_from_another_thread(self) -> None:
+        ws = WorldState()
+        subscription = ws.changes.subscribe()
+
+        thread = threading.Thread(target=lambda: [ws.apply_updates([_robot(f"ws-{i}")]) for i in range(10)])
+        thread.start()
+        await asyncio.to_thread(thread.join)
+
+        versions = [(await asyncio.wait_for(subscription.get(), timeout=1.0)).version for _ in range(10)]
+        assert versions == list(range(1, 11))
+
+    @pytest.mark.asyncio
+    async def test_seed_publishes_reset_batch_with_layout(self) -> None:
+        ws = WorldState()
+        ws.apply_updates([_robot("ws-1")])
+        subscription = ws.changes.subscribe(entity_types={"robot"})
+
+        ws.seed([_cartridge("inuse")])
+
+        batch = await subscription.get()
+        assert batch.reset
+        assert batch.version == 2
+        assert [(c.entity_type, c.created) for c in batch.changes] == [("silica_cartridge", True)]
+
+    @pytest.mark.asyncio
+    async def test_no_diffs_without_subscribers(self) -> None:
+        ws = WorldState()
+        ws.apply_updates([_robot("ws-1")])
+        assert ws.changes.stats.published == 0
+
+    def test_rejects_invalid_subscription_options(self) -> None:
+        async def subscribe(**kwargs) -> None:
+            ChangeFeed().subscribe(**kwargs)
+
+        with pytest.raises(ValueError, match="maxsize"):
+            asyncio.run(subscribe(maxsize=0))
+        with pytest.raises(ValueError, match="overflow policy"):
+            asyncio.run(subscribe(overflow="block"))
@@ -0,0 +1,175 @@
+"""Tests for the real / scaled / virtual simulation clocks."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.clock import RealClock, ScaledClock, VirtualClock, make_clock
+from src.mq.log_producer import LogProducer
+from src.schemas.commands import CCExperimentParams, StartCCParams, TaskType
+from src.simulators.cc_simulator import CCSimulator
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+class TestVirtualClock:
+    """Discrete-event time: long sleeps complete instantly, in deadline order."""
+
+    @pytest.mark.asyncio
+    async def test_long_sleep_completes_instantly(self) -> None:
+        clock = VirtualClock(start=START)
+        started = time.monotonic()
+
+        await asyncio.wait_for(clock.sleep(1800), timeout=1.0)
+
+        assert time.monotonic() - started < 0.5
+        assert clock.monotonic() == 1800
+        assert clock.now() == START + timedelta(minutes=30)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sleepers_wake_in_deadline_order(self) -> None:
+        clock = VirtualClock(start=START)
+        woke: list[tuple[str, float]] = []
+
+        async def sleeper(name: str, seconds: float) -> None:
+            await clock.sleep(seconds)
+            woke.append((name, clock.monotonic()))
+
+        await asyncio.wait_for(
+            asyncio.gather(sleeper("slow", 300), sleeper("fast", 10), sleeper("mid", 60)),
+            timeout=1.0,
+        )
+
+        assert woke == [("fast", 10), ("mid", 60), ("slow", 300)]
+        assert clock.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_background_sleepers_do_not_drive_time(self) -> None:
+        clock = VirtualClock(start=START)
+        heartbeat = asyncio.create_task(clock.sleep(3600, background=True))
+        await asyncio.sleep(0.05)
+
+        assert not heartbeat.done()
+        assert clock.monotonic() < 1.0
+
+        heartbeat.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await heartbeat
+
+    @pytest.mark.asyncio
+    async def test_background_sleeper_rides_along_with_foreground_time(self) -> None:
+        clock = VirtualClock(start=START)
+        heartbeat = asyncio.create_task(clock.sleep(5, background=True))
+
+        await asyncio.wait_for(clock.sleep(60), timeout=1.0)
+
+        assert heartbeat.done()
+
+    @pytest.mark.asyncio
+    async def test_busy_section_holds_time_until_io_completes(self) -> None:
+        clock = VirtualClock(start=START)
+        events: list[tuple[str, float]] = []
+
+        async def publisher() -> None:
+            await clock.sleep(10)
+            with clock.busy():
+                await asyncio.sleep(0.05)  # a broker round-trip takes real time
+            events.append(("published", clock.monotonic()))
+
+        async def other() -> None:
+            await clock.sleep(20)
+            events.append(("other", clock.monotonic()))
+
+        await asyncio.wait_for(asyncio.gather(publisher(), other()), timeout=1.0)
+
+        assert events == [("published", 10), ("other", 20)]
+
+    @pytest.mark.asyncio
+    async def test_log_confirm_wait_does_not_let_time_jump(self, mock_settings) -> None:
+        clock = VirtualClock(start=START)
+        connection = MagicMock()
+        connection.get_exchange = AsyncMock()
+        pipeline = connection.get_pipeline.return_value
+
+        async def publish(*_args) -> asyncio.Future:
+            confirm = asyncio.get_running_loop().create_future()
+            asyncio.get_running_loop().call_later(0.05, confirm.set_result, None)
+            return confirm
+
+        pipeline.publish = publish
+        producer = LogProducer(connection, mock_settings, clock=clock)
+        await producer.initialize()
+        confirmed_at: list[float] = []
+
+        async def final_log() -> None:
+            await clock.sleep(10)
+            await producer.publish_log("task-1", [], "task_completed", wait_for_confirm=True)
+            confirmed_at.append(clock.monotonic())
+
+        await asyncio.wait_for(asyncio.gather(final_log(), clock.sleep(600)), timeout=1.0)
+
+        assert confirmed_at == [10]
+        assert clock.monotonic() == 600
+
+
+class TestScaledClock:
+    """Scaled time runs faster than wall time."""
+
+    @pytest.mark.asyncio
+    async def test_sleep_is_shortened_and_time_scaled(self) -> None:
+        clock = ScaledClock(100.0, start=START)
+        started = time.monotonic()
+
+        await clock.sleep(5.0)
+
+        assert time.monotonic() - started < 0.5
+        assert clock.monotonic() >= 5.0
+        assert clock.now() >= START + timedelta(seconds=5)
+
+    def test_rejects_non_positive_scale(self) -> None:
+        with pytest.raises(ValueError, match="must be > 0"):
+            ScaledClock(0)
+
+
+class TestMakeClock:
+    """Clock selection from settings."""
+
+    @pytest.mark.parametrize(
+        ("mode", "expected"),
+        [("real", RealClock), ("scaled", ScaledClock), ("virtual", VirtualClock)],
+    )
+    def test_mode_selects_clock(self, mock_settings, mode, expected) -> None:
+        settings = mock_settings.model_copy(update={"clock_mode": mode, "clock_scale": 10.0})
+        assert isinstance(make_clock(settings), expected)
+
+
+class TestSimulatorOnVirtualClock:
+    """A full-length CC run finishes immediately with virtual timestamps."""
+
+    @pytest.mark.asyncio
+    async def test_start_cc_runs_at_real_multiplier_instantly(self, mock_settings) -> None:
+        settings = mock_settings.model_copy(update={"base_delay_multiplier": 1.0})
+        clock = VirtualClock(start=START)
+        log_producer = AsyncMock()
+        simulator = CCSimulator(AsyncMock(), settings, log_producer=log_producer, clock=clock)
+        params = StartCCParams(
+            work_station="ws_bic_09_fh_001",
+            device_id="cc-001",
+            device_type="cc-isco-300p",
+            experiment_params=CCExperimentParams(
+                silicone_cartridge="silica_40g", peak_gathering_mode="peak", run_minutes=30
+            ),
+        )
+        started = time.monotonic()
+
+        result = await asyncio.wait_for(simulator.simulate("task-cc", TaskType.START_CC, params), timeout=5.0)
+
+        assert result.code == 200
+        assert time.monotonic() - started < 5.0
+        assert clock.monotonic() >= 30 * 60
+        assert log_producer.publish_log.await_count > 2
@@ -0,0 +1,150 @@
+"""Tests for the MQConnection channel pool (no real RabbitMQ needed)."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import aio_pika
+import pytest
+
+from src.mq.connection import CONSUMER_CHANNEL, LOG_CHANNEL, RESULT_CHANNEL, MQConnection, channel_name
+from src.mq.consumer import CommandConsumer
+from src.scenarios.manager import ScenarioManager
+
+
+def _mock_channel() -> AsyncMock:
+    channel = AsyncMock()
+    channel.is_closed = False
+    channel.declare_exchange = AsyncMock(side_effect=lambda *_, **__: Mock())
+    channel.close_callbacks = Mock()
+    return channel
+
+
+@pytest.fixture
+def pooled_connection(mock_settings) -> MQConnection:
+    """MQConnection backed by a mock AMQP connection that opens a fresh mock channel per call."""
+    amqp_connection = Mock(is_closed=False)
+    amqp_connection.channel = AsyncMock(side_effect=lambda: _mock_channel())
+    amqp_connection.close = AsyncMock()
+    connection = MQConnection(mock_settings)
+    connection._connection = amqp_connection
+    return connection
+
+
+class TestChannelName:
+    """Tests for role/robot → channel name mapping."""
+
+    def test_unsharded_uses_role(self) -> None:
+        assert channel_name(LOG_CHANNEL, "talos.001") == "log"
+
+    def test_sharding_is_stable_and_bounded(self) -> None:
+        names = {channel_name(LOG_CHANNEL, f"talos.{n:03d}", shards=4) for n in range(100)}
+        assert names == {"log.0", "log.1", "log.2", "log.3"}
+        assert channel_name(LOG_CHANNEL, "talos.007", 4) == channel_name(LOG_CHANNEL, "talos.007", 4)
+
+
+class TestChannelPool:
+    """Tests for MQConnection.get_channel / get_exchange / channel_health."""
+
+    @pytest.mark.asyncio
+    async def test_requires_connect(self, mock_settings) -> None:
+        with pytest.raises(RuntimeError, match="connection not established"):
+            await MQConnection(mock_settings).get_channel(RESULT_CHANNEL)
+
+    @pytest.mark.asyncio
+    async def test_roles_get_dedicated_channels(self, pooled_connection) -> None:
+        consumer = await pooled_connection.get_channel(CONSUMER_CHANNEL)
+        result = await pooled_connection.get_channel(RESULT_CHANNEL)
+        log = await pooled_connection.get_channel(LOG_CHANNEL)
+
+        assert len({id(consumer), id(result), id(log)}) == 3
+        assert await pooled_connection.get_channel(RESULT_CHANNEL) is result
+
+    @pytest.mark.asyncio
+    async def test_only_consumer_channels_get_prefetch(self, pooled_connection, mock_settings) -> None:
+        consumer = await pooled_connection.get_channel(CONSUMER_CHANNEL)
+        result = await pooled_connection.get_channel(RESULT_CHANNEL)
+
+        consumer.set_qos.assert_awaited_once_with(prefetch_count=mock_settings.mq_prefetch_count)
+        result.set_qos.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_closed_channel_is_reopened_and_exchange_redeclared(self, pooled_connection) -> None:
+        first_exchange = await pooled_connection.get_exchange(LOG_CHANNEL)
+        assert await pooled_connection.get_exchange(LOG_CHANNEL) is first_exchange
+
+        closed = await pooled_connection.get_channel(LOG_CHANNEL)
+        closed.is_closed = True
+
+        second_exchange = await pooled_connection.get_exchange(LOG_CHANNEL)
+        reopened = await pooled_connection.get_channel(LOG_CHANNEL)
+        assert second_exchange is not first_exchange
+        # Closed for good so a robust channel cannot restore itself next to the replacement
+        closed.close.assert_awaited_once()
+        reopened.declare_exchange.assert_awaited_once_with(
+            "test_exchange",
+            type=aio_pika.ExchangeType.TOPIC,
+            durable=True,
+        )
+        assert pooled_connection.channel_health()[LOG_CHANNEL] == {
+            "open": True,
+            "prefetch_count": None,
+            "reopens": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_each_publisher_channel_has_its_own_pipeline(self, pooled_connection) -> None:
+        await pooled_connection.get_channel(RESULT_CHANNEL)
+        result_pipeline = pooled_connection.get_pipeline(RESULT_CHANNEL)
+
+        assert pooled_connection.get_pipeline(RESULT_CHANNEL) is result_pipeline
+        assert pooled_connection.get_pipeline(LOG_CHANNEL) is not result_pipeline
+        assert "publisher" in pooled_connection.channel_health()[RESULT_CHANNEL]
+
+    @pytest.mark.asyncio
+    async def test_disconnect_closes_every_channel(self, pooled_connection) -> None:
+        channels = [await pooled_connection.get_channel(name) for name in (CONSUMER_CHANNEL, RESULT_CHANNEL)]
+        amqp_connection = pooled_connection._connection
+
+        await pooled_connection.disconnect()
+
+        for channel in channels:
+            channel.close.assert_awaited_once()
+        amqp_connection.close.assert_awaited_once()
+        assert pooled_connection.channel_health() == {}
+
+
+class TestConsumerResubscribe:
+    """The consumer re-declares and re-consumes its queue when its channel closes."""
+
+    @pytest.mark.asyncio
+    async def test_consumer_channel_close_resubscribes(self, pooled_connection, mock_settings) -> None:
+        consumer = CommandConsumer(pooled_connection, AsyncMock(), ScenarioManager(mock_settings), mock_settings)
+        await consumer.initialize()
+        await consumer.start_consuming()
+        first = await pooled_connection.get_channel(CONSUMER_CHANNEL, prefetch_count=mock_settings.mq_prefetch_count)
+        on_closed = first.close_callbacks.add.call_args.args[0]
+
+        first.is_closed = True
+        on_closed(first, RuntimeError("channel error"))
+        on_closed(first, RuntimeError("channel error"))  # a second callback does not start a second resubscribe
+        await asyncio.wait_for(consumer._resubscribe_task, timeout=1.0)
+
+        second = await pooled_connection.get_channel(CONSUMER_CHANNEL, prefetch_count=mock_settings.mq_prefetch_count)
+        assert second is not first
+        second.set_qos.assert_awaited_once_with(prefetch_count=mock_settings.mq_prefetch_count)
+        second.declare_queue.assert_awaited_once_with(f"{mock_settings.robot_id}.cmd", durable=True)
+        second.declare_queue.return_value.consume.assert_awaited_once_with(consumer._process_message)
+
+    @pytest.mark.asyncio
+    async def test_channel_closed_by_stop_does_not_resubscribe(self, pooled_connection, mock_settings) -> None:
+        consumer = CommandConsumer(pooled_connection, AsyncMock(), ScenarioManager(mock_settings), mock_settings)
+        await consumer.initialize()
+        await consumer.start_consuming()
+        channel = await pooled_connection.get_channel(CONSUMER_CHANNEL, prefetch_count=mock_settings.mq_prefetch_count)
+
+        await consumer.stop()
+        channel.close_callbacks.add.call_args.args[0](channel, None)
+
+        assert consumer._resubscribe_task is None
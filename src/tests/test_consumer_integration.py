@@ -120,6 +120,7 @@ class TestConsumerIntegration:
 
         # Process the message
         await consumer._process_message(msg)
+        await consumer.join()
 
         # Verify result was published
         mock_producer.publish_result.assert_called_once()
@@ -144,6 +145,7 @@ class TestConsumerIntegration:
         }
         msg1 = make_mock_message("task-001", "setup_tubes_to_column_machine", params1)
         await consumer._process_message(msg1)
+        await consumer.join()
 
         # Verify world state has ext_module
         ext_module = world_state.get_entity("ccs_ext_module", "ws_bic_09_fh_001")
@@ -156,6 +158,7 @@ class TestConsumerIntegration:
         }
         msg2 = make_mock_message("task-002", "setup_tube_rack", params2)
         await consumer._process_message(msg2)
+        await consumer.join()
 
         # Verify world state has tube_rack (keyed by "tube_rack_001")
         tube_rack = world_state.get_entity("tube_rack", "tube_rack_001")
@@ -188,6 +191,7 @@ class TestConsumerIntegration:
         }
         msg = make_mock_message("task-001", "terminate_column_chromatography", params)
         await consumer._process_message(msg)
+        await consumer.join()
 
         # Verify precondition failure
         result = mock_producer.publish_result.call_args[0][0]
@@ -207,6 +211,7 @@ class TestConsumerIntegration:
         }
         msg1 = make_mock_message("task-002", "setup_tubes_to_column_machine", params1)
         await consumer._process_message(msg1)
+        await consumer.join()
 
         # First should succeed
         result1 = mock_producer.publish_result.call_args[0][0]
@@ -217,6 +222,7 @@ class TestConsumerIntegration:
         # Second should fail with precondition error
         msg2 = make_mock_message("task-003", "setup_tubes_to_column_machine", params1)
         await consumer._process_message(msg2)
+        await consumer.join()
 
         result2 = mock_producer.publish_result.call_args[0][0]
         assert result2.task_id == "task-003"
@@ -256,6 +262,7 @@ class TestConsumerIntegration:
         }
         msg = make_mock_message("task-001", "setup_tube_rack", params)
         await consumer._process_message(msg)
+        await consumer.join()
 
         # Verify failure result published
         mock_producer.publish_result.assert_called_once()
@@ -297,6 +304,7 @@ class TestConsumerIntegration:
         }
         msg = make_mock_message("task-001", "setup_tube_rack", params)
         await consumer._process_message(msg)
+        await consumer.join()
 
         # Verify NO result was published (timeout simulation)
         mock_producer.publish_result.assert_not_called()
@@ -316,6 +324,7 @@ class TestConsumerIntegration:
         }
         msg1 = make_mock_message("task-001", "setup_tubes_to_column_machine", params1)
         await consumer._process_message(msg1)
+        await consumer.join()
 
         # Verify world state has entities
         ext_module = world_state.get_entity("ccs_ext_module", "ws_bic_09_fh_001")
@@ -328,6 +337,27 @@ class TestConsumerIntegration:
         ext_module = world_state.get_entity("ccs_ext_module", "ws_bic_09_fh_001")
         assert ext_module is None
 
+    @pytest.mark.asyncio
+    async def test_concurrent_start_cc_on_same_device_is_rejected(self, consumer_with_simulators):
+        """Test two in-flight start_cc commands cannot both claim one CC machine."""
+        consumer, mock_producer, world_state = consumer_with_simulators
+
+        params = {
+            "work_station": "ws_bic_09_fh_001",
+            "device_id": "cc-001",
+            "device_type": "cc-isco-300p",
+            "experiment_params": {"silicone_cartridge": "silica_40g", "run_minutes": 1},
+        }
+        await consumer._process_message(make_mock_message("task-cc-1", "start_column_chromatography", params))
+        await consumer._process_message(make_mock_message("task-cc-2", "start_column_chromatography", params))
+        await consumer.join()
+
+        results = {call.args[0].task_id: call.args[0] for call in mock_producer.publish_result.call_args_list}
+        assert results["task-cc-1"].code == 200
+        assert results["task-cc-2"].code == 2021
+        assert world_state.get_entity("column_chromatography_machine", "cc-001")["state"] == "using"
+        assert len(world_state.reservations) == 0
+
     @pytest.mark.asyncio
     async def test_unknown_task_handling(self, consumer_with_simulators):
         """Test unregistered task returns error result (code 1000)."""
@@ -346,6 +376,7 @@ class TestConsumerIntegration:
         }
         msg = make_mock_message("task-001", "take_photo", params)
         await consumer._process_message(msg)
+        await consumer.join()
 
         # Verify error result
         mock_producer.publish_result.assert_called_once()
@@ -366,6 +397,7 @@ class TestConsumerIntegration:
         }
         msg = make_mock_message("task-001", "setup_tubes_to_column_machine", params)
         await consumer._process_message(msg)
+        await consumer.join()
 
         # Verify validation error
         mock_producer.publish_result.assert_called_once()
@@ -0,0 +1,227 @@
+"""Tests for the bounded task dispatcher, the consumer's early-ack flow and shutdown drain."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.mq.consumer import CommandConsumer
+from src.mq.dispatcher import TaskDispatcher
+from src.scenarios.manager import ScenarioManager
+from src.schemas.commands import TaskType
+from src.schemas.results import RobotResult
+
+
+class _Gate:
+    """Job factory whose jobs block until released, recording start order."""
+
+    def __init__(self) -> None:
+        self.started: list[str] = []
+        self.release = asyncio.Event()
+
+    def job(self, name: str):
+        async def run() -> None:
+            self.started.append(name)
+            await self.release.wait()
+
+        return run
+
+
+class TestTaskDispatcher:
+    """Tests for admission bound, per-type limits and metrics."""
+
+    @pytest.mark.asyncio
+    async def test_admission_is_bounded(self) -> None:
+        gate = _Gate()
+        dispatcher = TaskDispatcher(max_in_flight=2)
+
+        await dispatcher.submit("t1", TaskType.TAKE_PHOTO, gate.job("t1"))
+        await dispatcher.submit("t2", TaskType.TAKE_PHOTO, gate.job("t2"))
+        third = asyncio.create_task(dispatcher.submit("t3", TaskType.TAKE_PHOTO, gate.job("t3")))
+        await asyncio.sleep(0.01)
+
+        assert dispatcher.in_flight == 2
+        assert not third.done()
+
+        gate.release.set()
+        await asyncio.wait_for(third, timeout=1.0)
+        await dispatcher.join()
+        assert dispatcher.in_flight == 0
+        assert dispatcher.stats.completed == 3
+
+    @pytest.mark.asyncio
+    async def test_per_type_limit_queues_without_blocking_other_types(self) -> None:
+        gate = _Gate()
+        dispatcher = TaskDispatcher(max_in_flight=10, limits={TaskType.START_CC: 1})
+
+        await dispatcher.submit("cc-1", TaskType.START_CC, gate.job("cc-1"))
+        await dispatcher.submit("cc-2", TaskType.START_CC, gate.job("cc-2"))
+        await dispatcher.submit("photo", TaskType.TAKE_PHOTO, gate.job("photo"))
+        await asyncio.sleep(0.01)
+
+        assert gate.started == ["cc-1", "photo"]
+        assert dispatcher.queue_depth == 1
+        assert dispatcher.queue_depths() == {"start_column_chromatography": 1}
+
+        gate.release.set()
+        await dispatcher.join()
+        stats = dispatcher.stats.as_dict()
+        assert gate.started == ["cc-1", "photo", "cc-2"]
+        assert stats["queue_depth_max"] == 3  # all three admitted before any started
+        assert stats["wait_time_max_ms"] > 0
+        assert stats["started_by_type"] == {"start_column_chromatography": 2, "take_photo": 1}
+
+    @pytest.mark.asyncio
+    async def test_join_single_task(self) -> None:
+        gate = _Gate()
+        dispatcher = TaskDispatcher(max_in_flight=4)
+
+        async def quick() -> None:
+            return None
+
+        await dispatcher.submit("slow", TaskType.START_CC, gate.job("slow"))
+        await dispatcher.submit("quick", TaskType.TAKE_PHOTO, quick)
+
+        await asyncio.wait_for(dispatcher.join("quick"), timeout=1.0)
+        assert dispatcher.in_flight == 1
+
+        gate.release.set()
+        await dispatcher.join()
+
+    @pytest.mark.asyncio
+    async def test_crashing_job_is_counted(self) -> None:
+        dispatcher = TaskDispatcher(max_in_flight=1)
+
+        async def boom() -> None:
+            raise RuntimeError("boom")
+
+        await dispatcher.submit("t1", TaskType.TAKE_PHOTO, boom)
+        await dispatcher.join()
+
+        assert dispatcher.stats.failed == 1
+        assert dispatcher.in_flight == 0
+
+    def test_rejects_invalid_limits(self) -> None:
+        with pytest.raises(ValueError, match="must be >= 1"):
+            TaskDispatcher(max_in_flight=0)
+        with pytest.raises(ValueError, match="must be >= 1"):
+            TaskDispatcher(max_in_flight=1, limits={TaskType.START_CC: 0})
+
+
+class _SlowSimulator:
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+
+    async def simulate(self, task_id, task_type, params) -> RobotResult:
+        await self.release.wait()
+        return RobotResult(code=200, msg="success", task_id=task_id)
+
+
+def _make_message(task_id: str) -> AsyncMock:
+    message = AsyncMock()
+    message.body = json.dumps(
+        {
+            "task_id": task_id,
+            "task_type": "take_photo",
+            "params": {"work_station": "ws-1", "device_id": "d-1", "device_type": "isco", "components": "screen"},
+        }
+    ).encode()
+    message.process = MagicMock(return_value=AsyncMock())
+    return message
+
+
+class TestConsumerEarlyAck:
+    """The consumer releases the delivery before the simulation finishes."""
+
+    @pytest.mark.asyncio
+    async def test_message_processed_before_simulation_completes(self, mock_settings) -> None:
+        producer = AsyncMock()
+        consumer = CommandConsumer(AsyncMock(), producer, ScenarioManager(mock_settings), mock_settings)
+        simulator = _SlowSimulator()
+        consumer.register_simulator(TaskType.TAKE_PHOTO, simulator)
+        message = _make_message("task-1")
+
+        await asyncio.wait_for(consumer._process_message(message), timeout=1.0)
+
+        message.process.return_value.__aexit__.assert_awaited_once()
+        assert consumer.dispatcher.in_flight == 1
+        producer.publish_result.assert_not_called()
+
+        simulator.release.set()
+        await consumer.join()
+        producer.publish_result.assert_awaited_once()
+        assert consumer.dispatcher.in_flight == 0
+
+    def test_concurrency_limits_come_from_settings(self, mock_settings) -> None:
+        settings = mock_settings.model_copy(
+            update={"mq_max_in_flight_tasks": 7, "task_concurrency_limits": {"start_column_chromatography": 1}}
+        )
+        consumer = CommandConsumer(AsyncMock(), AsyncMock(), ScenarioManager(settings), settings)
+
+        assert consumer.dispatcher._slots._value == 7
+        assert set(consumer.dispatcher._limits) == {TaskType.START_CC}
+
+
+class TestGracefulDrain:
+    """Shutdown drains in-flight tasks within a deadline and reports the rest."""
+
+    @pytest.mark.asyncio
+    async def test_drain_finishes_quick_jobs_and_cancels_slow_ones(self) -> None:
+        gate = _Gate()
+        dispatcher = TaskDispatcher(max_in_flight=4)
+
+        async def quick() -> None:
+            await asyncio.sleep(0.01)
+
+        await dispatcher.submit("quick", TaskType.TAKE_PHOTO, quick)
+        await dispatcher.submit("slow", TaskType.START_CC, gate.job("slow"))
+
+        abandoned = await dispatcher.drain(timeout=0.1)
+
+        assert abandoned == [("slow", TaskType.START_CC)]
+        assert dispatcher.in_flight == 0
+        assert dispatcher.stats.completed == 1
+        assert dispatcher.stats.abandoned == 1
+
+    @pytest.mark.asyncio
+    async def test_no_admission_while_draining(self) -> None:
+        dispatcher = TaskDispatcher(max_in_flight=1)
+        await dispatcher.drain(timeout=0)
+
+        async def job() -> None:
+            return None
+
+        assert dispatcher.closing
+        assert await dispatcher.submit("late", TaskType.TAKE_PHOTO, job) is None
+        assert dispatcher.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_consumer_publishes_abandoned_result(self, mock_settings) -> None:
+        producer = AsyncMock()
+        consumer = CommandConsumer(AsyncMock(), producer, ScenarioManager(mock_settings), mock_settings)
+        consumer.register_simulator(TaskType.TAKE_PHOTO, _SlowSimulator())
+        await consumer._process_message(_make_message("task-long"))
+        await asyncio.sleep(0)
+
+        assert await consumer.drain(timeout=0.05) == 1
+
+        result = producer.publish_result.call_args[0][0]
+        assert result.code == 1003
+        assert result.task_id == "task-long"
+        assert "abandoned" in result.msg.lower()
+
+    @pytest.mark.asyncio
+    async def test_consumer_requeues_commands_arriving_during_shutdown(self, mock_settings) -> None:
+        producer = AsyncMock()
+        consumer = CommandConsumer(AsyncMock(), producer, ScenarioManager(mock_settings), mock_settings)
+        consumer.register_simulator(TaskType.TAKE_PHOTO, _SlowSimulator())
+        await consumer.drain(timeout=0)
+        message = _make_message("task-late")
+
+        await consumer._process_message(message)
+
+        message.nack.assert_awaited_once_with(requeue=True)
+        producer.publish_result.assert_not_called()
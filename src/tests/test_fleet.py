@@ -0,0 +1,128 @@
+"""Tests for fleet mode: robot id generation and per-robot runtimes on a shared connection."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.config import MockSettings
+from src.fleet import Fleet
+
+
+def _make_connection() -> AsyncMock:
+    """Mock MQConnection whose channel hands out mock exchanges and queues."""
+    channel = AsyncMock()
+    channel.declare_queue = AsyncMock(side_effect=lambda name, **_: AsyncMock(name=name))
+    channel.close_callbacks = Mock()
+    connection = AsyncMock()
+    connection.get_channel = AsyncMock(return_value=channel)
+    connection.get_exchange = AsyncMock(return_value=AsyncMock())
+    connection.get_pipeline = Mock()
+    return connection
+
+
+class TestFleetRobotIds:
+    """Tests for MockSettings.fleet_robot_ids()."""
+
+    def test_single_robot_by_default(self) -> None:
+        settings = MockSettings(robot_id="talos.001")
+        assert settings.fleet_robot_ids() == ["talos.001"]
+
+    def test_increments_numeric_suffix_keeping_padding(self) -> None:
+        settings = MockSettings(robot_id="talos.001", fleet_size=200)
+        ids = settings.fleet_robot_ids()
+        assert len(ids) == 200
+        assert ids[0] == "talos.001"
+        assert ids[9] == "talos.010"
+        assert ids[-1] == "talos.200"
+
+    def test_appends_suffix_when_robot_id_has_no_number(self) -> None:
+        settings = MockSettings(robot_id="talos", fleet_size=3)
+        assert settings.fleet_robot_ids() == ["talos.001", "talos.002", "talos.003"]
+
+    def test_for_robot_only_changes_robot_id(self, mock_settings) -> None:
+        bound = mock_settings.for_robot("talos.042")
+        assert bound.robot_id == "talos.042"
+        assert bound.mq_exchange == mock_settings.mq_exchange
+        assert mock_settings.robot_id == "test-robot-001"
+
+
+class TestFleet:
+    """Tests for Fleet construction and lifecycle."""
+
+    def test_runtimes_have_independent_state(self, mock_settings) -> None:
+        settings = mock_settings.model_copy(update={"robot_id": "talos.001", "fleet_size": 3})
+        fleet = Fleet(_make_connection(), settings)
+
+        assert len(fleet) == 3
+        first, second = fleet.get("talos.001"), fleet.get("talos.002")
+        assert first is not None and second is not None
+        assert first.world_state is not second.world_state
+        assert first.settings.robot_id == "talos.001"
+        assert second.consumer._settings.robot_id == "talos.002"
+        assert first.scenario_manager is second.scenario_manager
+
+    @pytest.mark.asyncio
+    async def test_start_declares_one_queue_per_robot(self, mock_settings) -> None:
+        settings = mock_settings.model_copy(update={"robot_id": "talos.001", "fleet_size": 5})
+        connection = _make_connection()
+        fleet = Fleet(connection, settings)
+
+        await fleet.start()
+        try:
+            channel = connection.get_channel.return_value
+            queue_names = sorted(call.args[0] for call in channel.declare_queue.await_args_list)
+            assert queue_names == [f"talos.00{n}.cmd" for n in range(1, 6)]
+        finally:
+            await fleet.stop()
+
+        assert all(runtime.heartbeat._task is None for runtime in fleet.runtimes.values())
+
+    @pytest.mark.asyncio
+    async def test_world_state_persists_per_robot_across_restarts(self, mock_settings, tmp_path) -> None:
+        from src.schemas.results import RobotUpdate
+
+        settings = mock_settings.model_copy(
+            update={"robot_id": "talos.001", "fleet_size": 2, "state_dir": str(tmp_path)}
+        )
+        fleet = Fleet(_make_connection(), settings)
+        fleet.get("talos.002").world_state.apply_updates(
+            [RobotUpdate(type="robot", id="talos.002", properties={"location": "ws-7", "state": "idle"})]
+        )
+        await fleet.start()
+        await fleet.stop()
+
+        restarted = Fleet(_make_connection(), settings)
+        assert restarted.get("talos.002").world_state.get_robot_state("talos.002")["location"] == "ws-7"
+        assert restarted.get("talos.001").world_state.version == 0
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["talos.001", "talos.002"]
+
+    def test_seed_file_loads_into_empty_world_only(self, mock_settings, tmp_path) -> None:
+        from pathlib import Path
+
+        from src.schemas.results import RobotUpdate
+
+        fixture = Path(__file__).resolve().parents[2] / "fixtures" / "cc_running.json"
+        settings = mock_settings.model_copy(
+            update={"robot_id": "talos.001", "fleet_size": 2, "state_seed_file": str(fixture)}
+        )
+        fleet = Fleet(_make_connection(), settings)
+
+        for robot_id in ("talos.001", "talos.002"):
+            world_state = fleet.get(robot_id).world_state
+            assert world_state.version == 1
+            assert world_state.get_robot_state(robot_id)["location"] == "ws_bic_09_fh_001"
+            assert world_state.get_entity("column_chromatography_machine", "cc-isco-300p_001")["state"] == "using"
+
+        # A restored, non-empty world is not overwritten by the fixture
+        persisted = settings.model_copy(update={"state_dir": str(tmp_path)})
+        first = Fleet(_make_connection(), persisted).get("talos.001").world_state
+        first.apply_updates(
+            [RobotUpdate(type="robot", id="talos.001", properties={"location": "ws-7", "state": "idle"})]
+        )
+        first.close()
+
+        restored = Fleet(_make_connection(), persisted).get("talos.001").world_state
+        assert restored.version == 2
+        assert restored.get_robot_state("talos.001")["location"] == "ws-7"
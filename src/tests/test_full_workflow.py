@@ -19,6 +19,7 @@ from src.schemas.commands import TaskType
 from src.schemas.results import (
     CCMachineProperties,
     CCSystemUpdate,
+    RobotUpdate,
     TubeRackUpdate,
 )
 from src.simulators.cc_simulator import CCSimulator
@@ -157,6 +158,7 @@ class TestMultiRobotScenarios:
             },
         )
         await consumer1._process_message(msg1)
+        await consumer1.join()
 
         # Robot 2: setup_tube_rack
         msg2 = make_mock_message(
@@ -167,6 +169,7 @@ class TestMultiRobotScenarios:
             },
         )
         await consumer2._process_message(msg2)
+        await consumer2.join()
 
         # Verify robot 1 results
         result1 = producer1.publish_result.call_args[0][0]
@@ -260,6 +263,7 @@ class TestFullBICWorkflow:
             },
         )
         await consumer._process_message(msg)
+        await consumer.join()
         result = producer.publish_result.call_args[0][0]
         assert result.code == 200, f"setup_cartridges failed: {result.msg}"
         assert world_state.has_entity("ccs_ext_module", ws_id)
@@ -275,6 +279,7 @@ class TestFullBICWorkflow:
             },
         )
         await consumer._process_message(msg)
+        await consumer.join()
         result = producer.publish_result.call_args[0][0]
         assert result.code == 200, f"setup_tube_rack failed: {result.msg}"
         assert world_state.has_entity("tube_rack", "tube_rack_001")
@@ -292,6 +297,7 @@ class TestFullBICWorkflow:
             },
         )
         await consumer._process_message(msg)
+        await consumer.join()
         result = producer.publish_result.call_args[0][0]
         assert result.code == 200, f"take_photo failed: {result.msg}"
         assert result.images is not None and len(result.images) > 0
@@ -327,6 +333,7 @@ class TestFullBICWorkflow:
             },
         )
         await consumer._process_message(msg)
+        await consumer.join()
         result = producer.publish_result.call_args[0][0]
         assert result.code == 200, f"terminate_cc failed: {result.msg}"
 
@@ -351,6 +358,7 @@ class TestFullBICWorkflow:
             },
         )
         await consumer._process_message(msg)
+        await consumer.join()
         result = producer.publish_result.call_args[0][0]
         assert result.code == 200, f"fraction_consolidation failed: {result.msg}"
 
@@ -421,7 +429,6 @@ class TestLogStreamDuringExecution:
         assert log_producer.publish_log.call_count >= 1
 
 
-
 # ---------------------------------------------------------------------------
 # 4. Reset State Via Command
 # ---------------------------------------------------------------------------
@@ -455,6 +462,7 @@ class TestResetStateViaCommand:
             },
         )
         await consumer._process_message(msg)
+        await consumer.join()
 
         result = producer.publish_result.call_args[0][0]
         assert result.code == 200
@@ -464,6 +472,7 @@ class TestResetStateViaCommand:
         producer.reset_mock()
         msg = make_mock_message("task-reset-001", "reset_state", {})
         await consumer._process_message(msg)
+        await consumer.join()
 
         reset_result = producer.publish_result.call_args[0][0]
         assert reset_result.code == 200
@@ -490,6 +499,7 @@ class TestResetStateViaCommand:
         # Send reset_state command
         msg = make_mock_message("task-reset-002", "reset_state", {})
         await consumer._process_message(msg)
+        await consumer.join()
 
         result = producer.publish_result.call_args[0][0]
         assert result.code == 1002
@@ -497,6 +507,89 @@ class TestResetStateViaCommand:
         assert "not enabled" in result.msg.lower()
 
 
+class TestSeedStateViaCommand:
+    """Tests for the seed_state command through the consumer pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_seed_state_then_terminate_cc_immediately(self) -> None:
+        """A fixture seeded via seed_state lets terminate_cc run without any setup commands."""
+        from pathlib import Path
+
+        settings = _make_settings("talos_001")
+        producer = AsyncMock()
+        producer.publish_result = AsyncMock()
+        log_producer = AsyncMock()
+        log_producer.publish_log = AsyncMock()
+
+        world_state = WorldState()
+        consumer = _build_consumer(settings, producer, log_producer, world_state)
+
+        # 1. Seed the "CC running" layout in one command
+        fixture = Path(__file__).resolve().parents[2] / "fixtures" / "cc_running.json"
+        seed = json.loads(fixture.read_text().replace("{robot_id}", "talos_001"))
+        msg = make_mock_message("task-seed-001", "seed_state", seed)
+        await consumer._process_message(msg)
+
+        seed_result = producer.publish_result.call_args[0][0]
+        assert seed_result.code == 200
+        assert seed_result.task_id == "task-seed-001"
+        assert seed_result.msg == "World state seeded with 6 entities"
+        assert world_state.get_entity("column_chromatography_machine", "cc-isco-300p_001")["state"] == "using"
+
+        # 2. terminate_cc passes its precondition straight away
+        producer.reset_mock()
+        msg = make_mock_message(
+            "task-terminate-001",
+            "terminate_column_chromatography",
+            {"work_station": "ws_bic_09_fh_001", "device_id": "cc-isco-300p_001", "experiment_params": {}},
+        )
+        await consumer._process_message(msg)
+        await consumer.join()
+
+        result = producer.publish_result.call_args[0][0]
+        assert result.code == 200
+        assert world_state.get_entity("column_chromatography_machine", "cc-isco-300p_001")["state"] == "idle"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"entities": [{"type": "robot", "id": "talos_001", "properties": {"location": "ws-1", "state": "bogus"}}]},
+            {"updates": []},  # misspelled "entities" must not seed an empty world
+        ],
+    )
+    async def test_invalid_seed_state_gets_1001_and_leaves_world(self, params: dict) -> None:
+        """A seed_state whose params fail validation is answered with 1001 and changes nothing."""
+        settings = _make_settings("talos_001")
+        producer = AsyncMock()
+        producer.publish_result = AsyncMock()
+        world_state = WorldState()
+        world_state.seed([RobotUpdate(id="talos_001", properties={"location": "ws-1", "state": "idle"})])
+        consumer = CommandConsumer(AsyncMock(), producer, ScenarioManager(settings), settings, world_state=world_state)
+
+        await consumer._process_message(make_mock_message("task-seed-bad", "seed_state", params))
+
+        result = producer.publish_result.call_args[0][0]
+        assert (result.code, result.task_id) == (1001, "task-seed-bad")
+        assert world_state.has_entity("robot", "talos_001")
+
+    @pytest.mark.asyncio
+    async def test_seed_state_without_world_state(self) -> None:
+        """seed_state command without world_state returns error code 1002."""
+        settings = _make_settings("talos_001")
+        producer = AsyncMock()
+        producer.publish_result = AsyncMock()
+
+        consumer = CommandConsumer(AsyncMock(), producer, ScenarioManager(settings), settings, world_state=None)
+
+        msg = make_mock_message("task-seed-002", "seed_state", {"entities": []})
+        await consumer._process_message(msg)
+
+        result = producer.publish_result.call_args[0][0]
+        assert result.code == 1002
+        assert result.task_id == "task-seed-002"
+
+
 # ---------------------------------------------------------------------------
 # 5. CC Experiment Context Persistence
 # ---------------------------------------------------------------------------
@@ -605,9 +698,14 @@ class TestCCExperimentContextPersistence:
             "task-terminate-cc", "terminate_column_chromatography", terminate_params.model_dump()
         )
         await consumer._process_message(terminate_msg)
+        await consumer.join("task-terminate-cc")
 
-        # 3. Verify terminate_cc result includes persisted experiment context
-        assert producer.publish_result.call_count == 1
+        # 3. The still-running start_cc is terminated first, then terminate_cc completes
+        assert producer.publish_result.call_count == 2
+        terminated = producer.publish_result.call_args_list[0][0][0]
+        assert (terminated.task_id, terminated.code) == ("task-start-cc", 1004)
+
+        # Verify terminate_cc result includes persisted experiment context
         result = producer.publish_result.call_args[0][0]
 
         assert result.code == 200
@@ -685,6 +783,7 @@ class TestCCExperimentContextPersistence:
             "task-terminate-cc-no-context", "terminate_column_chromatography", terminate_params.model_dump()
         )
         await consumer._process_message(terminate_msg)
+        await consumer.join()
 
         # Verify result is successful
         assert producer.publish_result.call_count == 1
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import math
 import re
 
+import pytest
+from pydantic import ValidationError
+
+from src.generators.chromatogram import ChromatogramPeak, generate_chromatogram
 from src.generators.entity_updates import (
+    UpdateTemplateCache,
     create_cc_system_update,
     create_ccs_ext_module_update,
     create_evaporator_update,
@@ -17,6 +23,7 @@ from src.generators.entity_updates import (
     create_tube_rack_update,
     generate_robot_timestamp,
 )
+from src.generators.evaporation import boiling_point, schedule_evaporation, simulate_evaporation
 from src.generators.images import generate_captured_images, generate_image_url
 from src.generators.timing import (
     calculate_cc_duration,
@@ -24,7 +31,7 @@ from src.generators.timing import (
     calculate_evaporation_duration,
     calculate_intermediate_interval,
 )
-from src.schemas.protocol import ContainerState
+from src.schemas.protocol import CCExperimentParams, ContainerState, EvaporationProfile, EvaporationProfiles
 from src.schemas.results import (
     CCSExtModuleUpdate,
     CCSystemUpdate,
@@ -215,6 +222,241 @@ class TestEntityUpdateFactories:
         assert update.properties.front_waste_bin is None
         assert isinstance(update.properties.back_waste_bin, ContainerState)
 
+    def test_entity_updates_are_frozen(self) -> None:
+        """Cached updates are shared between messages, so they must be immutable."""
+        update = create_robot_update("robot-001", "ws-1", "idle")
+
+        with pytest.raises(ValidationError):
+            update.properties.state = "working"
+
+
+# -- Update Template Cache Tests ----------------------------------------------
+
+
+class TestUpdateTemplateCache:
+    """Tests for memoized entity updates and their pre-rendered fragments."""
+
+    def test_repeated_arguments_are_admitted_on_second_miss(self) -> None:
+        cache = UpdateTemplateCache()
+
+        first = cache.build(create_robot_update, "robot-001", "ws-1", state="idle")
+        second = cache.build(create_robot_update, "robot-001", "ws-1", state="idle")
+        third = cache.build(create_robot_update, "robot-001", "ws-1", state="idle")
+
+        assert first is not second
+        assert third is second
+        assert cache.cached_fragment(first) is None
+        assert cache.fragment(third) == third.model_dump_json().encode()
+        assert cache.stats.as_dict() | {"hit_rate": None} == {
+            "hits": 1,
+            "misses": 2,
+            "admitted": 1,
+            "uncacheable": 0,
+            "evictions": 0,
+            "hit_rate": None,
+        }
+
+    def test_argument_types_are_part_of_the_key(self) -> None:
+        cache = UpdateTemplateCache()
+        for _ in range(2):
+            cache.build(create_evaporator_update, "evap-1", rpm=1)
+
+        assert cache.build(create_evaporator_update, "evap-1", rpm=True) is not cache.build(
+            create_evaporator_update, "evap-1", rpm=1
+        )
+        assert cache.stats.hits == 1
+
+    def test_unhashable_arguments_bypass_the_cache(self) -> None:
+        cache = UpdateTemplateCache()
+        for _ in range(3):
+            update = cache.build(create_cc_system_update, "cc-1", "using", {"run_minutes": 5})
+
+        assert update.properties.experiment_params.run_minutes == 5
+        assert cache.stats.uncacheable == 3
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache = UpdateTemplateCache(maxsize=2)
+        for robot_id in ("a", "b", "a", "b", "c", "c"):
+            cache.build(create_robot_update, robot_id, "ws-1", "idle")
+
+        evicted = cache.build(create_robot_update, "a", "ws-1", "idle")
+
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+        assert cache.cached_fragment(evicted) is None
+
+    def test_zero_maxsize_disables_caching(self) -> None:
+        cache = UpdateTemplateCache(maxsize=0)
+        updates = [cache.build(create_robot_update, "robot-001", "ws-1", "idle") for _ in range(3)]
+
+        assert updates[0] is not updates[2]
+        assert cache.stats.misses == 0
+
+
+# -- Chromatogram Generator Tests ---------------------------------------------
+
+
+def _run(**overrides) -> CCExperimentParams:
+    """10-minute run ramping 0 -> 100% B on a 40 g cartridge (60 s dead time)."""
+    return CCExperimentParams(
+        **{"run_minutes": 10, "gradients": [{"duration_minutes": 10, "solvent_b_ratio": 100}]} | overrides
+    )
+
+
+class TestChromatogramGenerator:
+    """Tests for the vectorized UV trace generator."""
+
+    def test_same_seed_gives_same_trace(self) -> None:
+        first = generate_chromatogram(_run(), seed=7)
+        second = generate_chromatogram(_run(), seed=7)
+
+        assert len(first) == 600
+        assert first.absorbance.tolist() == second.absorbance.tolist()
+        assert first.absorbance.tolist() != generate_chromatogram(_run(), seed=8).absorbance.tolist()
+
+    def test_peak_elutes_one_dead_time_after_gradient_reaches_it(self) -> None:
+        """20% B is pumped at 120 s; the compound reaches the detector 60 s later."""
+        trace = generate_chromatogram(_run(), peaks=[ChromatogramPeak(elution_ratio=20, height=1.0)], seed=1)
+
+        assert abs(int(trace.absorbance.argmax()) - 180) <= 2
+        assert trace.solvent_b_ratio[0] == 0.0
+        assert trace.solvent_b_ratio[-1] > 85.0
+
+    def test_peak_the_gradient_never_reaches_stays_on_column(self) -> None:
+        params = _run(gradients=[{"duration_minutes": 10, "solvent_b_ratio": 30}])
+        trace = generate_chromatogram(params, peaks=[ChromatogramPeak(elution_ratio=80, height=1.0)], seed=1)
+
+        assert trace.absorbance.max() < 0.05
+        assert not trace.collecting.any()
+
+    def test_peak_gathering_modes(self) -> None:
+        peaks = [ChromatogramPeak(elution_ratio=20, height=1.0)]
+        peak = generate_chromatogram(_run(peak_gathering_mode="peak"), peaks=peaks, seed=1)
+        every = generate_chromatogram(_run(peak_gathering_mode="all"), peaks=peaks, seed=1)
+        none = generate_chromatogram(_run(peak_gathering_mode="none"), peaks=peaks, seed=1)
+
+        assert peak.collecting[180] and not peak.collecting[400]
+        assert not every.collecting[:60].any() and every.collecting[60:].all()
+        assert not none.collecting.any()
+
+    def test_chunks_stream_the_trace_in_order(self) -> None:
+        trace = generate_chromatogram(_run(), sample_rate=2.0, seed=1)
+
+        chunks = [trace.chunk(progress) for progress in (0.25, 0.25, 0.6, 1.0, 1.0)]
+
+        assert chunks[1] is None and chunks[4] is None
+        streamed = [chunk for chunk in chunks if chunk is not None]
+        assert [(chunk.sequence, chunk.start_time, chunk.final) for chunk in streamed] == [
+            (0, 0.0, False),
+            (1, 150.0, False),
+            (2, 360.0, True),
+        ]
+        assert sum((chunk.absorbance for chunk in streamed), []) == trace.absorbance.tolist()
+
+
+# -- Evaporation Model Tests --------------------------------------------------
+
+
+def _profile(**overrides) -> EvaporationProfile:
+    return EvaporationProfile(
+        **{"lower_height": 50.0, "rpm": 120, "target_temperature": 60.0, "target_pressure": 100.0} | overrides
+    )
+
+
+class TestEvaporationModel:
+    """Tests for the first-order rotary evaporator process model."""
+
+    def test_bath_and_vacuum_approach_set_points_first_order(self) -> None:
+        run = simulate_evaporation(_profile(), 3600)
+
+        start, tau_vacuum, tau_bath, end = run.at(0), run.at(60), run.at(600), run.at(3600)
+
+        assert (start.temperature, start.pressure, start.volume) == (25.0, 1013.0, 200.0)
+        assert tau_vacuum.pressure == round(100 + 913 * math.exp(-1), 1)
+        assert tau_bath.temperature == round(60 - 35 * math.exp(-1), 1)
+        assert end.temperature > 59.0 and end.pressure == 100.0
+
+    def test_boiling_point_falls_with_pressure(self) -> None:
+        assert round(float(boiling_point(1013.0)), 1) == 77.1
+        assert 15.0 < float(boiling_point(100.0)) < 17.0
+
+    def test_solvent_depletes_faster_with_rotation_and_immersion(self) -> None:
+        slow = simulate_evaporation(_profile(rpm=30, lower_height=0.0), 1200, volume=150.0)
+        fast = simulate_evaporation(_profile(rpm=240, lower_height=100.0), 1200, volume=150.0)
+        still = simulate_evaporation(_profile(rpm=0), 1200, volume=150.0)
+
+        assert fast.at(1200).volume < slow.at(1200).volume < 150.0
+        assert still.at(1200).volume == 150.0
+        assert fast.volume.min() >= 0.0
+
+    def test_no_evaporation_while_bath_is_below_boiling_point(self) -> None:
+        run = simulate_evaporation(_profile(target_temperature=30.0, target_pressure=900.0), 1800)
+
+        assert run.at(1800).volume == 200.0
+
+
+def _stage(trigger: dict, **overrides) -> EvaporationProfile:
+    return _profile(trigger=trigger, **overrides)
+
+
+class TestEvaporationSchedule:
+    """Tests for the multi-stage evaporation trigger scheduler."""
+
+    def test_timed_stages_fire_in_trigger_order(self) -> None:
+        late = _stage({"type": "time_from_start", "time_in_sec": 900}, target_temperature=30.0)
+        early = _stage({"type": "time_from_start", "time_in_sec": 300}, target_pressure=50.0)
+        schedule = schedule_evaporation(EvaporationProfiles(start=_profile(), updates=[late, early]))
+
+        assert [(stage.index, stage.start, stage.duration) for stage in schedule.stages] == [
+            (0, 0.0, 300.0),
+            (2, 300.0, 600.0),
+            (1, 900.0, 0.0),
+        ]
+        assert schedule.stages[1].reason == "time_from_start: 300s"
+        assert (schedule.duration, schedule.final.target_temperature) == (900.0, 30.0)
+
+    def test_stage_continues_from_previous_state(self) -> None:
+        update = _stage({"type": "time_from_start", "time_in_sec": 600}, target_temperature=30.0)
+        schedule = schedule_evaporation(EvaporationProfiles(start=_profile(), updates=[update]))
+        single = simulate_evaporation(_profile(), 600)
+
+        assert schedule.stages[1].model.at(0) == single.at(600)
+        assert schedule.at(300) == single.at(300)
+
+    def test_events_fire_from_process_state(self) -> None:
+        reached = _stage({"type": "event", "event_name": "pressure_reached"}, target_pressure=20.0)
+        dry = _stage({"type": "event", "event_name": "solvent_dry"}, rpm=0, target_temperature=25.0)
+        schedule = schedule_evaporation(EvaporationProfiles(start=_profile(), updates=[reached, dry]), volume=50.0)
+
+        start, first, second = schedule.stages
+        assert (first.index, first.reason, second.index, second.reason) == (
+            1,
+            "event: pressure_reached",
+            2,
+            "event: solvent_dry",
+        )
+        assert abs(first.model.at(0).pressure - 100.0) <= 2.0
+        assert second.model.at(0).volume <= 0.5
+        assert (first.start, second.start) == (start.duration, first.start + first.duration)
+
+    def test_unfired_and_invalid_stages_are_skipped(self) -> None:
+        timed = _stage({"type": "time_from_start", "time_in_sec": 120})
+        never = _stage({"type": "event", "event_name": "temperature_reached"}, target_temperature=90.0)
+        unknown = _stage({"type": "event", "event_name": "bumping"})
+        schedule = schedule_evaporation(
+            EvaporationProfiles(start=_profile(), updates=[timed, never, unknown, _profile()]), event_timeout=600
+        )
+
+        assert [stage.index for stage in schedule.stages] == [0, 1]
+        assert schedule.skipped == [2, 3, 4]
+        assert schedule.duration == 720.0
+
+    def test_no_updates_runs_default_duration(self) -> None:
+        schedule = schedule_evaporation(EvaporationProfiles(start=_profile()))
+
+        assert (len(schedule.stages), schedule.duration, schedule.skipped) == (1, 1800.0, [])
+
 
 # -- Image Generator Tests ----------------------------------------------------
 
@@ -9,10 +9,21 @@ from unittest.mock import AsyncMock, Mock, patch
 import aio_pika
 import pytest
 
+from src.mq.connection import MQConnection
 from src.mq.heartbeat import HeartbeatPublisher
 from src.schemas.results import HeartbeatMessage
 
 
+def _connection_with_channel(settings, channel) -> MQConnection:
+    """Real MQConnection channel pool backed by a mock AMQP connection handing out ``channel``."""
+    channel.is_closed = False
+    amqp_connection = Mock(is_closed=False)
+    amqp_connection.channel = AsyncMock(return_value=channel)
+    connection = MQConnection(settings)
+    connection._connection = amqp_connection
+    return connection
+
+
 class TestHeartbeatMessage:
     """Tests for HeartbeatMessage model."""
 
@@ -71,8 +82,7 @@ class TestHeartbeatPublisher:
         mock_channel = AsyncMock()
         mock_channel.declare_exchange = AsyncMock(return_value=mock_exchange)
 
-        mock_connection = Mock()
-        mock_connection.get_channel = AsyncMock(return_value=mock_channel)
+        mock_connection = _connection_with_channel(mock_settings, mock_channel)
 
         heartbeat = HeartbeatPublisher(mock_connection, mock_settings)
         await heartbeat.initialize()
@@ -100,8 +110,7 @@ class TestHeartbeatPublisher:
         mock_channel = AsyncMock()
         mock_channel.declare_exchange = AsyncMock(return_value=mock_exchange)
 
-        mock_connection = Mock()
-        mock_connection.get_channel = AsyncMock(return_value=mock_channel)
+        mock_connection = _connection_with_channel(mock_settings, mock_channel)
 
         heartbeat = HeartbeatPublisher(mock_connection, mock_settings)
         await heartbeat.initialize()
@@ -180,8 +189,7 @@ class TestHeartbeatPublisher:
         mock_channel = AsyncMock()
         mock_channel.declare_exchange = AsyncMock(return_value=mock_exchange)
 
-        mock_connection = Mock()
-        mock_connection.get_channel = AsyncMock(return_value=mock_channel)
+        mock_connection = _connection_with_channel(mock_settings, mock_channel)
 
         heartbeat = HeartbeatPublisher(mock_connection, mock_settings)
         await heartbeat.initialize()
@@ -224,3 +232,41 @@ class TestHeartbeatPublisher:
 
         assert heartbeat._running is False
         assert heartbeat._task is None
+
+    @pytest.mark.asyncio
+    async def test_follows_robot_changes_from_world_state_feed(self, mock_settings) -> None:
+        """Test the running heartbeat tracks robot state via the change feed, not by re-reading."""
+        from src.schemas.results import RobotUpdate
+        from src.state.world_state import WorldState
+
+        world_state = WorldState()
+        robot_id = mock_settings.robot_id
+        world_state.apply_updates(
+            [RobotUpdate(type="robot", id=robot_id, properties={"location": "ws-1", "state": "idle"})]
+        )
+        heartbeat = HeartbeatPublisher(Mock(), mock_settings, world_state=world_state)
+        heartbeat._heartbeat_loop = AsyncMock()
+
+        await heartbeat.start()
+        try:
+            assert heartbeat._robot_status == ("idle", "ws-1")
+
+            world_state.apply_updates(
+                [RobotUpdate(type="robot", id=robot_id, properties={"location": "ws-2", "state": "working"})]
+            )
+            world_state.apply_updates(
+                [RobotUpdate(type="robot", id="other-robot", properties={"location": "ws-9", "state": "idle"})]
+            )
+            await asyncio.sleep(0)
+            assert heartbeat._robot_status == ("working", "ws-2")
+
+            with patch.object(world_state, "get_robot_state", side_effect=AssertionError("re-read")):
+                assert (heartbeat._robot_status or heartbeat._read_robot_status()) == ("working", "ws-2")
+
+            world_state.reset()
+            await asyncio.sleep(0)
+            assert heartbeat._robot_status == ("idle", None)
+        finally:
+            await heartbeat.stop()
+
+        assert not world_state.changes.has_subscribers
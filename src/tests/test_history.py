@@ -0,0 +1,171 @@
+"""Tests for the bounded per-entity property history."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.clock import Clock, VirtualClock
+from src.schemas.commands import StartEvaporationParams, TaskType
+from src.schemas.results import RobotUpdate, SilicaCartridgeUpdate
+from src.simulators.evaporation_simulator import EvaporationSimulator
+from src.state.history import EntityHistory
+from src.state.world_state import WorldState
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+class _ManualClock(Clock):
+    """Clock that only moves when the test advances it."""
+
+    def __init__(self) -> None:
+        self.current = START
+
+    def now(self) -> datetime:
+        return self.current
+
+    def monotonic(self) -> float:
+        return (self.current - START).total_seconds()
+
+    async def sleep(self, seconds: float, *, background: bool = False) -> None:
+        self.current += timedelta(seconds=seconds)
+
+    def advance(self, seconds: float) -> None:
+        self.current += timedelta(seconds=seconds)
+
+
+def _robot(location: str) -> tuple[str, str, dict]:
+    return ("robot", "robot-1", {"location": location, "state": "idle"})
+
+
+class TestEntityHistory:
+    """Ring semantics, caps and queries."""
+
+    def test_ring_keeps_most_recent_entries(self) -> None:
+        history = EntityHistory(3, clock=_ManualClock())
+        for version in range(1, 6):
+            history.record([_robot(f"ws-{version}")], version=version)
+
+        entries = history.query("robot", "robot-1")
+
+        assert [entry.version for entry in entries] == [3, 4, 5]
+        assert entries[-1].properties["location"] == "ws-5"
+        assert len(history) == 3
+
+    def test_per_type_capacity_and_disabled_types(self) -> None:
+        history = EntityHistory(0, capacities={"robot": 2}, clock=_ManualClock())
+        history.record([_robot("ws-1"), ("silica_cartridge", "sc-1", {"state": "inuse"})], version=1)
+        history.record([_robot("ws-2"), _robot("ws-3")], version=2)
+
+        assert [entry.properties["location"] for entry in history.query("robot", "robot-1")] == ["ws-2", "ws-3"]
+        assert history.query("silica_cartridge", "sc-1") == []
+        assert history.capacity_for("silica_cartridge") == 0
+
+    def test_time_range_and_task_queries(self) -> None:
+        clock = _ManualClock()
+        history = EntityHistory(8, clock=clock)
+        for version in range(1, 8):
+            history.record([_robot(f"ws-{version}")], version=version, task_id="task-a" if version < 5 else "task-b")
+            clock.advance(10)
+
+        ranged = history.query("robot", "robot-1", since=START + timedelta(seconds=20), until=START.timestamp() + 40)
+        assert [entry.version for entry in ranged] == [3, 4, 5]
+        assert [entry.version for entry in history.query("robot", "robot-1", task_id="task-b")] == [5, 6, 7]
+        assert history.query("robot", "robot-1", since=START + timedelta(hours=1)) == []
+        assert history.query("robot", "missing") == []
+
+    def test_time_range_after_ring_wraps(self) -> None:
+        clock = _ManualClock()
+        history = EntityHistory(4, clock=clock)
+        for version in range(1, 11):
+            history.record([_robot(f"ws-{version}")], version=version)
+            clock.advance(1)
+
+        entries = history.query("robot", "robot-1", since=START + timedelta(seconds=7))
+
+        assert [entry.version for entry in entries] == [8, 9, 10]
+
+    def test_max_entries_evicts_least_recently_updated_entity(self) -> None:
+        history = EntityHistory(4, max_entries=6, clock=_ManualClock())
+        history.record([("tube_rack", "rack-1", {"state": "inuse"})] * 3, version=1)
+        history.record([("tube_rack", "rack-2", {"state": "inuse"})] * 3, version=2)
+        history.record([("tube_rack", "rack-1", {"state": "used"})], version=3)
+        history.record([("tube_rack", "rack-3", {"state": "inuse"})], version=4)
+
+        assert len(history) <= 6
+        assert history.evicted == 1
+        assert sorted(history.tracked()) == [("tube_rack", "rack-1"), ("tube_rack", "rack-3")]
+
+
+class TestWorldStateHistory:
+    """History recorded by WorldState and the simulators."""
+
+    def test_applied_batches_are_recorded_with_task_id(self) -> None:
+        ws = WorldState(history=EntityHistory(8, clock=_ManualClock()))
+        ws.apply_updates(
+            [RobotUpdate(type="robot", id="robot-1", properties={"location": "ws-1", "state": "working"})],
+            task_id="task-1",
+        )
+        ws.apply_updates(
+            [
+                SilicaCartridgeUpdate(
+                    type="silica_cartridge", id="sc-1", properties={"location": "ws-1", "state": "inuse"}
+                )
+            ]
+        )
+
+        (entry,) = ws.history.query("robot", "robot-1")
+        assert entry.task_id == "task-1"
+        assert entry.version == 1
+        assert entry.properties is ws.get_robot_state("robot-1")
+        assert ws.history.query("silica_cartridge", "sc-1")[0].task_id is None
+
+        ws.reset()
+        assert len(ws.history) == 0
+
+    def test_observe_records_without_changing_world(self) -> None:
+        ws = WorldState(history=EntityHistory(8, clock=_ManualClock()))
+        ws.observe(
+            [RobotUpdate(type="robot", id="robot-1", properties={"location": "ws-1", "state": "working"})],
+            task_id="task-1",
+        )
+
+        assert not ws.has_entity("robot", "robot-1")
+        assert ws.version == 0
+        assert ws.history.query("robot", "robot-1", task_id="task-1")[0].properties["state"] == "working"
+
+    def test_observe_is_noop_without_history(self) -> None:
+        ws = WorldState()
+        ws.observe(
+            [RobotUpdate(type="robot", id="robot-1", properties={"location": "ws-1", "state": "idle"})], task_id="t"
+        )
+        assert ws.history is None
+
+    @pytest.mark.asyncio
+    async def test_evaporation_temperature_curve_for_task(self, mock_settings) -> None:
+        clock = VirtualClock(START)
+        ws = WorldState(history=EntityHistory(64, clock=clock))
+        settings = mock_settings.model_copy(update={"base_delay_multiplier": 1.0})
+        sim = EvaporationSimulator(AsyncMock(), settings, world_state=ws, clock=clock)
+        params = StartEvaporationParams(
+            work_station="ws-1",
+            device_id="evap-1",
+            device_type="re-buchi-r180",
+            profiles={
+                "start": {"target_temperature": 60.0, "target_pressure": 100.0, "lower_height": 50.0, "rpm": 120},
+            },
+        )
+
+        result = await sim.simulate("task-evap-1", TaskType.START_EVAPORATION, params)
+        ws.apply_updates(result.updates, task_id="task-evap-1")
+
+        curve = ws.history.query("evaporator", "evap-1", task_id="task-evap-1")
+        temperatures = [entry.properties["current_temperature"] for entry in curve]
+        assert len(curve) >= 3
+        assert temperatures[0] == 25.0
+        assert temperatures == sorted(temperatures)
+        timestamps = [entry.timestamp for entry in curve]
+        assert timestamps == sorted(timestamps)
+        assert timestamps[-1] > timestamps[0]
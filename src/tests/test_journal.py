@@ -0,0 +1,189 @@
+"""Tests for durable WorldState persistence (snapshot + write-ahead journal)."""
+
+from __future__ import annotations
+
+import shutil
+import threading
+import time
+
+from src.schemas.results import CCSystemUpdate, RobotUpdate, SilicaCartridgeUpdate
+from src.state.journal import JOURNAL_FILE, ROTATED_JOURNAL_FILE, SNAPSHOT_FILE, WorldJournal
+from src.state.world_state import WorldState
+
+
+def _cartridges(count: int, state: str = "unused") -> list[SilicaCartridgeUpdate]:
+    return [
+        SilicaCartridgeUpdate(type="silica_cartridge", id=f"sc-{i}", properties={"location": f"ws-{i}", "state": state})
+        for i in range(count)
+    ]
+
+
+class TestWorldJournal:
+    """Recovery from snapshot and journal."""
+
+    def test_restores_from_journal_only(self, tmp_path) -> None:
+        ws = WorldState(WorldJournal(tmp_path))
+        ws.apply_updates([RobotUpdate(type="robot", id="robot-1", properties={"location": "ws-1", "state": "idle"})])
+        ws.apply_updates(
+            [
+                CCSystemUpdate(
+                    type="column_chromatography_machine",
+                    id="cc-1",
+                    properties={"state": "running", "experiment_params": None, "start_timestamp": "2025-01-01"},
+                )
+            ]
+        )
+
+        restored = WorldState(WorldJournal(tmp_path))
+
+        assert restored.version == 2
+        assert restored.get_robot_state("robot-1")["state"] == "idle"
+        assert restored.get_entity("column_chromatography_machine", "cc-1")["start_timestamp"] == "2025-01-01"
+        assert restored.find_at_location("robot", "ws-1")[0] == "robot-1"
+
+    def test_reset_is_journaled(self, tmp_path) -> None:
+        ws = WorldState(WorldJournal(tmp_path))
+        ws.apply_updates(_cartridges(3))
+        ws.reset()
+        ws.apply_updates(_cartridges(1, state="inuse"))
+
+        restored = WorldState(WorldJournal(tmp_path))
+
+        assert restored.version == 3
+        assert len(restored.snapshot()) == 1
+        assert restored.get_entity("silica_cartridge", "sc-0")["state"] == "inuse"
+
+    def test_periodic_compaction_truncates_journal(self, tmp_path) -> None:
+        journal = WorldJournal(tmp_path, snapshot_every=2)
+        ws = WorldState(journal)
+        ws.apply_updates(_cartridges(2))
+        ws.apply_updates(_cartridges(2, state="inuse"))
+        ws.apply_updates([RobotUpdate(type="robot", id="robot-1", properties={"location": "ws-1", "state": "idle"})])
+        journal.wait()
+
+        assert (tmp_path / SNAPSHOT_FILE).exists()
+        assert not (tmp_path / ROTATED_JOURNAL_FILE).exists()
+        assert (tmp_path / JOURNAL_FILE).read_bytes().count(b"\n") == 1
+
+        restored = WorldState(WorldJournal(tmp_path))
+        assert restored.version == 3
+        assert restored.get_entity("silica_cartridge", "sc-1")["state"] == "inuse"
+        assert restored.has_entity("robot", "robot-1")
+
+    def test_records_already_in_snapshot_are_skipped(self, tmp_path) -> None:
+        """A crash between snapshot rename and journal truncate must not replay old records."""
+        journal = WorldJournal(tmp_path)
+        ws = WorldState(journal)
+        ws.apply_updates(_cartridges(1))
+        ws.reset()
+        stale_journal = (tmp_path / JOURNAL_FILE).read_bytes()
+        ws.apply_updates(_cartridges(1, state="used"))
+        journal.compact(ws.snapshot())
+        (tmp_path / JOURNAL_FILE).write_bytes(stale_journal)
+
+        restored = WorldState(WorldJournal(tmp_path))
+
+        assert restored.version == 3
+        assert restored.get_entity("silica_cartridge", "sc-0")["state"] == "used"
+
+    def test_compaction_does_not_block_writers(self, tmp_path, monkeypatch) -> None:
+        state_dir = tmp_path / "robot"
+        journal = WorldJournal(state_dir, snapshot_every=1)
+        ws = WorldState(journal)
+        release = threading.Event()
+        write_snapshot = journal._write_snapshot
+
+        def slow_write_snapshot(version, entities) -> None:
+            release.wait(5.0)
+            write_snapshot(version, entities)
+
+        monkeypatch.setattr(journal, "_write_snapshot", slow_write_snapshot)
+        ws.apply_updates(_cartridges(1))  # starts a compaction that stalls on the snapshot write
+        ws.apply_updates(_cartridges(1, state="inuse"))
+        ws.apply_updates([RobotUpdate(type="robot", id="robot-1", properties={"location": "ws-1", "state": "idle"})])
+
+        assert journal.compacting
+        assert (state_dir / ROTATED_JOURNAL_FILE).read_bytes().count(b"\n") == 1
+        assert (state_dir / JOURNAL_FILE).read_bytes().count(b"\n") == 2
+        # A crash now recovers from the rotated segment and the fresh journal
+        shutil.copytree(state_dir, tmp_path / "crashed")
+        assert WorldState(WorldJournal(tmp_path / "crashed")).version == 3
+
+        release.set()
+        journal.wait()
+        restored = WorldState(WorldJournal(state_dir))
+        assert restored.version == 3
+        assert restored.get_entity("silica_cartridge", "sc-0")["state"] == "inuse"
+        assert restored.has_entity("robot", "robot-1")
+
+    def test_interrupted_compaction_is_completed_on_load(self, tmp_path) -> None:
+        ws = WorldState(WorldJournal(tmp_path))
+        ws.apply_updates(_cartridges(2))
+        ws.apply_updates(_cartridges(1, state="inuse"))
+        ws.close()
+        ws = WorldState(WorldJournal(tmp_path))
+        ws.apply_updates(_cartridges(1, state="used"))
+        # Crash after rotating the journal, before the snapshot was written
+        (tmp_path / JOURNAL_FILE).replace(tmp_path / ROTATED_JOURNAL_FILE)
+        (tmp_path / JOURNAL_FILE).write_bytes(b'{"v":4,"op":"apply","e":[["robot","robot-1",{"state":"idle"}]]}\n')
+
+        restored = WorldState(WorldJournal(tmp_path))
+
+        assert restored.version == 4
+        assert restored.get_entity("silica_cartridge", "sc-0")["state"] == "used"
+        assert restored.get_entity("silica_cartridge", "sc-1")["state"] == "unused"
+        assert restored.has_entity("robot", "robot-1")
+        assert not (tmp_path / ROTATED_JOURNAL_FILE).exists()
+        assert (tmp_path / JOURNAL_FILE).stat().st_size == 0
+        assert WorldState(WorldJournal(tmp_path)).version == 4
+
+    def test_torn_last_record_is_dropped(self, tmp_path) -> None:
+        ws = WorldState(WorldJournal(tmp_path))
+        ws.apply_updates(_cartridges(1))
+        with (tmp_path / JOURNAL_FILE).open("ab") as f:
+            f.write(b'{"v":2,"op":"apply","e":[["robot","r')
+
+        restored = WorldState(WorldJournal(tmp_path))
+        restored.apply_updates(
+            [RobotUpdate(type="robot", id="robot-1", properties={"location": "ws-1", "state": "idle"})]
+        )
+
+        assert restored.version == 2
+        again = WorldState(WorldJournal(tmp_path))
+        assert again.version == 2
+        assert again.has_entity("robot", "robot-1")
+        assert again.has_entity("silica_cartridge", "sc-0")
+
+    def test_close_writes_final_snapshot(self, tmp_path) -> None:
+        ws = WorldState(WorldJournal(tmp_path))
+        ws.apply_updates(_cartridges(5))
+        ws.close()
+
+        assert (tmp_path / JOURNAL_FILE).stat().st_size == 0
+        assert len(WorldState(WorldJournal(tmp_path)).snapshot()) == 5
+
+    def test_restores_10k_entities_quickly(self, tmp_path) -> None:
+        ws = WorldState(WorldJournal(tmp_path, snapshot_every=0))
+        updates = _cartridges(10_000)
+        for start in range(0, len(updates), 100):
+            ws.apply_updates(updates[start : start + 100])
+        ws.close()
+
+        started = time.perf_counter()
+        restored = WorldState(WorldJournal(tmp_path))
+        elapsed = time.perf_counter() - started
+
+        assert len(restored.snapshot()) == 10_000
+        assert restored.find_at_location("silica_cartridge", "ws-9999")[0] == "sc-9999"
+        assert elapsed < 1.0
+
+    def test_seed_is_journaled_as_replace(self, tmp_path) -> None:
+        ws = WorldState(WorldJournal(tmp_path))
+        ws.apply_updates(_cartridges(3))
+        ws.seed([RobotUpdate(type="robot", id="robot-1", properties={"location": "ws-1", "state": "idle"})])
+
+        restored = WorldState(WorldJournal(tmp_path))
+
+        assert restored.version == 2
+        assert len(restored.snapshot()) == 1
+        assert restored.has_entity("robot", "robot-1")
@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from src.schemas.results import (
+    ChromatogramChunk,
     LogMessage,
     RobotProperties,
     RobotUpdate,
@@ -79,6 +80,16 @@ class TestLogMessage:
         assert parsed["code"] == 200
         assert parsed["msg"] == "state_update"
 
+    def test_log_message_with_chromatogram_chunk(self) -> None:
+        """A chromatogram chunk is serialized only when attached."""
+        chunk = ChromatogramChunk(sequence=0, start_time=0.0, sample_interval=1.0, absorbance=[0.01, 0.2])
+        msg = LogMessage(task_id="task-006", timestamp="2025-01-13T06:00:00.000Z", chromatogram=chunk)
+
+        parsed = json.loads(msg.model_dump_json())
+
+        assert parsed["chromatogram"]["absorbance"] == [0.01, 0.2]
+        assert LogMessage.model_validate(parsed).chromatogram == chunk
+
     def test_log_message_custom_code(self) -> None:
         """Code can be overridden from default 200."""
         msg = LogMessage(code=500, task_id="task-005", timestamp="2025-01-13T05:00:00.000Z")
@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import json
+
+import pytest
+from pydantic import ValidationError
+
 from src.schemas.commands import (
     CCExperimentParams,
+    CollectCCFractionsParams,
     RobotState,
     SetupCartridgesParams,
     StartCCParams,
@@ -18,8 +24,10 @@ from src.schemas.results import (
     EvaporatorUpdate,
     SampleCartridgeUpdate,
     SilicaCartridgeUpdate,
+    TubeRackUpdate,
 )
 from src.state.preconditions import PreconditionChecker
+from src.state.rules import PreconditionRule, load_rules
 from src.state.world_state import WorldState
 
 
@@ -269,3 +277,261 @@ class TestNoPreconditionTasks:
 
         result = checker.check(TaskType.TAKE_PHOTO, params)
         assert result.ok is True
+
+
+class TestReservations:
+    """Tests for atomic check-and-reserve."""
+
+    @staticmethod
+    def _start_cc(device_id: str = "cc-1") -> StartCCParams:
+        return StartCCParams(
+            work_station="ws-1",
+            device_id=device_id,
+            device_type="cc-isco-300p",
+            experiment_params=CCExperimentParams(silicone_cartridge="silica_40g", run_minutes=30),
+        )
+
+    def test_second_start_cc_conflicts_until_first_is_applied(self) -> None:
+        """Verify a passing start_cc claims the device until its updates are applied."""
+        ws = WorldState()
+        checker = PreconditionChecker(ws)
+
+        assert checker.check_and_reserve("task-1", TaskType.START_CC, self._start_cc()).ok is True
+        conflict = checker.check_and_reserve("task-2", TaskType.START_CC, self._start_cc())
+        assert conflict.ok is False
+        assert conflict.error_code == 2021
+        assert "task-1" in conflict.error_msg
+
+        # Other devices are unaffected
+        assert checker.check_and_reserve("task-3", TaskType.START_CC, self._start_cc("cc-2")).ok is True
+
+        # Applying task-1's updates releases the claim; the state itself now blocks task-2
+        ws.apply_updates(
+            [
+                CCSystemUpdate(
+                    type="column_chromatography_machine",
+                    id="cc-1",
+                    properties={"state": "using", "experiment_params": None, "start_timestamp": None},
+                )
+            ],
+            task_id="task-1",
+        )
+        assert ws.reservations.holder(("column_chromatography_machine", "cc-1")) is None
+        assert checker.check_and_reserve("task-2", TaskType.START_CC, self._start_cc()).error_code == 2020
+
+    def test_failed_check_and_release_free_the_resource(self) -> None:
+        """Verify failed checks hold nothing and release() frees a claim."""
+        ws = WorldState()
+        ws.apply_updates(
+            [CCSExtModuleUpdate(type="ccs_ext_module", id="ws-1", properties={"state": "using", "description": ""})]
+        )
+        checker = PreconditionChecker(ws)
+        setup = SetupCartridgesParams(
+            silica_cartridge_type="silica_40g",
+            sample_cartridge_location="loc-1",
+            sample_cartridge_type="sample_40g",
+            sample_cartridge_id="samp-1",
+            work_station="ws-1",
+        )
+
+        assert checker.check_and_reserve("task-1", TaskType.SETUP_CARTRIDGES, setup).error_code == 2001
+        assert len(ws.reservations) == 0
+
+        assert checker.check_and_reserve("task-2", TaskType.START_CC, self._start_cc()).ok is True
+        assert ws.reservations.release("task-2") == 1
+        assert checker.check_and_reserve("task-3", TaskType.START_CC, self._start_cc()).ok is True
+
+    def test_terminate_cc_reserves_machine_once_start_cc_released_it(self) -> None:
+        """Verify terminate_cc claims the machine after the consumer cancelled the start_cc holding it."""
+        ws = WorldState()
+        ws.apply_updates(
+            [
+                CCSystemUpdate(
+                    type="column_chromatography_machine",
+                    id="cc-1",
+                    properties={"state": "using", "experiment_params": None, "start_timestamp": None},
+                )
+            ]
+        )
+        checker = PreconditionChecker(ws)
+        ws.reservations.claim("task-start", [("column_chromatography_machine", "cc-1")])
+        terminate = TerminateCCParams(
+            work_station="ws-1",
+            device_id="cc-1",
+            device_type="cc-isco-300p",
+            experiment_params=CCExperimentParams(silicone_cartridge="silica_40g", run_minutes=30),
+        )
+
+        assert checker.check_and_reserve("task-stop", TaskType.TERMINATE_CC, terminate).error_code == 2032
+
+        ws.reservations.release("task-start")  # the cancelled start_cc's cleanup
+        assert checker.check_and_reserve("task-stop", TaskType.TERMINATE_CC, terminate).ok is True
+        assert checker.check_and_reserve("task-new", TaskType.START_CC, self._start_cc()).error_code == 2021
+
+
+class TestRuleEngine:
+    """Tests for declarative, config-loadable precondition rules."""
+
+    @staticmethod
+    def _photo() -> TakePhotoParams:
+        return TakePhotoParams(work_station="ws-1", device_id="evap-1", device_type="re-buchi-r180", components=["a"])
+
+    def test_rules_file_adds_and_disables_rules(self, tmp_path) -> None:
+        """Verify a rules file can add a rule for a new task type and disable a built-in one."""
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(
+            json.dumps(
+                [
+                    {
+                        "name": "take_photo.evaporator_available",
+                        "task_type": "take_photo",
+                        "entity_type": "evaporator",
+                        "key_field": "device_id",
+                        "forbidden_states": ["unavailable"],
+                        "state_code": 2060,
+                        "state_message": "Evaporator {key} cannot be photographed ({state})",
+                    },
+                    {
+                        "name": "start_cc.machine_free",
+                        "task_type": "start_column_chromatography",
+                        "entity_type": "column_chromatography_machine",
+                        "key_field": "device_id",
+                        "state_code": 2020,
+                        "enabled": False,
+                    },
+                ]
+            )
+        )
+        ws = WorldState()
+        ws.apply_updates(
+            [
+                EvaporatorUpdate(type="evaporator", id="evap-1", properties={"state": "unavailable"}),
+                CCSystemUpdate(
+                    type="column_chromatography_machine",
+                    id="cc-1",
+                    properties={"state": "using", "experiment_params": None, "start_timestamp": None},
+                ),
+            ]
+        )
+        checker = PreconditionChecker(ws, load_rules(rules_file))
+
+        result = checker.check(TaskType.TAKE_PHOTO, self._photo())
+        assert result.error_code == 2060
+        assert result.error_msg == "Evaporator evap-1 cannot be photographed (unavailable)"
+        start_cc = StartCCParams(
+            work_station="ws-1",
+            device_id="cc-1",
+            device_type="cc-isco-300p",
+            experiment_params=CCExperimentParams(silicone_cartridge="silica_40g", run_minutes=30),
+        )
+        assert checker.check(TaskType.START_CC, start_cc).ok is True
+
+    def test_rule_error_codes_must_be_in_precondition_range(self) -> None:
+        """Verify rules outside 2000-2099 are rejected at load time."""
+        with pytest.raises(ValidationError):
+            PreconditionRule(name="bad", task_type="take_photo", entity_type="x", key_field="device_id", state_code=500)
+
+    def test_per_rule_counters_and_compound_states(self) -> None:
+        """Verify each rule counts evaluations and failures, and compound states match by part."""
+        ws = WorldState()
+        ws.apply_updates(
+            [
+                TubeRackUpdate(
+                    type="tube_rack", id="rack-1", properties={"location": "ws-1", "state": "inuse,pulled_out"}
+                )
+            ]
+        )
+        checker = PreconditionChecker(ws)
+        params = CollectCCFractionsParams(work_station="ws-1", collect_config=[1, 0])
+
+        assert checker.check(TaskType.COLLECT_CC_FRACTIONS, params).ok is True
+        ws.apply_updates(
+            [TubeRackUpdate(type="tube_rack", id="rack-1", properties={"location": "ws-1", "state": "unused"})]
+        )
+        assert checker.check(TaskType.COLLECT_CC_FRACTIONS, params).error_code == 2041
+
+        stats = checker.stats()["collect_cc_fractions.tube_rack_in_use"]
+        assert stats["evaluations"] == 2
+        assert stats["failures"] == 1
+        assert stats["latency_max_us"] > 0
+
+
+class TestPreconditionCache:
+    """Tests for version-keyed memoization of precondition results."""
+
+    @staticmethod
+    def _evaporation(device_id: str = "evap-1") -> StartEvaporationParams:
+        return StartEvaporationParams(
+            work_station="ws-1",
+            device_id=device_id,
+            device_type="re-buchi-r180",
+            profiles={
+                "start": {"target_temperature": 60.0, "target_pressure": 100.0, "lower_height": 50.0, "rpm": 120}
+            },
+        )
+
+    def test_unrelated_writes_keep_entries_and_touched_entities_invalidate(self) -> None:
+        """Verify hits survive writes to other entities but not writes to the checked one."""
+        ws = WorldState()
+        ws.apply_updates([EvaporatorUpdate(type="evaporator", id="evap-1", properties={"state": "idle"})])
+        checker = PreconditionChecker(ws)
+        rule_stats = checker.stats
+
+        assert checker.check(TaskType.START_EVAPORATION, self._evaporation()).ok is True
+        assert checker.check(TaskType.START_EVAPORATION, self._evaporation()).ok is True
+        ws.apply_updates([EvaporatorUpdate(type="evaporator", id="evap-2", properties={"state": "using"})])
+        assert checker.check(TaskType.START_EVAPORATION, self._evaporation()).ok is True
+
+        assert rule_stats()["start_evaporation.evaporator_free"]["evaluations"] == 1
+        cache_stats = checker.cache.stats.as_dict()
+        assert (cache_stats["hits"], cache_stats["misses"], cache_stats["revalidated"]) == (2, 1, 1)
+        assert cache_stats["hit_rate"] == 2 / 3
+
+        ws.apply_updates([EvaporatorUpdate(type="evaporator", id="evap-1", properties={"state": "using"})])
+        result = checker.check(TaskType.START_EVAPORATION, self._evaporation())
+
+        assert result.error_code == 2050
+        assert checker.cache.stats.invalidated == 1
+        assert rule_stats()["start_evaporation.evaporator_free"]["evaluations"] == 2
+
+    def test_rule_counters_report_cache_hits_separately(self) -> None:
+        """Verify a repeated check shows up in the rule counters as a cache hit."""
+        ws = WorldState()
+        ws.apply_updates([EvaporatorUpdate(type="evaporator", id="evap-1", properties={"state": "using"})])
+        checker = PreconditionChecker(ws)
+
+        assert checker.check(TaskType.START_EVAPORATION, self._evaporation()).error_code == 2050
+        assert checker.check(TaskType.START_EVAPORATION, self._evaporation()).error_code == 2050
+
+        stats = checker.stats()["start_evaporation.evaporator_free"]
+        assert (stats["evaluations"], stats["failures"]) == (1, 1)
+        assert (stats["cache_hits"], stats["cached_failures"]) == (1, 1)
+
+    def test_location_lookups_are_invalidated_when_an_entity_moves_in(self) -> None:
+        """Verify a cached 'not found' is dropped once a tube rack arrives at the work station."""
+        ws = WorldState()
+        checker = PreconditionChecker(ws)
+        params = CollectCCFractionsParams(work_station="ws-1", collect_config=[1])
+
+        assert checker.check(TaskType.COLLECT_CC_FRACTIONS, params).error_code == 2040
+        ws.apply_updates(
+            [TubeRackUpdate(type="tube_rack", id="rack-1", properties={"location": "ws-1", "state": "inuse"})]
+        )
+
+        assert checker.check(TaskType.COLLECT_CC_FRACTIONS, params).ok is True
+
+    def test_reset_invalidates_and_cache_can_be_disabled(self) -> None:
+        """Verify reset drops cached results and cache_size=0 disables memoization."""
+        ws = WorldState()
+        ws.apply_updates([EvaporatorUpdate(type="evaporator", id="evap-1", properties={"state": "using"})])
+        checker = PreconditionChecker(ws)
+        assert checker.check(TaskType.START_EVAPORATION, self._evaporation()).error_code == 2050
+
+        ws.reset()
+        assert checker.check(TaskType.START_EVAPORATION, self._evaporation()).ok is True
+
+        uncached = PreconditionChecker(ws, cache_size=0)
+        uncached.check(TaskType.START_EVAPORATION, self._evaporation())
+        uncached.check(TaskType.START_EVAPORATION, self._evaporation())
+        assert uncached.cache is None
+        assert uncached.stats()["start_evaporation.evaporator_free"]["evaluations"] == 2
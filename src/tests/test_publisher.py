@@ -0,0 +1,264 @@
+"""Tests for the publisher-confirm pipeline, task sequencing and the producers built on it."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import aio_pika
+import pytest
+from aiormq.exceptions import DeliveryError
+
+from src.generators.entity_updates import UpdateTemplateCache, create_cc_system_update, create_robot_update
+from src.mq.consumer import CommandConsumer
+from src.mq.envelope import OutboundMessage
+from src.mq.log_producer import LogProducer
+from src.mq.producer import ResultProducer
+from src.mq.publisher import ConfirmPipeline
+from src.mq.sequencing import TASK_FINAL_HEADER, TASK_ID_HEADER, TASK_SEQ_HEADER, TaskSequencer
+from src.scenarios.manager import ScenarioManager
+from src.schemas.results import LogMessage, RobotProperties, RobotResult, RobotUpdate
+
+
+class _ConfirmingExchange:
+    """Fake exchange whose publishes resolve only when the test releases them."""
+
+    def __init__(self) -> None:
+        self.published: list[tuple[bytes, str]] = []
+        self.confirms: list[asyncio.Future] = []
+
+    async def publish(self, message: aio_pika.Message, routing_key: str) -> None:
+        self.published.append((message.body, routing_key))
+        confirm = asyncio.get_running_loop().create_future()
+        self.confirms.append(confirm)
+        await confirm
+
+    def confirm_all(self) -> None:
+        for confirm in self.confirms:
+            if not confirm.done():
+                confirm.set_result(None)
+
+
+def _message(body: bytes) -> aio_pika.Message:
+    return aio_pika.Message(body=body)
+
+
+class TestConfirmPipeline:
+    """Tests for ConfirmPipeline ordering, backpressure and counters."""
+
+    @pytest.mark.asyncio
+    async def test_publish_returns_before_confirm_and_keeps_order(self) -> None:
+        exchange = _ConfirmingExchange()
+        pipeline = ConfirmPipeline(max_in_flight=10, confirm_batch_size=4)
+
+        confirms = [await pipeline.publish(exchange, _message(f"m{i}".encode()), "rk") for i in range(5)]
+        await asyncio.sleep(0)
+
+        assert [body for body, _ in exchange.published] == [b"m0", b"m1", b"m2", b"m3", b"m4"]
+        assert pipeline.in_flight == 5
+        assert not any(confirm.done() for confirm in confirms)
+
+        exchange.confirm_all()
+        await pipeline.flush()
+
+        stats = pipeline.stats.as_dict()
+        assert stats["published"] == 5
+        assert stats["confirmed"] == 5
+        assert stats["in_flight"] == 0
+        assert stats["confirm_batches"] >= 2  # batch size 4 → at least two confirm waits
+        await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_in_flight_is_bounded(self) -> None:
+        exchange = _ConfirmingExchange()
+        pipeline = ConfirmPipeline(max_in_flight=2, confirm_batch_size=2)
+
+        await pipeline.publish(exchange, _message(b"a"), "rk")
+        await pipeline.publish(exchange, _message(b"b"), "rk")
+        third = asyncio.create_task(pipeline.publish(exchange, _message(b"c"), "rk"))
+        await asyncio.sleep(0.01)
+
+        assert not third.done()  # blocked on the in-flight limit
+        exchange.confirm_all()
+        await asyncio.wait_for(third, timeout=1.0)
+        exchange.confirm_all()
+        await pipeline.close()
+        assert pipeline.stats.confirmed == 3
+
+    @pytest.mark.asyncio
+    async def test_nack_is_counted_as_failure(self) -> None:
+        exchange = Mock()
+        exchange.publish = AsyncMock(side_effect=DeliveryError(None, None))
+        pipeline = ConfirmPipeline()
+
+        confirm = await pipeline.publish(exchange, _message(b"x"), "rk")
+        with pytest.raises(DeliveryError):
+            await confirm
+        await pipeline.close()
+
+        assert pipeline.stats.failed == 1
+        assert pipeline.stats.confirmed == 0
+
+    def test_rejects_invalid_limits(self) -> None:
+        with pytest.raises(ValueError, match="must be >= 1"):
+            ConfirmPipeline(max_in_flight=0)
+
+
+def _initialized_connection(exchange: object) -> Mock:
+    connection = Mock()
+    connection.get_exchange = AsyncMock(return_value=exchange)
+    connection.pipeline = ConfirmPipeline(max_in_flight=8, confirm_batch_size=8)
+    connection.get_pipeline = Mock(return_value=connection.pipeline)
+    return connection
+
+
+class TestProducersUsePipeline:
+    """ResultProducer waits for the confirm, LogProducer does not."""
+
+    @pytest.mark.asyncio
+    async def test_result_producer_waits_for_confirm(self, mock_settings) -> None:
+        exchange = _ConfirmingExchange()
+        connection = _initialized_connection(exchange)
+        producer = ResultProducer(connection, mock_settings)
+        await producer.initialize()
+
+        publish = asyncio.create_task(producer.publish_result(RobotResult(code=200, msg="ok", task_id="t-1")))
+        await asyncio.sleep(0.01)
+        assert not publish.done()
+
+        exchange.confirm_all()
+        await asyncio.wait_for(publish, timeout=1.0)
+        assert exchange.published[0][1] == f"{mock_settings.robot_id}.result"
+        await connection.pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_log_producer_does_not_wait_for_confirm(self, mock_settings) -> None:
+        exchange = _ConfirmingExchange()
+        connection = _initialized_connection(exchange)
+        producer = LogProducer(connection, mock_settings)
+        await producer.initialize()
+
+        await asyncio.wait_for(producer.publish_log("t-1", [], "step"), timeout=1.0)
+        assert connection.pipeline.in_flight == 1
+        await asyncio.sleep(0)  # let the publish reach the exchange
+
+        exchange.confirm_all()
+        await connection.pipeline.close()
+        assert connection.pipeline.stats.confirmed == 1
+
+
+class TestTaskSequencing:
+    """Per-task sequence headers and confirmed log-before-result ordering."""
+
+    def test_sequencer_counts_per_task_and_forgets_on_final(self) -> None:
+        sequencer = TaskSequencer()
+
+        assert sequencer.headers("t-1") == {TASK_ID_HEADER: "t-1", TASK_SEQ_HEADER: 1}
+        assert sequencer.next("t-2") == 1
+        assert sequencer.next("t-1") == 2
+        assert sequencer.headers("t-1", final=True) == {
+            TASK_ID_HEADER: "t-1",
+            TASK_SEQ_HEADER: 3,
+            TASK_FINAL_HEADER: True,
+        }
+        assert len(sequencer) == 1
+
+    def test_sequencer_evicts_oldest_unfinished_task(self) -> None:
+        sequencer = TaskSequencer(max_tasks=2)
+        for task_id in ("a", "b", "c"):
+            sequencer.next(task_id)
+
+        assert len(sequencer) == 2
+        assert sequencer.next("a") == 1  # evicted, restarts
+
+    @pytest.mark.asyncio
+    async def test_log_and_result_share_sequence(self, mock_settings) -> None:
+        exchange = _ConfirmingExchange()
+        connection = _initialized_connection(exchange)
+        sequencer = TaskSequencer()
+        log_producer = LogProducer(connection, mock_settings, sequencer)
+        producer = ResultProducer(connection, mock_settings, sequencer)
+        await log_producer.initialize()
+        await producer.initialize()
+        sent = []
+        exchange.publish = AsyncMock(side_effect=lambda message, routing_key: sent.append(message.headers))
+
+        await log_producer.publish_log("t-1", [], "step 1")
+        await log_producer.publish_log("t-1", [], "step 2", wait_for_confirm=True)
+        await producer.publish_result(RobotResult(code=200, msg="ok", task_id="t-1"))
+
+        assert [headers[TASK_SEQ_HEADER] for headers in sent] == [1, 2, 3]
+        assert TASK_FINAL_HEADER in sent[-1]
+        await connection.pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_final_log_is_confirmed_before_result_without_sleep(self, mock_settings) -> None:
+        exchange = _ConfirmingExchange()
+        connection = _initialized_connection(exchange)
+        log_producer = LogProducer(connection, mock_settings)
+        await log_producer.initialize()
+        producer = AsyncMock()
+        consumer = CommandConsumer(
+            connection, producer, ScenarioManager(mock_settings), mock_settings, log_producer=log_producer
+        )
+        result = RobotResult(code=200, msg="ok", task_id="t-1", updates=[_robot_update()])
+
+        final_log = asyncio.create_task(consumer._publish_final_log(result))
+        await asyncio.sleep(0.01)
+        assert not final_log.done()  # waiting for the broker confirm, not a timer
+
+        exchange.confirm_all()
+        await asyncio.wait_for(final_log, timeout=0.5)
+        await connection.pipeline.close()
+
+
+def _robot_update() -> RobotUpdate:
+    return RobotUpdate(id="robot-001", properties=RobotProperties(location="ws-1", state="idle"))
+
+
+class TestOutboundMessage:
+    """Serialize-once envelope used by all producers."""
+
+    def test_from_model_serializes_compact_json(self) -> None:
+        result = RobotResult(code=200, msg="ok", task_id="t-1")
+        envelope = OutboundMessage.from_model(result, "robot.result", persistent=False, headers={"x": 1})
+        message = envelope.to_amqp()
+
+        assert message.body is envelope.body
+        assert envelope.body == result.model_dump_json().encode()
+        assert envelope.size == len(envelope.body)
+        assert message.delivery_mode == aio_pika.DeliveryMode.NOT_PERSISTENT
+        assert message.headers == {"x": 1}
+        assert json.loads(envelope.pretty()) == json.loads(envelope.body)
+
+    def test_spliced_updates_match_full_serialization(self) -> None:
+        cache = UpdateTemplateCache()
+        for _ in range(2):
+            cached = cache.build(create_robot_update, "robot-001", "ws-1", "working", description='"updates":[]')
+        updates = [cached, create_cc_system_update("cc-1", "using", {"run_minutes": 5})]
+        log = LogMessage(task_id="t-1", msg="x", timestamp="2025-01-15_10-30-45.123")
+
+        envelope = OutboundMessage.from_model_with_updates(log, updates, "robot.log", templates=cache)
+
+        assert cache.cached_fragment(cached) is not None
+        assert envelope.body == log.model_copy(update={"updates": updates}).model_dump_json().encode()
+        assert OutboundMessage.from_model_with_updates(log, [], "robot.log").body == log.model_dump_json().encode()
+
+    @pytest.mark.asyncio
+    async def test_result_is_serialized_exactly_once(self, mock_settings) -> None:
+        exchange = Mock()
+        exchange.publish = AsyncMock()
+        connection = _initialized_connection(exchange)
+        producer = ResultProducer(connection, mock_settings)
+        await producer.initialize()
+        result = RobotResult(code=200, msg="ok", task_id="t-1")
+
+        with patch.object(
+            RobotResult, "model_dump_json", autospec=True, side_effect=lambda self: '{"code":200}'
+        ) as dump:
+            await producer.publish_result(result)
+
+        dump.assert_called_once()
+        assert connection.pipeline.stats.bytes_published == len(b'{"code":200}')
+        await connection.pipeline.close()
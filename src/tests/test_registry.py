@@ -0,0 +1,173 @@
+"""Tests for the running-task registry and terminate_cc cancelling a running start_cc."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.mq.consumer import CommandConsumer
+from src.mq.registry import TaskRegistry
+from src.scenarios.manager import ScenarioManager
+from src.schemas.commands import StartCCParams, TakePhotoParams, TaskType
+from src.simulators.cc_simulator import CCSimulator
+from src.state.world_state import WorldState
+
+EXPERIMENT = {
+    "silicone_cartridge": "silica_40g",
+    "peak_gathering_mode": "all",
+    "air_purge_minutes": 1.2,
+    "run_minutes": 30,
+    "need_equilibration": True,
+}
+
+
+def _cc_params(device_id: str = "cc-001", work_station: str = "ws-1") -> dict:
+    return {
+        "work_station": work_station,
+        "device_id": device_id,
+        "device_type": "cc-isco-300p",
+        "experiment_params": EXPERIMENT,
+    }
+
+
+def _make_message(task_id: str, task_type: str, params: dict) -> AsyncMock:
+    message = AsyncMock()
+    message.body = json.dumps({"task_id": task_id, "task_type": task_type, "params": params}).encode()
+    message.process = MagicMock(return_value=AsyncMock())
+    return message
+
+
+class TestTaskRegistry:
+    """Tests for the task id / device / work station indexes."""
+
+    @pytest.mark.asyncio
+    async def test_find_by_device_then_work_station(self) -> None:
+        registry = TaskRegistry()
+        registry.register("cc-1", TaskType.START_CC, StartCCParams.model_validate(_cc_params()))
+        registry.register(
+            "photo-1",
+            TaskType.TAKE_PHOTO,
+            TakePhotoParams(work_station="ws-2", device_id="cam-001", device_type="camera", components="screen"),
+        )
+
+        assert registry.find(TaskType.START_CC, device_id="cc-001").task_id == "cc-1"
+        assert registry.find(TaskType.START_CC, device_id="cc-other", work_station="ws-1").task_id == "cc-1"
+        assert registry.find(TaskType.START_CC, device_id="cc-other", work_station="ws-2") is None
+        assert registry.find(TaskType.TAKE_PHOTO, work_station="ws-2").task_id == "photo-1"
+
+        registry.unregister("cc-1")
+        assert registry.find(TaskType.START_CC, device_id="cc-001") is None
+        assert (len(registry), registry._by_device) == (1, {"cam-001": {"photo-1": registry.get("photo-1")}})
+
+    @pytest.mark.asyncio
+    async def test_finishing_task_is_not_terminated(self) -> None:
+        registry = TaskRegistry()
+
+        async def job(task_id: str) -> None:
+            registry.register(task_id, TaskType.START_CC, StartCCParams.model_validate(_cc_params(task_id)))
+            await asyncio.sleep(10)
+
+        first, second = asyncio.create_task(job("cc-1")), asyncio.create_task(job("cc-2"))
+        await asyncio.sleep(0)
+        registry.finish("cc-2")
+
+        assert registry.terminate("cc-2", by="stop-2") is None
+        assert registry.terminate("cc-1", by="stop-1").terminated_by == "stop-1"
+        assert registry.terminate("cc-1", by="stop-1-again") is None
+        await asyncio.wait([first])
+        assert first.cancelled() and not second.done()
+        assert registry.stats.as_dict() == {"registered": 2, "terminated": 1}
+        second.cancel()
+
+
+class TestTerminateRunningTask:
+    """terminate_column_chromatography stops the start_column_chromatography on its device."""
+
+    @pytest.mark.asyncio
+    async def test_terminate_cc_cancels_running_start_cc(self, mock_settings) -> None:
+        producer, log_producer = AsyncMock(), AsyncMock()
+        consumer = CommandConsumer(AsyncMock(), producer, ScenarioManager(mock_settings), mock_settings)
+        cc_sim = CCSimulator(producer, mock_settings, log_producer=log_producer)
+        consumer.register_simulator(TaskType.START_CC, cc_sim)
+        consumer.register_simulator(TaskType.TERMINATE_CC, cc_sim)
+
+        # run_minutes=30 at multiplier 0.01: start_cc would run for 18 s
+        await consumer._process_message(_make_message("task-start", "start_column_chromatography", _cc_params()))
+        await asyncio.sleep(0.1)
+        assert consumer.registry.get("task-start") is not None
+
+        await consumer._process_message(
+            _make_message("task-stop", "terminate_column_chromatography", _cc_params(work_station="ws-9"))
+        )
+        start_logs = sum(call.args[0] == "task-start" for call in log_producer.publish_log.call_args_list)
+        await asyncio.wait_for(consumer.join(), timeout=5.0)
+
+        results = [call.args[0] for call in producer.publish_result.call_args_list]
+        assert [(result.task_id, result.code) for result in results] == [("task-start", 1004), ("task-stop", 200)]
+        assert results[0].msg == "Task terminated by task task-stop"
+        # No zombie progress logs from the cancelled start_cc
+        assert sum(call.args[0] == "task-start" for call in log_producer.publish_log.call_args_list) == start_logs
+        assert len(consumer.registry) == 0
+        assert consumer.dispatcher.stats.completed == 2
+
+    @pytest.mark.asyncio
+    async def test_terminate_cc_reserves_machine_of_terminated_start_cc(self, mock_settings) -> None:
+        producer, world = AsyncMock(), WorldState()
+        consumer = CommandConsumer(
+            AsyncMock(), producer, ScenarioManager(mock_settings), mock_settings, world_state=world
+        )
+        cc_sim = CCSimulator(producer, mock_settings, log_producer=AsyncMock(), world_state=world)
+        consumer.register_simulator(TaskType.START_CC, cc_sim)
+        consumer.register_simulator(TaskType.TERMINATE_CC, cc_sim)
+
+        await consumer._process_message(_make_message("task-start", "start_column_chromatography", _cc_params()))
+        await asyncio.sleep(0.1)
+        # start_cc marks the machine in use as soon as it begins
+        assert world.get_entity("column_chromatography_machine", "cc-001")["state"] == "using"
+
+        await consumer._process_message(_make_message("task-stop", "terminate_column_chromatography", _cc_params()))
+        await asyncio.sleep(0.05)
+        assert world.reservations.holder(("column_chromatography_machine", "cc-001")) == "task-stop"
+        # A new start_cc on the machine is rejected while the terminate still runs
+        await consumer._process_message(_make_message("task-again", "start_column_chromatography", _cc_params()))
+        await asyncio.wait_for(consumer.join(), timeout=5.0)
+
+        results = [call.args[0] for call in producer.publish_result.call_args_list]
+        assert [(result.task_id, result.code) for result in results] == [
+            ("task-start", 1004),
+            ("task-again", 2021),
+            ("task-stop", 200),
+        ]
+        assert world.get_entity("column_chromatography_machine", "cc-001")["state"] == "idle"
+        assert len(consumer.registry) == 0 and len(world.reservations) == 0
+
+    @pytest.mark.asyncio
+    async def test_drain_cancel_of_terminated_task_is_not_swallowed(self, mock_settings) -> None:
+        producer = AsyncMock()
+        consumer = CommandConsumer(AsyncMock(), producer, ScenarioManager(mock_settings), mock_settings)
+        consumer.register_simulator(TaskType.START_CC, CCSimulator(producer, mock_settings))
+        await consumer._process_message(_make_message("task-start", "start_column_chromatography", _cc_params()))
+        await asyncio.sleep(0.1)
+
+        running = consumer.registry.terminate("task-start", by="task-stop")
+        running.task.cancel()  # drain cancels the same task before it handled the terminate
+        await asyncio.wait([running.task])
+
+        assert running.task.cancelled()
+        producer.publish_result.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_terminate_without_running_task_just_runs(self, mock_settings) -> None:
+        producer = AsyncMock()
+        consumer = CommandConsumer(AsyncMock(), producer, ScenarioManager(mock_settings), mock_settings)
+        consumer.register_simulator(TaskType.TERMINATE_CC, CCSimulator(producer, mock_settings))
+
+        await consumer._process_message(_make_message("task-stop", "terminate_column_chromatography", _cc_params()))
+        await consumer.join()
+
+        producer.publish_result.assert_awaited_once()
+        assert producer.publish_result.call_args.args[0].code == 200
+        assert consumer.registry.stats.terminated == 0
@@ -4,18 +4,21 @@ from __future__ import annotations
 
 import json
 
-from pydantic import TypeAdapter
+import pytest
+from pydantic import TypeAdapter, ValidationError
 
 from src.schemas.commands import (
     CCExperimentParams,
     EvaporationProfile,
     EvaporationProfiles,
     EvaporationTrigger,
+    ResetStateCommand,
     RobotCommand,
     RobotState,
     SetupCartridgesParams,
     StartCCParams,
     TaskType,
+    decode_command,
 )
 from src.schemas.results import (
     EntityUpdate,
@@ -116,6 +119,40 @@ class TestCommandSchemas:
         assert profiles.updates[0].target_pressure == 150.0
 
 
+class TestCommandDecoding:
+    """Tests for single-pass decode_command via the discriminated TypeAdapter."""
+
+    def test_decodes_typed_params(self) -> None:
+        body = json.dumps(
+            {
+                "task_id": "task-001",
+                "task_type": "start_column_chromatography",
+                "params": {"experiment_params": {"run_minutes": 15}},
+            }
+        ).encode()
+
+        cmd = decode_command(body)
+
+        assert cmd.task_type == TaskType.START_CC
+        assert isinstance(cmd.params, StartCCParams)
+        assert cmd.params.experiment_params.run_minutes == 15
+
+    def test_reset_state_is_a_union_member(self) -> None:
+        cmd = decode_command(b'{"task_type": "reset_state", "task_id": "r-1"}')
+
+        assert isinstance(cmd, ResetStateCommand)
+        assert cmd.task_id == "r-1"
+
+    def test_unknown_task_type_and_bad_params_are_rejected(self) -> None:
+        with pytest.raises(ValidationError) as unknown:
+            decode_command(b'{"task_id": "t", "task_type": "dance", "params": {}}')
+        assert unknown.value.errors()[0]["type"] == "union_tag_invalid"
+
+        with pytest.raises(ValidationError) as bad_params:
+            decode_command(b'{"task_id": "t", "task_type": "setup_tubes_to_column_machine", "params": {}}')
+        assert bad_params.value.errors()[0]["loc"][1:] == ("params", "sample_cartridge_id")
+
+
 class TestResultSchemas:
     """Tests for result schema serialization and deserialization."""
 
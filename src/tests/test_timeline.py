@@ -0,0 +1,364 @@
+"""Tests for data-driven simulator timelines and the TimelineSimulator engine."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+from pydantic import ValidationError
+
+from src.clock import ScaledClock, VirtualClock
+from src.schemas.commands import (
+    CollectCCFractionsParams,
+    SetupTubeRackParams,
+    StartCCParams,
+    StartEvaporationParams,
+    TakePhotoParams,
+    TaskType,
+)
+from src.schemas.results import EvaporatorUpdate, PCCLeftChuteUpdate, RoundBottomFlaskUpdate, TubeRackUpdate
+from src.simulators.cc_simulator import CCSimulator
+from src.simulators.consolidation_simulator import ConsolidationSimulator
+from src.simulators.evaporation_simulator import EvaporationSimulator
+from src.simulators.setup_simulator import SetupSimulator
+from src.simulators.timeline import (
+    TIMELINES_ADAPTER,
+    TimelineError,
+    TimelineSimulator,
+    compile_timelines,
+    load_timelines,
+    timeline_table,
+)
+from src.state.world_state import WorldState
+
+
+def _timeline(steps: list[dict], result: dict | None = None, task_type: str = "setup_tube_rack") -> list:
+    return TIMELINES_ADAPTER.validate_python([{"task_type": task_type, "steps": steps, "result": result or {}}])
+
+
+def _messages(log_producer: AsyncMock) -> list[str]:
+    return [call.args[2] for call in log_producer.publish_log.call_args_list]
+
+
+class TestTimelineCompilation:
+    """Format validation and expression compilation."""
+
+    def test_default_timelines_cover_every_task_type(self) -> None:
+        table = timeline_table()
+
+        assert set(table) == set(TaskType)
+        assert timeline_table() is table  # compiled once per process
+
+    @pytest.mark.parametrize(
+        ("value", "problem"),
+        [
+            ("=params.work_station + '_001'", "invalid reference"),
+            ("=params.model_dump()", "invalid reference"),
+            ("=undefined_name", "unknown name 'undefined_name'"),
+            ("=params.__class__", "private attribute"),
+            ({"fn": "eval", "args": ["1"]}, "unknown function 'eval'"),
+            ({"fn": "concat", "args": ["=nowhere"]}, "unknown name 'nowhere'"),
+            ({"fn": "len", "args": [], "kwargs": {}}, "a call is"),
+        ],
+    )
+    def test_invalid_values_fail_at_compile_time(self, value: object, problem: str) -> None:
+        with pytest.raises(TimelineError, match=problem):
+            compile_timelines(_timeline([{"op": "let", "name": "x", "value": value}]))
+
+    def test_functions_and_run_names_cannot_be_rebound(self) -> None:
+        with pytest.raises(TimelineError, match="'resolve' is reserved"):
+            compile_timelines(_timeline([{"op": "let", "name": "resolve", "value": 1}]))
+
+    def test_names_are_scoped_to_later_steps(self) -> None:
+        with pytest.raises(TimelineError, match="unknown name 'later'"):
+            compile_timelines(
+                _timeline(
+                    [
+                        {"op": "let", "name": "early", "value": "=later"},
+                        {"op": "let", "name": "later", "value": 1},
+                    ]
+                )
+            )
+
+    def test_unknown_step_and_entity_kinds_are_rejected(self) -> None:
+        with pytest.raises(ValidationError):
+            _timeline([{"op": "teleport"}])
+        with pytest.raises(ValidationError):
+            _timeline([{"op": "log", "updates": [{"entity": "spaceship", "args": {}}]}])
+
+    def test_file_replaces_timeline_per_task_type(self, tmp_path) -> None:
+        path = tmp_path / "timelines.json"
+        path.write_text(
+            json.dumps([{"task_type": "setup_tube_rack", "steps": [{"op": "log", "msg": "custom"}]}]),
+            encoding="utf-8",
+        )
+
+        timelines = {timeline.task_type: timeline for timeline in load_timelines(path)}
+
+        assert len(timelines) == len(TaskType)
+        assert timelines[TaskType.SETUP_TUBE_RACK].steps[0].msg == "custom"
+        assert timelines[TaskType.START_CC].description.startswith("LONG-RUNNING")
+
+
+class TestTimelineFunctions:
+    """Simulator-bound timeline functions."""
+
+    def test_evaporation_state_is_read_at_unscaled_run_time(self, mock_settings) -> None:
+        sim = EvaporationSimulator(AsyncMock(), mock_settings.model_copy(update={"base_delay_multiplier": 0.1}))
+        start = {"lower_height": 50.0, "rpm": 120, "target_temperature": 60.0, "target_pressure": 100.0}
+        schedule = sim._functions["evaporation_schedule"](StartEvaporationParams(profiles={"start": start}).profiles)
+        model = schedule.stages[0].model
+
+        # 10 scaled seconds at multiplier 0.1 are 100 s of run time
+        assert sim._functions["evaporation_state"](model, 10.0) == model.at(100.0)
+
+    def test_telemetry_interval_follows_rate(self, mock_settings) -> None:
+        settings = mock_settings.model_copy(update={"re_telemetry_rate": 4.0, "base_delay_multiplier": 0.1})
+        sim = EvaporationSimulator(AsyncMock(), settings)
+        # 4 logs per second of run time: every 0.25 s of run time, i.e. 0.025 clock seconds at multiplier 0.1
+        assert sim._functions["telemetry_interval"]() == pytest.approx(0.025)
+        sim = EvaporationSimulator(AsyncMock(), mock_settings.model_copy(update={"re_telemetry_rate": 0.0}))
+        assert sim._functions["telemetry_interval"]() is None
+
+
+class TestTimelineSimulator:
+    """Running compiled timelines."""
+
+    @pytest.mark.asyncio
+    async def test_custom_timeline_steps(self, mock_settings) -> None:
+        timelines = compile_timelines(
+            _timeline(
+                [
+                    {"op": "let", "name": "items", "value": ["a", "b"]},
+                    {
+                        "op": "delay",
+                        "min": {"fn": "len", "args": ["=items"]},
+                        "max": {"fn": "mul", "args": [{"fn": "len", "args": ["=items"]}, 2]},
+                    },
+                    {
+                        "op": "each",
+                        "items": "=items",
+                        "as": "item",
+                        "steps": [
+                            {
+                                "op": "log",
+                                "msg": {"fn": "concat", "args": ["rack ", "=item"]},
+                                "updates": [
+                                    {
+                                        "entity": "tube_rack",
+                                        "args": {
+                                            "rack_id": "=item",
+                                            "location": "=params.work_station",
+                                            "state": "inuse",
+                                        },
+                                    }
+                                ],
+                            }
+                        ],
+                    },
+                ],
+                result={"code": 201, "msg": "done", "updates": [{"fn": "coalesce", "args": [None]}]},
+            )
+        )
+        log_producer = AsyncMock()
+        sim = TimelineSimulator(AsyncMock(), mock_settings, log_producer=log_producer, timelines=timelines)
+
+        result = await sim.simulate("task-1", TaskType.SETUP_TUBE_RACK, SetupTubeRackParams(work_station="ws-9"))
+
+        assert (result.code, result.msg, result.updates) == (201, "done", [])
+        assert _messages(log_producer) == ["rack a", "rack b"]
+        update = log_producer.publish_log.call_args_list[1].args[1][0]
+        assert isinstance(update, TubeRackUpdate)
+        assert (update.id, update.properties.location) == ("b", "ws-9")
+
+    @pytest.mark.asyncio
+    async def test_subclass_only_handles_its_task_types(self, mock_settings) -> None:
+        sim = SetupSimulator(AsyncMock(), mock_settings)
+
+        with pytest.raises(ValueError, match="SetupSimulator cannot handle task"):
+            await sim.simulate("task-1", TaskType.TAKE_PHOTO, TakePhotoParams(**_photo_params()))
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("suffix", [".json", ".yaml"])
+    async def test_settings_file_overrides_builtin_timeline(self, mock_settings, tmp_path, suffix: str) -> None:
+        if suffix == ".yaml":
+            pytest.importorskip("yaml")
+        path = tmp_path / f"timelines{suffix}"
+        # JSON is valid YAML, so one document serves both loaders
+        path.write_text(
+            json.dumps(
+                [
+                    {
+                        "task_type": "setup_tube_rack",
+                        "steps": [{"op": "log", "msg": {"fn": "concat", "args": ["=robot_id", " racked"]}}],
+                    }
+                ]
+            ),
+            encoding="utf-8",
+        )
+        settings = mock_settings.model_copy(update={"simulator_timelines_file": str(path)})
+        log_producer = AsyncMock()
+        sim = SetupSimulator(AsyncMock(), settings, log_producer=log_producer)
+
+        result = await sim.simulate("task-1", TaskType.SETUP_TUBE_RACK, SetupTubeRackParams())
+
+        assert _messages(log_producer) == ["test-robot-001 racked"]
+        assert result.updates == []
+
+
+class TestDefaultTimelines:
+    """The built-in timelines reproduce the original simulator flows."""
+
+    @pytest.mark.asyncio
+    async def test_start_cc_progress_ticks(self, mock_settings) -> None:
+        settings = mock_settings.model_copy(update={"base_delay_multiplier": 1.0})
+        clock = VirtualClock()
+        log_producer = AsyncMock()
+        sim = CCSimulator(AsyncMock(), settings, log_producer=log_producer, clock=clock)
+        params = StartCCParams(experiment_params={"run_minutes": 10})
+
+        result = await sim.simulate("task-cc", TaskType.START_CC, params)
+
+        assert _messages(log_producer) == [
+            "robot moving to CC station",
+            "CC process started",
+            "CC in progress",
+            "CC in progress",
+            "CC in progress",
+            "CC run complete",
+        ]
+        assert clock.monotonic() >= 600.0
+        assert [update.type for update in result.updates] == ["robot", "column_chromatography_machine"]
+
+    @pytest.mark.asyncio
+    async def test_start_cc_streams_chromatogram_chunks(self, mock_settings) -> None:
+        log_producer = AsyncMock()
+        sim = CCSimulator(AsyncMock(), mock_settings, log_producer=log_producer, clock=VirtualClock())
+        params = StartCCParams(experiment_params={"run_minutes": 10})
+
+        await sim.simulate("task-cc", TaskType.START_CC, params)
+
+        chunks = [call.kwargs["chromatogram"] for call in log_producer.publish_log.call_args_list if call.kwargs]
+        assert [chunk.sequence for chunk in chunks] == [0, 1, 2, 3]
+        assert [chunk.final for chunk in chunks] == [False, False, False, True]
+        assert sum(len(chunk.absorbance) for chunk in chunks) == 600  # 10 min at 1 sample/s
+        assert chunks[1].start_time == len(chunks[0].absorbance) * chunks[0].sample_interval
+
+    @pytest.mark.asyncio
+    async def test_evaporation_ramp_and_profile_update(self, mock_settings) -> None:
+        log_producer = AsyncMock()
+        sim = EvaporationSimulator(AsyncMock(), mock_settings, log_producer=log_producer, clock=VirtualClock())
+        start = {"lower_height": 50.0, "rpm": 120, "target_temperature": 60.0, "target_pressure": 100.0}
+        update = {**start, "target_temperature": 45.0, "trigger": {"type": "time_from_start", "time_in_sec": 400}}
+        params = StartEvaporationParams(profiles={"start": start, "updates": [update]})
+
+        result = await sim.simulate("task-evap", TaskType.START_EVAPORATION, params)
+
+        ramp = [
+            (call.args[1][0].properties, call.args[1][1].properties.state.substance.amount)
+            for call in log_producer.publish_log.call_args_list
+            if call.args[2] == "evaporation ramp in progress"
+        ]
+        # First-order bath heating and vacuum pull-down over 400 s of run time, sampled at 100/200/300 s
+        assert [(sensors.current_temperature, sensors.current_pressure) for sensors, _ in ramp] == [
+            (30.4, 272.4),
+            (34.9, 132.6),
+            (38.8, 106.2),
+        ]
+        assert [volume for _, volume in ramp] == [200.0, 197.4, 187.7]
+        evaporator = result.updates[1]
+        assert isinstance(evaporator, EvaporatorUpdate)
+        assert (evaporator.properties.state, evaporator.properties.rpm) == ("idle", 0)
+        assert evaporator.properties.current_temperature == 45.0
+
+    @pytest.mark.asyncio
+    async def test_evaporation_runs_every_profile_stage(self, mock_settings) -> None:
+        log_producer = AsyncMock()
+        sim = EvaporationSimulator(AsyncMock(), mock_settings, log_producer=log_producer, clock=VirtualClock())
+        start = {"lower_height": 50.0, "rpm": 120, "target_temperature": 60.0, "target_pressure": 100.0}
+        deeper = {**start, "target_pressure": 40.0, "trigger": {"type": "event", "event_name": "pressure_reached"}}
+        cool = {**start, "target_temperature": 30.0, "trigger": {"type": "time_from_start", "time_in_sec": 900}}
+        params = StartEvaporationParams(profiles={"start": start, "updates": [cool, deeper]})
+
+        result = await sim.simulate("task-evap", TaskType.START_EVAPORATION, params)
+
+        stages = [
+            (call.args[1][1].properties.target_pressure, call.args[1][1].properties.description)
+            for call in log_producer.publish_log.call_args_list
+            if call.args[2] in ("evaporation started", "evaporation profile updated")
+        ]
+        assert stages == [(100.0, ""), (40.0, "event: pressure_reached"), (100.0, "time_from_start: 900s")]
+        ramp_targets = [
+            call.args[1][0].properties.target_pressure
+            for call in log_producer.publish_log.call_args_list
+            if call.args[2] == "evaporation ramp in progress"
+        ]
+        assert ramp_targets == [100.0] * 3 + [40.0] * 3
+        assert result.updates[1].properties.target_temperature == 30.0
+
+    @pytest.mark.asyncio
+    async def test_evaporation_telemetry_rate(self, mock_settings) -> None:
+        settings = mock_settings.model_copy(update={"re_telemetry_rate": 0.1})
+        log_producer = AsyncMock()
+        sim = EvaporationSimulator(AsyncMock(), settings, log_producer=log_producer, clock=VirtualClock())
+        start = {"lower_height": 50.0, "rpm": 120, "target_temperature": 60.0, "target_pressure": 100.0}
+        stop = {**start, "trigger": {"type": "time_from_start", "time_in_sec": 1800}}
+        params = StartEvaporationParams(profiles={"start": start, "updates": [stop]})
+
+        await sim.simulate("task-evap", TaskType.START_EVAPORATION, params)
+
+        volumes = [
+            call.args[1][1].properties.state.substance.amount
+            for call in log_producer.publish_log.call_args_list
+            if call.args[2] == "evaporation ramp in progress"
+        ]
+        assert 175 <= len(volumes) <= 180  # 1800 s of run time at 0.1 logs per run second
+        assert volumes == sorted(volumes, reverse=True)
+        assert volumes[0] == 200.0 and volumes[-1] < 10.0
+
+    @pytest.mark.asyncio
+    async def test_evaporation_telemetry_rate_is_in_run_time_under_scaled_clock(self, mock_settings) -> None:
+        settings = mock_settings.model_copy(update={"re_telemetry_rate": 0.1, "base_delay_multiplier": 0.02})
+        clock = ScaledClock(40.0)
+        log_producer = AsyncMock()
+        sim = EvaporationSimulator(AsyncMock(), settings, log_producer=log_producer, clock=clock)
+        start = {"lower_height": 50.0, "rpm": 120, "target_temperature": 60.0, "target_pressure": 100.0}
+        stop = {**start, "trigger": {"type": "time_from_start", "time_in_sec": 600}}
+        params = StartEvaporationParams(profiles={"start": start, "updates": [stop]})
+
+        # 600 s of run time -> 12 clock seconds at multiplier 0.02 -> 0.3 s of wall time at 40x
+        await asyncio.wait_for(sim.simulate("task-evap", TaskType.START_EVAPORATION, params), timeout=5.0)
+
+        ramp = [
+            call.args[1][0].properties
+            for call in log_producer.publish_log.call_args_list
+            if call.args[2] == "evaporation ramp in progress"
+        ]
+        assert 58 <= len(ramp) <= 60  # one log per 10 s of run time, regardless of clock scale
+        assert clock.monotonic() >= 12.0
+
+    @pytest.mark.asyncio
+    async def test_collect_fractions_resolves_rack_from_world(self, mock_settings) -> None:
+        world = WorldState()
+        world.apply_updates(
+            [TubeRackUpdate(id="rack-7", properties={"location": "ws-1", "state": "used", "description": ""})]
+        )
+        sim = ConsolidationSimulator(AsyncMock(), mock_settings, world_state=world)
+
+        result = await sim.simulate(
+            "task-1",
+            TaskType.COLLECT_CC_FRACTIONS,
+            CollectCCFractionsParams(work_station="ws-1", collect_config=[1, 0]),
+        )
+
+        rack, flask, left = result.updates[1], result.updates[2], result.updates[3]
+        assert (rack.id, rack.properties.description) == ("rack-7", "pulled_out, ready_for_recovery")
+        assert isinstance(flask, RoundBottomFlaskUpdate)
+        assert flask.properties.state.content_state == "fill"
+        assert isinstance(left, PCCLeftChuteUpdate)
+
+
+def _photo_params() -> dict:
+    return {"work_station": "ws-1", "device_id": "cc-1", "device_type": "cc-isco-300p", "components": "screen"}
@@ -232,7 +232,12 @@ def test_apply_updates_with_complex_entities() -> None:
 
     chute = ws.get_entity("pcc_left_chute", "pcc-left-ws-1")
     assert chute is not None
-    assert chute["front_waste_bin"] == {"content_state": "empty", "has_lid": False, "lid_state": None, "substance": None}
+    assert chute["front_waste_bin"] == {
+        "content_state": "empty",
+        "has_lid": False,
+        "lid_state": None,
+        "substance": None,
+    }
     assert chute["back_waste_bin"] is None
 
 
@@ -263,3 +268,287 @@ def test_world_state_thread_safety() -> None:
     # All robots should exist
     for i in range(5):
         assert ws.has_entity("robot", f"robot-{i}")
+
+
+def test_find_at_location_uses_index() -> None:
+    """Verify entities are found by (type, location) and the index follows moves."""
+    ws = WorldState()
+    ws.apply_updates(
+        [
+            SilicaCartridgeUpdate(
+                type="silica_cartridge", id="sc-1", properties={"location": "ws-1", "state": "inuse"}
+            ),
+            SilicaCartridgeUpdate(
+                type="silica_cartridge", id="sc-2", properties={"location": "ws-2", "state": "inuse"}
+            ),
+            RobotUpdate(type="robot", id="robot-1", properties={"location": "ws-1", "state": "idle"}),
+        ]
+    )
+
+    found = ws.find_at_location("silica_cartridge", "ws-1")
+    assert found is not None
+    assert found[0] == "sc-1"
+    assert found[1]["state"] == "inuse"
+    assert ws.find_at_location("silica_cartridge", "ws-3") is None
+    assert ws.find_at_location("sample_cartridge", "ws-1") is None
+
+    # Moving sc-1 to ws-2 updates both buckets
+    ws.apply_updates(
+        [SilicaCartridgeUpdate(type="silica_cartridge", id="sc-1", properties={"location": "ws-2", "state": "used"})]
+    )
+    assert ws.find_at_location("silica_cartridge", "ws-1") is None
+    assert ws.entity_ids_at_location("silica_cartridge", "ws-2") == ("sc-2", "sc-1")
+
+    ws.reset()
+    assert ws.find_at_location("silica_cartridge", "ws-2") is None
+    assert ws.entity_ids_at_location("silica_cartridge", "ws-2") == ()
+
+
+def test_entities_of_type_is_read_only_snapshot_view() -> None:
+    """Verify entities_of_type returns a non-copying view that later updates do not change."""
+    import pytest
+
+    ws = WorldState()
+    assert len(ws.entities_of_type("robot")) == 0
+
+    ws.apply_updates([RobotUpdate(type="robot", id="robot-1", properties={"location": "ws-1", "state": "idle"})])
+    view = ws.entities_of_type("robot")
+    assert view["robot-1"] is ws.get_entity("robot", "robot-1")
+
+    ws.apply_updates([RobotUpdate(type="robot", id="robot-2", properties={"location": "ws-2", "state": "idle"})])
+    assert set(view) == {"robot-1"}
+    assert set(ws.entities_of_type("robot")) == {"robot-1", "robot-2"}
+
+    with pytest.raises(TypeError):
+        view["robot-3"] = {}  # type: ignore[index]
+
+
+def test_location_lookup_with_many_entities() -> None:
+    """Verify lookups stay correct with thousands of tracked consumables."""
+    ws = WorldState()
+    ws.apply_updates(
+        [
+            SilicaCartridgeUpdate(
+                type="silica_cartridge", id=f"sc-{i}", properties={"location": f"ws-{i}", "state": "unused"}
+            )
+            for i in range(5000)
+        ]
+    )
+
+    found = ws.find_at_location("silica_cartridge", "ws-4321")
+    assert found is not None
+    assert found[0] == "sc-4321"
+    assert len(ws.entities_of_type("silica_cartridge")) == 5000
+
+
+def test_snapshots_are_versioned_and_immutable() -> None:
+    """Verify each batch publishes a new version and held snapshots stay consistent."""
+    ws = WorldState()
+    assert ws.version == 0
+
+    ws.apply_updates(
+        [
+            RobotUpdate(type="robot", id="robot-1", properties={"location": "ws-1", "state": "idle"}),
+            SilicaCartridgeUpdate(
+                type="silica_cartridge", id="sc-1", properties={"location": "ws-1", "state": "inuse"}
+            ),
+        ]
+    )
+    before = ws.snapshot()
+    assert before.version == 1
+    assert len(before) == 2
+
+    ws.apply_updates([RobotUpdate(type="robot", id="robot-1", properties={"location": "ws-2", "state": "working"})])
+    ws.apply_updates([])  # empty batches do not bump the version
+
+    assert ws.version == 2
+    assert before.get_entity("robot", "robot-1")["state"] == "idle"
+    assert before.find_at_location("robot", "ws-1") is not None
+    assert ws.get_entity("robot", "robot-1")["state"] == "working"
+    assert ws.find_at_location("robot", "ws-1") is None
+    # Untouched entity types are shared between versions rather than copied
+    assert ws.snapshot().get_entity("silica_cartridge", "sc-1") is before.get_entity("silica_cartridge", "sc-1")
+
+    ws.reset()
+    assert ws.version == 3
+    assert len(ws.snapshot()) == 0
+    assert len(before) == 2
+
+
+def test_readers_see_whole_batches_only() -> None:
+    """Verify concurrent readers never observe a partially applied batch."""
+    import threading
+
+    ws = WorldState()
+    stop = threading.Event()
+    torn: list[int] = []
+
+    def writer() -> None:
+        for i in range(200):
+            ws.apply_updates(
+                [
+                    RobotUpdate(type="robot", id="robot-1", properties={"location": f"ws-{i}", "state": "idle"}),
+                    SilicaCartridgeUpdate(
+                        type="silica_cartridge", id="sc-1", properties={"location": f"ws-{i}", "state": "inuse"}
+                    ),
+                ]
+            )
+        stop.set()
+
+    def reader() -> None:
+        while not stop.is_set():
+            snapshot = ws.snapshot()
+            robot = snapshot.get_entity("robot", "robot-1")
+            cartridge = snapshot.get_entity("silica_cartridge", "sc-1")
+            if robot is not None and (cartridge is None or robot["location"] != cartridge["location"]):
+                torn.append(snapshot.version)
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert torn == []
+    assert ws.version == 200
+
+
+def test_properties_are_stored_as_compact_records() -> None:
+    """Verify properties are immutable records that read and compare like dicts."""
+    import pytest
+
+    from src.state.records import PropertyRecord
+
+    ws = WorldState()
+    bin_state = {"content_state": "empty", "has_lid": False, "lid_state": None, "substance": None}
+    ws.apply_updates(
+        [
+            PCCLeftChuteUpdate(
+                type="pcc_left_chute", id="pcc-1", properties={"state": "idle", "front_waste_bin": bin_state}
+            ),
+            PCCLeftChuteUpdate(
+                type="pcc_left_chute", id="pcc-2", properties={"state": "idle", "front_waste_bin": bin_state}
+            ),
+        ]
+    )
+
+    chute = ws.get_entity("pcc_left_chute", "pcc-1")
+    assert isinstance(chute, PropertyRecord)
+    assert chute["state"] == "idle"
+    assert chute.get("missing", "default") == "default"
+    assert "front_waste_bin" in chute
+    assert chute["front_waste_bin"] == bin_state
+    assert dict(chute)["closed"] is True
+    with pytest.raises(TypeError):
+        chute["state"] = "using"  # type: ignore[index]
+
+    # Identical nested payloads are shared rather than duplicated per entity
+    other = ws.get_entity("pcc_left_chute", "pcc-2")
+    assert other["front_waste_bin"] is chute["front_waste_bin"]
+
+    # get_entities_by_type still hands out plain, private dicts
+    copies = ws.get_entities_by_type("pcc_left_chute")
+    assert type(copies["pcc-1"]) is dict
+    assert type(copies["pcc-1"]["front_waste_bin"]) is dict
+    assert copies["pcc-1"] == chute
+
+
+def test_record_nested_params_round_trip_through_models() -> None:
+    """Verify stored experiment params can be fed back into a properties model."""
+    from src.generators.entity_updates import create_cc_system_update
+
+    ws = WorldState()
+    ws.apply_updates(
+        [
+            CCSystemUpdate(
+                type="column_chromatography_machine",
+                id="cc-1",
+                properties={
+                    "state": "using",
+                    "experiment_params": {
+                        "silicone_cartridge": "silica_40g",
+                        "peak_gathering_mode": "peak",
+                        "run_minutes": 30,
+                        "gradients": [{"duration_minutes": 5.0, "solvent_b_ratio": 0.1}],
+                    },
+                },
+            )
+        ]
+    )
+    stored = ws.get_entity("column_chromatography_machine", "cc-1")
+
+    update = create_cc_system_update("cc-1", "idle", experiment_params=stored["experiment_params"])
+
+    assert update.properties.experiment_params.run_minutes == 30
+    assert update.properties.experiment_params.gradients[0].solvent_b_ratio == 0.1
+
+
+def test_seed_replaces_world_in_one_version() -> None:
+    """Verify seed() clears the world and loads the whole layout as a single version."""
+    ws = WorldState()
+    ws.apply_updates([RobotUpdate(type="robot", id="robot-old", properties={"location": "ws-9", "state": "idle"})])
+
+    count = ws.seed(
+        [
+            RobotUpdate(type="robot", id="robot-1", properties={"location": "ws-1", "state": "idle"}),
+            SilicaCartridgeUpdate(
+                type="silica_cartridge", id="sc-1", properties={"location": "ws-1", "state": "inuse"}
+            ),
+        ]
+    )
+
+    assert count == 2
+    assert ws.version == 2
+    assert not ws.has_entity("robot", "robot-old")
+    assert ws.find_at_location("robot", "ws-9") is None
+    assert ws.find_at_location("silica_cartridge", "ws-1")[0] == "sc-1"
+
+
+def test_seed_merge_keeps_existing_entities() -> None:
+    """Verify seed(replace=False) merges into the current state."""
+    ws = WorldState()
+    ws.apply_updates([RobotUpdate(type="robot", id="robot-1", properties={"location": "ws-1", "state": "idle"})])
+
+    ws.seed(
+        [SilicaCartridgeUpdate(type="silica_cartridge", id="sc-1", properties={"location": "ws-1", "state": "inuse"})],
+        replace=False,
+    )
+
+    assert ws.has_entity("robot", "robot-1")
+    assert ws.has_entity("silica_cartridge", "sc-1")
+    assert ws.version == 2
+
+
+def test_record_lists_are_read_only_and_compare_like_lists() -> None:
+    """Verify list values freeze to FrozenList tuples and thaw back to lists."""
+    from src.state.records import FrozenList, freeze
+
+    record = freeze({"gradients": [{"duration": 5, "ratio": 10}], "tags": ["a", "b"]})
+
+    assert isinstance(record["tags"], FrozenList)
+    assert record["tags"] == ["a", "b"]
+    assert record["tags"] != ["b", "a"]
+    assert record["gradients"] == [{"duration": 5, "ratio": 10}]
+    assert not hasattr(record["tags"], "append")
+
+    thawed = record.to_dict()
+    assert type(thawed["tags"]) is list
+    assert type(thawed["gradients"][0]) is dict
+
+
+def test_intern_table_evicts_least_recently_used(monkeypatch) -> None:
+    """Verify a full intern table drops only its oldest entry instead of everything."""
+    from collections import OrderedDict
+
+    from src.state import records
+
+    monkeypatch.setattr(records, "_interned", OrderedDict())
+    monkeypatch.setattr(records, "_MAX_INTERNED", 2)
+
+    first = records.freeze({"n": 1})
+    second = records.freeze({"n": 2})
+    assert records.freeze({"n": 1}) is first  # hit refreshes entry 1
+
+    records.freeze({"n": 3})  # evicts entry 2, the least recently used
+    assert records.freeze({"n": 1}) is first
+    assert records.freeze({"n": 2}) is not second